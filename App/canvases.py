@@ -0,0 +1,744 @@
+"""
+canvases.py
+
+Graphes Matplotlib de la fenêtre principale.
+
+Ici je gère :
+- ThreeDCanvas : trajectoire 3D + marqueur d'animation
+- TrajectoryCanvas : les quatre graphes 2D (altitude, distance, carte, polaire)
+- MonteCarloCanvas : nuage d'impacts, ellipse et histogramme des distances
+
+Matplotlib (et le toolkit 3D qu'il charge avec ses projections) coûte
+plusieurs centaines de ms à importer : main_window n'importe ce module
+qu'à la première ouverture d'un onglet graphique.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import List, Optional
+
+import numpy as np
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from mpl_toolkits.mplot3d import Axes3D  # noqa: F401 # nécessaire pour le 3D
+from PyQt5.QtWidgets import QSizePolicy, QWidget
+
+from App import simulation
+from App.montecarlo import EllipseResult, ImpactSample
+from App.simplify import display_mask
+from App.simulation import Trajectory
+
+
+# Chutte 3D
+class ThreeDCanvas(FigureCanvas):
+    """
+    Trajectoire 3D : Est-Ouest (km), Nord-Sud (km), Altitude (m).
+    """
+    def __init__(self, parent: Optional[QWidget] = None):
+        fig = Figure(figsize=(7, 6))
+        super().__init__(fig)
+        self.setParent(parent)
+        
+        
+        self.ax3d = fig.add_subplot(111, projection="3d")
+                # Utiliser presque tout l'espace du canvas
+        fig.subplots_adjust(
+            left=0.02,
+            right=0.98,
+            top=0.97,
+            bottom=0.05,
+        )
+        fig.patch.set_facecolor("#717171")
+        self.ax3d.set_facecolor("#717171")
+
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.updateGeometry()
+
+        # Données stockées pour l'anim (colonnes de la trajectoire)
+        self._xs_km = np.empty(0)
+        self._ys_km = np.empty(0)
+        self._alts = np.empty(0)
+        self._marker = None
+        self._line = None
+        self._last_states = Trajectory()
+
+        # Élévation fixe (angle vertical) pour la vue 3D
+        self._fixed_elev = 25  # tu peux changer à 20 / 30 si tu préfères
+
+        # Bloquer la rotation en pitch/roll : on force l'elev à rester fixe
+        self.mpl_connect("motion_notify_event", self._on_3d_mouse_move)
+
+    def plot_trajectory_3d(self, states: Trajectory):
+        self.ax3d.clear()
+        self._xs_km = np.empty(0)
+        self._ys_km = np.empty(0)
+        self._alts = np.empty(0)
+        self._marker = None
+        self._line = None
+        self._last_states = states
+
+        if not states:
+            self.ax3d.set_title("Aucune simulation disponible")
+            self.draw()
+            return
+
+        # Colonnes de la trajectoire (pas de conversion ligne à ligne)
+        lats = states.lat_deg
+        lons = states.lon_deg
+        alts = states.alt_m
+
+        # Référence locale = premier point
+        lat0_deg = float(lats[0])
+        lon0_deg = float(lons[0])
+        lat0_rad = math.radians(lat0_deg)
+
+        xs_km = simulation.EARTH_RADIUS_M * np.radians(lons - lon0_deg) * math.cos(lat0_rad) / 1000.0   # Est +
+        ys_km = simulation.EARTH_RADIUS_M * np.radians(lats - lat0_deg) / 1000.0                        # Nord +
+
+        # ---------- Séparation des phases ----------
+        # Lignes simplifiées (Douglas–Peucker) ; le marqueur garde tous les points
+        keep = display_mask(states)
+        ascent = states.ascent_mask & keep
+        descent = states.descent_mask & keep
+
+        # ---------- Tracé montée ----------
+        if ascent.any():
+            self.ax3d.plot(
+                xs_km[ascent], ys_km[ascent], alts[ascent],
+                color="cyan",
+                linewidth=1.6,
+                label="Montée",
+            )
+
+        # ---------- Tracé descente ----------
+        if descent.any():
+            self.ax3d.plot(
+                xs_km[descent], ys_km[descent], alts[descent],
+                color="orange",
+                linewidth=1.6,
+                label="Descente",
+            )
+
+        self._xs_km = xs_km
+        self._ys_km = ys_km
+        self._alts = alts
+
+        # Limites Z
+        zmax = float(alts.max())
+        zmin = float(alts.min())
+        if zmax == zmin:
+            zmax = zmin + 10.0
+        self.ax3d.set_zlim(zmin, zmax)
+
+        # ----- Croix au sol + N / S / E / O -----
+        r = max(
+            float(np.abs(xs_km).max()),
+            float(np.abs(ys_km).max()),
+            0.1,
+        )
+        r *= 1.1
+        base_z = zmin
+
+        self.ax3d.plot([0, r], [0, 0], [base_z, base_z], linestyle="--", linewidth=1.0)
+        self.ax3d.plot([0, -r], [0, 0], [base_z, base_z], linestyle="--", linewidth=1.0)
+        self.ax3d.plot([0, 0], [0, r], [base_z, base_z], linestyle="--", linewidth=1.0)
+        self.ax3d.plot([0, 0], [0, -r], [base_z, base_z], linestyle="--", linewidth=1.0)
+
+        self.ax3d.text(r, 0, base_z, "E", fontsize=9)
+        self.ax3d.text(-r, 0, base_z, "O", fontsize=9)
+        self.ax3d.text(0, r, base_z, "N", fontsize=9)
+        self.ax3d.text(0, -r, base_z, "S", fontsize=9)
+
+        self.ax3d.set_xlabel("Est-Ouest (km)")
+        self.ax3d.set_ylabel("Nord-Sud (km)")
+        self.ax3d.set_zlabel("Altitude (m)")
+        self.ax3d.set_title("Trajectoire 3D de la chute")
+
+        # 👉 aspect un peu plus "écran large" pour que ça soit lisible
+        try:
+            self.ax3d.set_box_aspect((1.5, 1.5, 0.8))
+        except Exception:
+            # vieux Matplotlib : ignore si pas supporté
+            pass
+
+        self.ax3d.view_init(elev=self._fixed_elev, azim=135)
+
+        # Marqueur initial (au début de la chute)
+        self.update_marker(0) 
+        
+        self.draw()
+
+      
+
+    def reset_view(self):
+        """Recalcule complètement la vue 3D à partir de la dernière simulation."""
+        if not self._last_states:
+            return
+        self.plot_trajectory_3d(self._last_states)
+    
+
+    def update_marker(self, idx: int):
+        """Déplace le marqueur 3D sur l'échantillon idx."""
+        if len(self._xs_km) == 0:
+            return
+        if idx < 0 or idx >= len(self._xs_km):
+            return
+
+        # Supprime l'ancien marqueur si besoin
+        if self._marker is not None:
+            self._marker.remove()
+            self._marker = None
+
+        x = float(self._xs_km[idx])
+        y = float(self._ys_km[idx])
+        z = float(self._alts[idx])
+
+        self._marker = self.ax3d.scatter([x], [y], [z], s=40)
+
+        self.draw_idle()
+
+
+
+    def _on_3d_mouse_move(self, event):
+        # On ne s'occupe que de notre axe 3D
+        if event.inaxes is not self.ax3d:
+            return
+
+        # On ne réagit que quand le bouton gauche est enfoncé (rotation)
+        if not hasattr(event, "button"):
+            return
+        # Matplotlib : 1 = bouton gauche
+        if event.button != 1:
+            return
+
+        # On laisse Matplotlib mettre à jour l'azim, mais on réimpose l'elev fixe
+        current_azim = self.ax3d.azim
+        self.ax3d.view_init(elev=self._fixed_elev, azim=current_azim)
+        self.draw_idle()
+
+
+# ---------- Canvas trajectoire 2D ----------
+
+
+class TrajectoryCanvas(FigureCanvas):
+    def __init__(self, parent: Optional[QWidget] = None):
+        self.figure = Figure(figsize=(7, 7))
+        super().__init__(self.figure)
+        self.setParent(parent)
+
+       
+        self.info_label = None
+
+        self.mpl_connect("motion_notify_event", self._on_mouse_move)
+        self.current_states: Trajectory | None = None
+
+        
+        self.states = Trajectory()
+        self.cursor_lines = {}
+        self.cursor_points = {}
+
+        # 4 sous-graphiques : 2 x 2
+        self.ax_alt = self.figure.add_subplot(2, 2, 1)
+        self.ax_dist = self.figure.add_subplot(2, 2, 2)
+        self.ax_map = self.figure.add_subplot(2, 2, 3)
+        self.ax_polar = self.figure.add_subplot(2, 2, 4, projection="polar")
+
+
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.updateGeometry()
+        
+
+        # 🎨 thème sombre
+        self.figure.patch.set_facecolor("#2b2b2b")
+        for ax in (self.ax_alt, self.ax_dist, self.ax_map, self.ax_polar):
+            ax.set_facecolor("#2b2b2b")
+            ax.tick_params(colors="white")
+            for spine in ax.spines.values():
+                spine.set_color("white")
+
+        import matplotlib.ticker as mticker
+        # Empêche matplotlib d'afficher (x,y) automatiques
+        for ax in (self.ax_alt, self.ax_dist, self.ax_map, self.ax_polar):
+            ax.format_coord = lambda x, y: ""
+
+        for ax in (self.ax_alt, self.ax_dist, self.ax_map):
+            ax.ticklabel_format(style="plain", useOffset=False)
+        self.ax_alt.xaxis.set_major_formatter(mticker.FormatStrFormatter("%.1f"))
+        self.ax_alt.yaxis.set_major_formatter(mticker.FormatStrFormatter("%.0f"))
+        self.ax_dist.xaxis.set_major_formatter(mticker.FormatStrFormatter("%.1f"))
+        self.ax_dist.yaxis.set_major_formatter(mticker.FormatStrFormatter("%.0f"))
+        self.ax_map.xaxis.set_major_formatter(mticker.FormatStrFormatter("%.5f"))
+        self.ax_map.yaxis.set_major_formatter(mticker.FormatStrFormatter("%.5f"))
+        
+        self.ax_polar.yaxis.set_major_formatter(mticker.FormatStrFormatter("%.1f"))    
+
+        self.draw_idle()   
+
+    # =========================================================
+    # Utilitaires
+    # =========================================================
+
+    def _split_phases(self, states: Trajectory):
+        return states.ascent_mask, states.descent_mask
+
+    def _compute_local_xy_km(self, states: Trajectory):
+        lat_ref = float(states.lat_deg[0])
+        lon_ref = float(states.lon_deg[0])
+        lat0_rad = math.radians(lat_ref)
+
+        x = simulation.EARTH_RADIUS_M * np.radians(states.lon_deg - lon_ref) * math.cos(lat0_rad)
+        y = simulation.EARTH_RADIUS_M * np.radians(states.lat_deg - lat_ref)
+
+        return x / 1000.0, y / 1000.0
+
+    # =========================================================
+    # Tracé principal
+    # =========================================================
+    def _on_mouse_move(self, event):
+        if event.inaxes is None:
+            return
+
+        if not self.current_states or not hasattr(self, "_cursor_data"):
+            return
+
+        if event.xdata is None:
+            return
+
+        # temps cible (min → s)
+        t_target_s = event.xdata * 60.0
+
+        # index temporel le plus proche
+        times = self._cursor_data["t"]
+        idx = int(np.abs(times - t_target_s).argmin())
+
+        # valeurs
+        t_min = float(times[idx]) / 60.0
+        alt = float(self._cursor_data["alt"][idx])
+        lon = float(self._cursor_data["lon"][idx])
+        lat = float(self._cursor_data["lat"][idx])
+        dist = float(self._cursor_data["dist"][idx])
+        theta = float(self._cursor_data["theta"][idx])
+
+        # ----- ligne verticale (temps) -----
+        self.cursor_lines["time"].set_xdata([t_min, t_min])
+
+        # ----- point distance -----
+        self.cursor_points["dist"].set_data(
+            [dist],
+            [alt],
+        )
+
+        # ----- point carte -----
+        self.cursor_points["map"].set_data(
+            [lon],
+            [lat],
+        )
+
+        # ----- point polaire -----
+        self.cursor_points["polar"].set_data(
+            [theta],
+            [dist],
+        )
+
+        # ----- message -----
+        if self.info_label:
+            self.info_label.setText(
+                f"T = {t_min:6.1f} min   |   "
+                f"ALT = {alt:7.0f} m   |   "
+                f"DIST = {dist:6.1f} km   |   "
+                f"LAT = {lat:.5f}   |   "
+                f"LON = {lon:.5f}   |   "
+                f"AZ = {math.degrees(theta)%360:5.1f}°"
+            )
+
+
+        self.draw_idle()
+
+
+
+    #-----------------------------------------------------------------------
+    def plot_trajectory(self, states: Trajectory):
+
+        self.current_states = states
+
+        for ax in (self.ax_alt, self.ax_dist, self.ax_map, self.ax_polar):
+            ax.clear()
+            ax.set_facecolor("#2b2b2b")
+            ax.tick_params(colors="white")
+            for spine in ax.spines.values():
+                spine.set_color("white")
+
+        if not states:
+            self.draw_idle()
+            return
+
+        ascent, descent = self._split_phases(states)
+        xs, ys = self._compute_local_xy_km(states)
+
+        # Lignes simplifiées (Douglas–Peucker) ; le survol garde tous les points
+        keep = display_mask(states)
+        ascent = ascent & keep
+        descent = descent & keep
+
+        dist = np.hypot(xs, ys)
+        theta = np.arctan2(xs, ys)
+
+        t_min = states.t_s / 60.0
+        alts = states.alt_m
+        has_ascent = bool(ascent.any())
+        has_descent = bool(descent.any())
+
+        # ---------- 1) Altitude vs temps ----------
+        if has_ascent:
+            self.ax_alt.plot(t_min[ascent], alts[ascent], color="cyan", label="Montée")
+
+        if has_descent:
+            self.ax_alt.plot(t_min[descent], alts[descent], color="orange", label="Descente")
+
+        self.ax_alt.set_title("Altitude vs Temps", color="white")
+        self.ax_alt.set_xlabel("Temps (min)", color="white")
+        self.ax_alt.set_ylabel("Altitude (m)", color="white")
+        self.ax_alt.grid(True, alpha=0.3)
+        self.ax_alt.legend()
+
+        # ---------- 2) Altitude vs distance ----------
+        if has_ascent:
+            self.ax_dist.plot(
+                dist[ascent],
+                alts[ascent],
+                color="cyan",
+                label="Montée",
+            )
+
+        if has_descent:
+            self.ax_dist.plot(
+                dist[descent],
+                alts[descent],
+                color="orange",
+                label="Descente",
+            )
+
+        self.ax_dist.set_title("Altitude vs Distance sol", color="white")
+        self.ax_dist.set_xlabel("Distance horizontale (km)", color="white")
+        self.ax_dist.set_ylabel("Altitude (m)", color="white")
+        self.ax_dist.grid(True, alpha=0.3)
+        self.ax_dist.legend()
+
+        # ---------- 3) Trajectoire au sol ----------
+        if has_ascent:
+            self.ax_map.plot(
+                states.lon_deg[ascent],
+                states.lat_deg[ascent],
+                color="cyan",
+                label="Montée",
+            )
+
+        if has_descent:
+            self.ax_map.plot(
+                states.lon_deg[descent],
+                states.lat_deg[descent],
+                color="orange",
+                label="Descente",
+            )
+
+        self.ax_map.set_title("Trajectoire au sol", color="white")
+        self.ax_map.set_xlabel("Longitude (°)", color="white")
+        self.ax_map.set_ylabel("Latitude (°)", color="white")
+        self.ax_map.grid(True, alpha=0.3)
+        self.ax_map.legend()
+
+        # ---------- 4) Vue polaire ----------
+        if has_ascent:
+            self.ax_polar.plot(
+                theta[ascent],
+                dist[ascent],
+                color="cyan",
+                label="Montée",
+            )
+
+        if has_descent:
+            self.ax_polar.plot(
+                theta[descent],
+                dist[descent],
+                color="orange",
+                label="Descente",
+            )
+
+        self.ax_polar.set_theta_zero_location("N")
+        self.ax_polar.set_theta_direction(-1)
+        self.ax_polar.set_thetagrids([0, 90, 180, 270], labels=["N", "E", "S", "W"])
+        self.ax_polar.set_title("Vue polaire", color="white")
+        self.ax_polar.grid(True, alpha=0.3)
+        self.ax_polar.legend(loc="upper right")
+
+        # ----- curseurs -----
+        self.cursor_lines["time"] = self.ax_alt.axvline(
+            x=0, color="white", linestyle="--", alpha=0.7
+        )
+
+        self.cursor_points["dist"] = self.ax_dist.plot(
+            [], [], "o", color="white"
+        )[0]
+
+        self.cursor_points["map"] = self.ax_map.plot(
+            [], [], "o", color="white"
+        )[0]
+
+        self.cursor_points["polar"] = self.ax_polar.plot(
+            [], [], "o", color="white"
+        )[0]
+
+        self._cursor_data = {
+            "t": states.t_s,
+            "alt": states.alt_m,
+            "lat": states.lat_deg,
+            "lon": states.lon_deg,
+            "xs": xs,
+            "ys": ys,
+            "dist": dist,
+            "theta": theta,
+        }
+
+        # ---------- zoom auto ----------
+        for ax in (self.ax_alt, self.ax_dist, self.ax_map):
+            ax.relim()
+            ax.autoscale(enable=True)
+
+        self.figure.tight_layout()
+        self.draw_idle()
+
+class MonteCarloCanvas(FigureCanvas):
+    def __init__(self, parent: Optional[QWidget] = None):
+        fig = Figure(figsize=(8, 5))
+        super().__init__(fig)
+        self.setParent(parent)
+
+        # Deux graphes l'un sous l'autre : zone d'impact en haut, histo en bas
+        self.ax_xy = fig.add_subplot(2, 1, 1)
+        self.ax_dist = fig.add_subplot(2, 1, 2)
+        fig.patch.set_facecolor("#71717171")
+        for ax in (self.ax_xy, self.ax_dist):
+            ax.set_facecolor("#71717171")
+
+        fig.subplots_adjust(
+            left=0.07,
+            right=0.98,
+            top=0.95,
+            bottom=0.08,
+            hspace=0.35,
+        )
+
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.updateGeometry()
+
+        # --- stockage pour tooltips ---
+        self._samples: List[ImpactSample] = []
+        self._xs_km: List[float] = []
+        self._ys_km: List[float] = []
+        self._rs_km: List[float] = []
+        self._sc = None          # scatter
+        self._annot = None       # annotation (créée dans plot_impacts)
+
+        # Connexion événement souris
+        self.mpl_connect("motion_notify_event", self._on_hover)
+
+    def begin_impacts(self):
+        """
+        Prépare un nuage vide qui se remplira lot par lot (add_impacts),
+        avant le tracé final avec ellipse et histogramme (plot_impacts).
+        """
+        self.ax_xy.clear()
+        self.ax_dist.clear()
+
+        self._samples = []
+        self._xs_km = []
+        self._ys_km = []
+        self._rs_km = []
+        self._annot = None
+
+        self._sc = self.ax_xy.scatter([], [], s=20, alpha=0.6, label="Impacts")
+        self.ax_xy.scatter([0.0], [0.0], marker="+", s=60, label="Largage")
+
+        self.ax_xy.set_xlabel("Est-Ouest (km)  [Est + / Ouest -]")
+        self.ax_xy.set_ylabel("Nord-Sud (km)  [Nord + / Sud -]")
+        self.ax_xy.set_title("Monte Carlo - calcul en cours…")
+        self.ax_xy.grid(True)
+        self.ax_dist.grid(True)
+
+        self.draw_idle()
+
+    def add_impacts(self, samples: List[ImpactSample]):
+        """
+        Ajoute un lot d'impacts au nuage en cours (sans ellipse ni histogramme).
+        """
+        if self._sc is None or not samples:
+            return
+
+        self._samples = self._samples + list(samples)
+        self._xs_km += [s.x_m / 1000.0 for s in samples]
+        self._ys_km += [s.y_m / 1000.0 for s in samples]
+        self._rs_km += [(s.x_m**2 + s.y_m**2) ** 0.5 / 1000.0 for s in samples]
+
+        self._sc.set_offsets(list(zip(self._xs_km, self._ys_km)))
+
+        # Cadrage sur l'ensemble des points reçus (+ le largage)
+        xs = self._xs_km + [0.0]
+        ys = self._ys_km + [0.0]
+        cx = 0.5 * (min(xs) + max(xs))
+        cy = 0.5 * (min(ys) + max(ys))
+        r = max(max(xs) - min(xs), max(ys) - min(ys), 0.4) * 0.6
+        self.ax_xy.set_xlim(cx - r, cx + r)
+        self.ax_xy.set_ylim(cy - r, cy + r)
+        self.ax_xy.set_title(f"Monte Carlo - calcul en cours… ({len(self._samples)} impacts)")
+
+        self.draw_idle()
+
+    def plot_impacts(self, samples: List[ImpactSample], ellipse: Optional[EllipseResult]):
+        # Clear
+        self.ax_xy.clear()
+        self.ax_dist.clear()
+
+        # Réinitialise les structures
+        self._samples = []
+        self._xs_km = []
+        self._ys_km = []
+        self._rs_km = []
+        self._sc = None
+        self._annot = None
+
+        if not samples:
+            self.ax_xy.set_title("Aucun impact Monte Carlo (pas de données)")
+            self.ax_xy.grid(True)
+            self.ax_dist.set_title("Distribution distance (vide)")
+            self.ax_dist.grid(True)
+            self.draw()
+            return
+
+        # Stocke les samples pour les tooltips
+        self._samples = samples
+        xs_km = [s.x_m / 1000.0 for s in samples]
+        ys_km = [s.y_m / 1000.0 for s in samples]
+        rs_km = [(s.x_m**2 + s.y_m**2) ** 0.5 / 1000.0 for s in samples]
+        self._xs_km = xs_km
+        self._ys_km = ys_km
+        self._rs_km = rs_km
+
+        # Annotation (bulle) APRÈS le clear
+        self._annot = self.ax_xy.annotate(
+            "",
+            xy=(0, 0),
+            xytext=(10, 10),
+            textcoords="offset points",
+            bbox=dict(boxstyle="round", fc="w", alpha=0.8),
+            arrowprops=dict(arrowstyle="->"),
+        )
+        self._annot.set_visible(False)
+
+        # ---------- 1) Nuage XY + ellipse ----------
+        self._sc = self.ax_xy.scatter(
+            xs_km,
+            ys_km,
+            s=20,          # un peu plus gros, plus facile à viser
+            alpha=0.6,
+            label="Impacts",
+            picker=True,   # important pour contains()
+        )
+        self.ax_xy.scatter([0.0], [0.0], marker="+", s=60, label="Largage")
+
+        # Centre pour cadrer le zoom
+        if ellipse is not None and ellipse.a_m > 0.0 and ellipse.b_m > 0.0:
+            cx_km = ellipse.cx_m / 1000.0
+            cy_km = ellipse.cy_m / 1000.0
+        else:
+            cx_km = sum(xs_km) / len(xs_km)
+            cy_km = sum(ys_km) / len(ys_km)
+
+        # Ellipse si dispo
+        if ellipse is not None and ellipse.a_m > 0.0 and ellipse.b_m > 0.0:
+            a_km = ellipse.a_m / 1000.0
+            b_km = ellipse.b_m / 1000.0
+            ts = [i * 2.0 * math.pi / 200 for i in range(201)]
+            ex = []
+            ey = []
+            cos_a = math.cos(ellipse.angle_rad)
+            sin_a = math.sin(ellipse.angle_rad)
+            for t in ts:
+                xr = a_km * math.cos(t)
+                yr = b_km * math.sin(t)
+                x = cx_km + xr * cos_a - yr * sin_a
+                y = cy_km + xr * sin_a + yr * cos_a
+                ex.append(x)
+                ey.append(y)
+
+            self.ax_xy.plot(ex, ey, linewidth=1.5, label="Ellipse ~zone")
+            self.ax_xy.scatter([cx_km], [cy_km], marker="x", s=50, label="Centre ellipse")
+            
+
+        # Zoom autour du centre
+        max_dx = max(abs(x - cx_km) for x in xs_km + [cx_km])
+        max_dy = max(abs(y - cy_km) for y in ys_km + [cy_km])
+        r = max(max_dx, max_dy, 0.2) * 1.2
+
+        self.ax_xy.set_xlim(cx_km - r, cx_km + r)
+        self.ax_xy.set_ylim(cy_km - r, cy_km + r)
+
+        # repère croix sur le largage (0,0)
+        self.ax_xy.axhline(0.0, linewidth=0.7)
+        self.ax_xy.axvline(0.0, linewidth=0.7)
+
+        self.ax_xy.set_xlabel("Est-Ouest (km)  [Est + / Ouest -]")
+        self.ax_xy.set_ylabel("Nord-Sud (km)  [Nord + / Sud -]")
+        self.ax_xy.set_title("Monte Carlo - zone d'impact (sol)")
+        self.ax_xy.grid(True)
+        self.ax_xy.legend()
+
+        # ---------- 2) Histogramme des distances ----------
+        self.ax_dist.hist(rs_km, bins=20, alpha=0.7)
+        self.ax_dist.set_xlabel("Distance au largage (km)")
+        self.ax_dist.set_ylabel("Nombre d'impacts")
+        self.ax_dist.set_title("Distribution des distances")
+
+        if rs_km:
+            mean_r = sum(rs_km) / len(rs_km)
+            self.ax_dist.axvline(mean_r, linestyle="--", label=f"moy ~ {mean_r:.1f} km")
+            self.ax_dist.legend()
+
+        self.ax_dist.grid(True)
+
+        self.figure.tight_layout()
+        self.draw()
+
+    def _on_hover(self, event):
+        # Pas de données ou pas d'annotation
+        if self._sc is None or self._annot is None or not self._samples:
+            return
+
+        # On ne gère que l'axe du haut
+        if event.inaxes is not self.ax_xy:
+            if self._annot.get_visible():
+                self._annot.set_visible(False)
+                self.draw_idle()
+            return
+
+        contains, info = self._sc.contains(event)
+        if not contains:
+            if self._annot.get_visible():
+                self._annot.set_visible(False)
+                self.draw_idle()
+            return
+
+        idx = info["ind"][0]
+        s = self._samples[idx]
+        x = self._xs_km[idx]
+        y = self._ys_km[idx]
+        r = self._rs_km[idx]
+
+        self._annot.xy = (x, y)
+        self._annot.set_text(
+            f"Lat  {s.lat_deg:.4f}°\n"
+            f"Lon  {s.lon_deg:.4f}°\n"
+            f"Dist {r:.1f} km"
+        )
+        self._annot.set_visible(True)
+        self.draw_idle()
@@ -0,0 +1,303 @@
+"""
+cli.py
+
+Prévision en ligne de commande, sans interface : pour les serveurs
+sans écran et les tâches cron.
+
+    python -m App.cli predict --lat 48.85 --lon 2.35 --alt 30000 \
+        --ascent CSV/ascent_profile.csv --descent CSV/descent_profile_default.csv \
+        --wind CSV/wind_profile.csv -o resultats/
+
+Ici je gère :
+- la lecture des profils CSV et/ou d'un ou plusieurs GRIB GFS
+- une simulation (simulate_flight / simulate_descent) et, en option,
+  un Monte Carlo (run_monte_carlo)
+- l'écriture de la trajectoire et des impacts en CSV / GeoJSON / JSON
+
+Aucun import de PyQt5, folium ou matplotlib : le démarrage reste rapide.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from dataclasses import asdict
+from typing import List, Optional, Sequence
+
+from App import export, gfs_utils
+from App.integrators import INTEGRATORS
+from App.montecarlo import MC_METHODS, run_monte_carlo
+from App.profiles import (
+    AscentProfile,
+    DescentProfile,
+    WindProfile,
+    ascent_with_mass,
+    descent_with_mass,
+    read_ascent_csv,
+    read_descent_csv,
+    read_wind_csv,
+)
+from App.simulation import RECORD_MODES, simulate_descent, simulate_flight
+from App.version import __version__
+
+# Formats de sortie
+FORMATS = ("csv", "geojson", "json")
+
+
+# ============================================================
+# Arguments
+# ============================================================
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m App.cli",
+        description="Sonde Predict : prévision de trajectoire sans interface.",
+    )
+    parser.add_argument("--version", action="version", version=f"Sonde Predict {__version__}")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("predict", help="simule un vol et écrit les résultats")
+
+    g = p.add_argument_group("lancement")
+    g.add_argument("--lat", type=float, required=True, help="latitude de départ (°)")
+    g.add_argument("--lon", type=float, required=True, help="longitude de départ (°)")
+    g.add_argument("--alt", type=float, required=True,
+                   help="altitude de burst (m) avec --ascent, sinon altitude de début de descente")
+    g.add_argument("--mass", type=float, default=1.0,
+                   help="masse (kg) : corrige les profils livrés pour ~1 kg (défaut 1)")
+
+    g = p.add_argument_group("profils")
+    g.add_argument("--descent", required=True, help="CSV du profil de descente (alt_m;descent_ms)")
+    g.add_argument("--ascent", help="CSV du profil de montée (alt_m;ascent_ms) ; sans lui, descente seule")
+    g.add_argument("--wind", help="CSV du profil de vent (alt_m;wind_u_ms;wind_v_ms)")
+    g.add_argument("--grib", action="append", default=[],
+                   help="GRIB GFS (répétable : une échéance par fichier)")
+    g.add_argument("--grib-fhour", action="append", type=float, default=[],
+                   help="échéance (h) de chaque --grib, dans le même ordre")
+    g.add_argument("--launch-fhour", type=float, default=None,
+                   help="échéance (h) au moment du lancement (défaut : la première)")
+    g.add_argument("--hmethod", choices=gfs_utils.HORIZONTAL_METHODS, default="bilinear",
+                   help="interpolation horizontale GFS (défaut bilinear)")
+    g.add_argument("--wind-4d", action="store_true",
+                   help="vent GFS lu à la position de la sonde à chaque pas (Euler)")
+
+    g = p.add_argument_group("simulation")
+    g.add_argument("--dt", type=float, default=1.0, help="pas de temps (s)")
+    g.add_argument("--integrator", choices=INTEGRATORS, default="euler")
+    g.add_argument("--tol", type=float, default=1.0, help="tolérance RK45 (m)")
+    g.add_argument("--compiled", action="store_true", help="boucle Euler compilée (Numba)")
+    g.add_argument("--free-fall-alt", type=float, default=None,
+                   help="altitude de rupture (m) avec --ascent : au-delà, la montée s'arrête "
+                        "et la descente commence en chute libre")
+    g.add_argument("--free-fall-factor", type=float, default=1.0,
+                   help="facteur de vitesse de descente après rupture (--free-fall-alt)")
+    g.add_argument("--record", choices=RECORD_MODES, default="full",
+                   help="points de trajectoire enregistrés")
+    g.add_argument("--record-every", type=int, default=10, help="pas enregistrés (record=every_n)")
+
+    g = p.add_argument_group("Monte Carlo")
+    g.add_argument("--mc", type=int, default=0, metavar="N", help="nombre de runs (0 = pas de Monte Carlo)")
+    g.add_argument("--mc-method", choices=MC_METHODS, default="batch")
+    g.add_argument("--sigma-wind", type=float, default=2.0, help="bruit vent (m/s)")
+    g.add_argument("--sigma-desc", type=float, default=0.10, help="bruit relatif descente")
+    g.add_argument("--k-sigma", type=float, default=2.4477, help="facteur de l'ellipse (~95 %%)")
+    g.add_argument("--seed", type=int, default=None)
+    g.add_argument("--workers", type=int, default=1, help="processus Monte Carlo (0 = tous les cœurs)")
+
+    g = p.add_argument_group("sortie")
+    g.add_argument("-o", "--output-dir", default=".", help="dossier de sortie")
+    g.add_argument("--prefix", default="prediction", help="préfixe des fichiers")
+    g.add_argument("--format", nargs="+", choices=FORMATS, default=list(FORMATS), dest="formats")
+    g.add_argument("-q", "--quiet", action="store_true", help="pas de résumé sur la sortie standard")
+
+    return parser
+
+
+# ============================================================
+# Vent
+# ============================================================
+
+def _load_wind(args):
+    """
+    (profil vent au lancement, champ 4D ou None) d'après --wind / --grib.
+    """
+    if args.wind and args.grib:
+        raise ValueError("--wind et --grib sont exclusifs.")
+    if not args.wind and not args.grib:
+        raise ValueError("Un profil de vent est requis : --wind ou --grib.")
+
+    if args.wind:
+        if args.wind_4d:
+            raise ValueError("--wind-4d demande un GRIB (--grib).")
+        return WindProfile(read_wind_csv(args.wind)), None
+
+    if len(args.grib) == 1 and not args.grib_fhour:
+        field = gfs_utils.open_wind_field(args.grib[0])
+        points = field.wind_points(args.lat, args.lon, args.hmethod)
+    else:
+        if len(args.grib_fhour) != len(args.grib):
+            raise ValueError("Avec plusieurs --grib, donner une --grib-fhour par fichier.")
+        launch = args.launch_fhour if args.launch_fhour is not None else min(args.grib_fhour)
+        field = gfs_utils.TimeInterpolatedWindField(
+            list(zip(args.grib_fhour, args.grib)),
+            launch_fhour=launch,
+        )
+        points = field.wind_points(args.lat, args.lon, args.hmethod)
+
+    if not points:
+        raise ValueError("Aucun niveau de vent valide au point de lancement.")
+
+    return WindProfile(points), (field if args.wind_4d else None)
+
+
+# ============================================================
+# Prévision
+# ============================================================
+
+def _output_path(args, suffix: str) -> str:
+    return os.path.join(args.output_dir, f"{args.prefix}{suffix}")
+
+
+def predict(args) -> List[str]:
+    """
+    Lance la prévision décrite par args et écrit les fichiers.
+    Retourne les chemins écrits.
+    """
+    if args.alt <= 0:
+        raise ValueError("--alt doit être > 0.")
+    if args.mc and not args.ascent:
+        raise ValueError("Le Monte Carlo simule le vol complet : --ascent est requis.")
+
+    descent = descent_with_mass(DescentProfile(read_descent_csv(args.descent)), args.mass)
+    ascent: Optional[AscentProfile] = None
+    if args.ascent:
+        ascent = ascent_with_mass(AscentProfile(read_ascent_csv(args.ascent)), args.mass)
+
+    wind, field = _load_wind(args)
+    sim_wind = field if field is not None else wind
+
+    common = dict(
+        lat0_deg=args.lat,
+        lon0_deg=args.lon,
+        dt_s=args.dt,
+        descent_profile=descent,
+        wind_profile=sim_wind,
+        record=args.record,
+        record_every=args.record_every,
+        integrator=args.integrator,
+        tol_m=args.tol,
+        compiled=args.compiled,
+    )
+
+    t0 = time.perf_counter()
+    if ascent is not None:
+        traj = simulate_flight(
+            alt_start_m=0.0,
+            alt_burst_m=args.alt,
+            ascent_profile=ascent,
+            ff_start_alt=args.free_fall_alt,
+            free_fall_factor=args.free_fall_factor,
+            **common,
+        )
+    else:
+        traj = simulate_descent(alt0_m=args.alt, **common)
+    sim_s = time.perf_counter() - t0
+
+    impacts, ellipse, mc_s = None, None, None
+    if args.mc:
+        t0 = time.perf_counter()
+        impacts, ellipse = run_monte_carlo(
+            n_runs=args.mc,
+            alt0_m=args.alt,
+            lat0_deg=args.lat,
+            lon0_deg=args.lon,
+            dt_s=args.dt,
+            base_ascent=ascent,
+            base_descent=descent,
+            base_wind=wind,
+            sigma_desc_rel=args.sigma_desc,
+            sigma_wind_ms=args.sigma_wind,
+            k_sigma=args.k_sigma,
+            seed=args.seed,
+            method=args.mc_method,
+            n_workers=args.workers or None,
+        )
+        mc_s = time.perf_counter() - t0
+
+    # ---------- Écriture ----------
+    os.makedirs(args.output_dir, exist_ok=True)
+    written: List[str] = []
+
+    def out(suffix: str) -> str:
+        path = _output_path(args, suffix)
+        written.append(path)
+        return path
+
+    if "csv" in args.formats:
+        export.write_trajectory_csv(traj, out("_trajectory.csv"))
+        if impacts is not None:
+            export.write_impacts_csv(impacts, out("_impacts.csv"))
+
+    if "geojson" in args.formats:
+        export.write_json(export.trajectory_geojson(traj), out("_trajectory.geojson"))
+        if impacts is not None:
+            export.write_json(export.impacts_geojson(impacts, ellipse, args.lat, args.lon),
+                              out("_impacts.geojson"))
+
+    if "json" in args.formats:
+        summary = {
+            "version": __version__,
+            "launch": {"lat_deg": args.lat, "lon_deg": args.lon, "alt_m": args.alt,
+                       "mass_kg": args.mass},
+            "mode": "flight" if ascent is not None else "descent",
+            "integrator": args.integrator,
+            "dt_s": args.dt,
+            "wind": "gfs-4d" if field is not None else ("gfs" if args.grib else "csv"),
+            "summary": asdict(traj.summary),
+            "points": len(traj),
+            "simulation_s": sim_s,
+        }
+        if impacts is not None:
+            summary["monte_carlo"] = {
+                "runs": len(impacts),
+                "method": args.mc_method,
+                "seed": args.seed,
+                "ellipse": None if ellipse is None else asdict(ellipse),
+                "elapsed_s": mc_s,
+            }
+        export.write_json(summary, out(".json"))
+
+    if not args.quiet:
+        s = traj.summary
+        print(f"Impact : {s.impact_lat_deg:.5f}, {s.impact_lon_deg:.5f}"
+              f"  (vol {s.flight_time_s / 60:.1f} min, dérive max {s.max_drift_m / 1000:.1f} km)")
+        if impacts is not None:
+            print(f"Monte Carlo : {len(impacts)} runs en {mc_s:.1f} s")
+        for path in written:
+            print(f"→ {path}")
+
+    return written
+
+
+# ============================================================
+# Entrée
+# ============================================================
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "predict":
+            predict(args)
+    except (OSError, ValueError) as e:
+        print(f"Erreur : {e}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
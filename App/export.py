@@ -0,0 +1,174 @@
+"""
+export.py
+
+Écriture des résultats d'une prévision sur disque, sans Qt.
+
+Ici je gère :
+- la trajectoire en CSV (même séparateur « ; » que les profils) et GeoJSON
+- les impacts Monte Carlo en CSV et GeoJSON (points + ellipse)
+- un résumé JSON (paramètres, résumé du vol, ellipse)
+
+Coordonnées GeoJSON dans l'ordre de la norme : [lon, lat, alt].
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import math
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+
+from App.montecarlo import EllipseResult, ImpactSample
+from App.simulation import EARTH_RADIUS_M, PHASE_NAMES, Trajectory
+
+# Points du contour de l'ellipse exporté
+ELLIPSE_POINTS = 72
+
+
+# ============================================================
+# Trajectoire
+# ============================================================
+
+def write_trajectory_csv(traj: Trajectory, path: str) -> None:
+    """
+    Une ligne par point enregistré : t, phase, altitude, position,
+    vitesse verticale et vent.
+    """
+    phases = [PHASE_NAMES[c] for c in traj.phase_code.tolist()]
+    rows = zip(
+        traj.t_s.tolist(),
+        phases,
+        traj.alt_m.tolist(),
+        traj.lat_deg.tolist(),
+        traj.lon_deg.tolist(),
+        traj.descent_ms.tolist(),
+        traj.wind_u_ms.tolist(),
+        traj.wind_v_ms.tolist(),
+    )
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(["t_s", "phase", "alt_m", "lat_deg", "lon_deg",
+                         "descent_ms", "wind_u_ms", "wind_v_ms"])
+        for t, phase, alt, lat, lon, vd, u, v in rows:
+            writer.writerow([f"{t:.1f}", phase, f"{alt:.1f}", f"{lat:.6f}", f"{lon:.6f}",
+                             f"{vd:.2f}", f"{u:.2f}", f"{v:.2f}"])
+
+
+def _point(lat: float, lon: float, alt: Optional[float], **props) -> Dict[str, Any]:
+    coords = [lon, lat] if alt is None else [lon, lat, alt]
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": coords},
+        "properties": props,
+    }
+
+
+def trajectory_geojson(traj: Trajectory) -> Dict[str, Any]:
+    """
+    FeatureCollection : la trajectoire (LineString 3D) + lancement,
+    burst et impact (Point).
+    """
+    coords = [
+        [lon, lat, alt]
+        for lon, lat, alt in zip(traj.lon_deg.tolist(), traj.lat_deg.tolist(), traj.alt_m.tolist())
+    ]
+    features = [{
+        "type": "Feature",
+        "geometry": {"type": "LineString", "coordinates": coords},
+        "properties": {"name": "trajectory"},
+    }]
+
+    if coords:
+        lon, lat, alt = coords[0]
+        features.append(_point(lat, lon, alt, name="launch"))
+
+    summary = getattr(traj, "summary", None)
+    if summary is not None:
+        if summary.burst_lat_deg is not None:
+            features.append(_point(
+                summary.burst_lat_deg, summary.burst_lon_deg, summary.burst_alt_m,
+                name="burst", t_s=summary.burst_t_s,
+            ))
+        features.append(_point(
+            summary.impact_lat_deg, summary.impact_lon_deg, 0.0,
+            name="impact", t_s=summary.flight_time_s,
+        ))
+
+    return {"type": "FeatureCollection", "features": features}
+
+
+# ============================================================
+# Monte Carlo
+# ============================================================
+
+def write_impacts_csv(impacts: List[ImpactSample], path: str) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(["lat_deg", "lon_deg", "x_m", "y_m"])
+        for s in impacts:
+            writer.writerow([f"{s.lat_deg:.6f}", f"{s.lon_deg:.6f}", f"{s.x_m:.1f}", f"{s.y_m:.1f}"])
+
+
+def ellipse_latlon(
+    ellipse: EllipseResult,
+    lat0_deg: float,
+    lon0_deg: float,
+    n_points: int = ELLIPSE_POINTS,
+) -> List[List[float]]:
+    """
+    Contour fermé de l'ellipse en [lon, lat], repassé du repère local
+    (x Est / y Nord, centré sur le lancement) en géographique.
+    """
+    cos_lat0 = math.cos(math.radians(lat0_deg))
+    cos_a = math.cos(ellipse.angle_rad)
+    sin_a = math.sin(ellipse.angle_rad)
+
+    ring = []
+    for k in range(n_points + 1):
+        t = 2.0 * math.pi * k / n_points
+        xr = ellipse.a_m * math.cos(t)
+        yr = ellipse.b_m * math.sin(t)
+        x = ellipse.cx_m + xr * cos_a - yr * sin_a
+        y = ellipse.cy_m + xr * sin_a + yr * cos_a
+
+        lat = lat0_deg + math.degrees(y / EARTH_RADIUS_M)
+        lon = lon0_deg + math.degrees(x / (EARTH_RADIUS_M * cos_lat0))
+        ring.append([lon, lat])
+
+    return ring
+
+
+def impacts_geojson(
+    impacts: List[ImpactSample],
+    ellipse: Optional[EllipseResult],
+    lat0_deg: float,
+    lon0_deg: float,
+) -> Dict[str, Any]:
+    """
+    FeatureCollection : un Point par impact + l'ellipse (Polygon) si dispo.
+    """
+    features = [
+        _point(s.lat_deg, s.lon_deg, None, name="impact", run=k)
+        for k, s in enumerate(impacts)
+    ]
+
+    if ellipse is not None and ellipse.a_m > 0.0 and ellipse.b_m > 0.0:
+        features.append({
+            "type": "Feature",
+            "geometry": {"type": "Polygon", "coordinates": [ellipse_latlon(ellipse, lat0_deg, lon0_deg)]},
+            "properties": {"name": "ellipse", **asdict(ellipse)},
+        })
+
+    return {"type": "FeatureCollection", "features": features}
+
+
+# ============================================================
+# Fichiers JSON
+# ============================================================
+
+def write_json(data: Any, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write("\n")
@@ -6,17 +6,68 @@ Gestion du téléchargement des données GFS depuis NOMADS (NOAA).
 Ce module me sert à :
 - construire proprement une URL GFS 0.25° filtrée (zone, niveaux, variables)
 - télécharger un fichier GRIB2 en gérant les cas d'erreur (404, réseau)
+- reprendre un téléchargement interrompu (HTTP Range) avec quelques essais
+- télécharger plusieurs échéances en parallèle sur une même session HTTP
+- garder un cache local (gfs_data/) indexé par les paramètres de la requête
+- trouver le dernier run GFS publié (requêtes HEAD, résultat mémorisé)
+
+Un fichier n'apparaît sous son nom final qu'une fois complet : il est
+écrit dans un « .part » puis renommé.
 """
 
-from typing import List
+import glob
+import hashlib
+import json
+import os
+import random
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 from urllib.parse import urlencode, quote_plus
 
 import requests
+from requests.adapters import HTTPAdapter
 
 
 # URL de base NOMADS pour GFS 0.25°
 BASE_URL = "https://nomads.ncep.noaa.gov/cgi-bin/filter_gfs_0p25.pl"
 
+# Arborescence brute NOMADS (sert à tester la présence d'un run)
+PROD_URL = "https://nomads.ncep.noaa.gov/pub/data/nccf/com/gfs/prod"
+
+# Cycles GFS (h UTC)
+GFS_CYCLES = (0, 6, 12, 18)
+
+# Runs remontés pour chercher le dernier disponible (8 = 2 jours)
+CYCLE_LOOKBACK = 8
+
+# Durée de validité d'une réponse HEAD mémorisée (s)
+CYCLE_TTL_S = 600.0
+
+# Téléchargements simultanés (NOMADS limite le nombre de requêtes par IP)
+MAX_PARALLEL_DOWNLOADS = 4
+
+# Nouveaux essais après une erreur réseau / serveur (5xx, 429)
+DOWNLOAD_RETRIES = 3
+
+# Attente de base avant un nouvel essai (s), doublée à chaque essai
+RETRY_BACKOFF_S = 1.0
+
+# Taille des blocs lus / écrits (une coupure perd au plus un bloc)
+CHUNK_SIZE = 1024 * 1024  # 1 Mo
+
+# Cache local des GRIB téléchargés
+CACHE_DIR = "gfs_data"
+CACHE_MANIFEST = "manifest.json"
+CACHE_MAX_BYTES = 2 * 1024 ** 3  # 2 Go
+
+# Codes HTTP pour lesquels un nouvel essai a du sens
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+
 
 def build_gfs_url(
     date_yyyymmdd: str,
@@ -29,6 +80,7 @@ def build_gfs_url(
     vars_: List[str],
     levels_hpa: List[int],
     all_levels: bool,
+    base_url: str = BASE_URL,
 ) -> str:
     """
     Construit l'URL NOMADS pour télécharger un sous-ensemble GFS 0.25°.
@@ -73,62 +125,595 @@ def build_gfs_url(
 
     # Encodage propre de l'URL
     query = urlencode(params, doseq=True, quote_via=quote_plus)
-    return f"{BASE_URL}?{query}"
+    return f"{base_url}?{query}"
+
+
+def make_session(pool_size: int = MAX_PARALLEL_DOWNLOADS) -> requests.Session:
+    """
+    Session HTTP partagée : les connexions (TLS compris) sont réutilisées
+    d'un fichier à l'autre. Le pool est dimensionné pour pool_size
+    téléchargements simultanés.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _retry_delay(attempt: int, backoff_s: float) -> float:
+    """
+    Attente avant l'essai suivant : exponentielle + gigue (évite que
+    tous les téléchargements relancent en même temps).
+    """
+    return backoff_s * (2 ** attempt) * random.uniform(0.5, 1.5)
 
 
-def download_gfs(url: str, output_path: str, timeout: int = 120) -> bool:
+def _range_start(content_range: str) -> Optional[int]:
+    """
+    Premier octet d'un en-tête Content-Range (« bytes 100-199/200 »).
+    """
+    try:
+        return int(content_range.split()[1].split("-")[0])
+    except (IndexError, ValueError):
+        return None
+
+
+def download_gfs(
+    url: str,
+    output_path: str,
+    timeout: int = 120,
+    session: Optional[requests.Session] = None,
+    retries: int = DOWNLOAD_RETRIES,
+    backoff_s: float = RETRY_BACKOFF_S,
+    show_progress: bool = True,
+) -> bool:
     """
     Télécharge un fichier GRIB2 GFS depuis NOMADS.
 
     Je retourne :
     - True  → téléchargement OK
-    - False → fichier non disponible (404 ou erreur réseau)
+    - False → fichier non disponible (404) ou échec après tous les essais
 
-    Le téléchargement est fait en streaming pour éviter de charger
-    tout le fichier en mémoire.
+    Le téléchargement est fait en streaming dans output_path + ".part".
+    Après une coupure, l'essai suivant reprend là où le .part s'est
+    arrêté (en-tête Range) ; si le serveur ignore Range, je repars de
+    zéro. Le fichier final n'est créé (renommage atomique) qu'une fois
+    complet.
     """
 
     print(f"[GFS] URL : {url}")
 
+    http = session if session is not None else requests
+    part_path = output_path + ".part"
+    name = os.path.basename(output_path)
+
+    for attempt in range(retries + 1):
+        if attempt > 0:
+            delay = _retry_delay(attempt - 1, backoff_s)
+            print(f"\n[GFS] ↻ {name} : nouvel essai {attempt}/{retries} dans {delay:.1f} s")
+            time.sleep(delay)
+
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+        try:
+            with http.get(url, stream=True, timeout=timeout, headers=headers) as response:
+
+                # Cas classique NOMADS : fichier pas encore publié
+                if response.status_code == 404:
+                    print(f"[GFS] ❌ 404 – {name} non disponible sur NOMADS")
+                    return False
+
+                # .part incohérent avec le fichier distant → on repart de zéro
+                if response.status_code == 416:
+                    os.remove(part_path)
+                    continue
+
+                if response.status_code in _RETRY_STATUS:
+                    print(f"\n[GFS] ❌ {name} : HTTP {response.status_code}")
+                    continue
+
+                # Autres erreurs HTTP : inutile d'insister
+                response.raise_for_status()
+
+                # Reprise acceptée seulement si le serveur repart bien de offset
+                resumed = (
+                    response.status_code == 206
+                    and _range_start(response.headers.get("Content-Range", "")) == offset
+                )
+                if not resumed:
+                    offset = 0
+
+                expected = int(response.headers.get("Content-Length", "0")) or None
+                total_size = offset + expected if expected else None
+                downloaded = offset
+
+                with open(part_path, "ab" if resumed else "wb") as f:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        if not chunk:
+                            continue
+
+                        f.write(chunk)
+                        downloaded += len(chunk)
+
+                        if not show_progress:
+                            continue
+
+                        # Affichage progression lisible
+                        if total_size:
+                            pct = 100.0 * downloaded / total_size
+                            print(
+                                f"\r[GFS] {downloaded/1e6:6.1f} / {total_size/1e6:6.1f} Mo ({pct:5.1f}%)",
+                                end="",
+                            )
+                        else:
+                            print(
+                                f"\r[GFS] {downloaded/1e6:6.1f} Mo téléchargés",
+                                end="",
+                            )
+
+            # Connexion fermée avant la fin annoncée → reprise à l'essai suivant
+            if total_size is not None and downloaded < total_size:
+                print(f"\n[GFS] ❌ {name} incomplet ({downloaded} / {total_size} octets)")
+                continue
+
+            os.replace(part_path, output_path)
+            print(f"\n[GFS] ✅ Téléchargement terminé : {name}")
+            return True
+
+        except requests.HTTPError as e:
+            print(f"\n[GFS] ❌ Erreur HTTP : {e}")
+            return False
+
+        except requests.RequestException as e:
+            print(f"\n[GFS] ❌ Erreur réseau : {e}")
+
+    print(f"[GFS] ❌ {name} : abandon après {retries + 1} essais")
+    return False
+
+
+def download_many(
+    jobs: Sequence[Tuple[str, str]],
+    max_workers: int = MAX_PARALLEL_DOWNLOADS,
+    session: Optional[requests.Session] = None,
+    **kwargs,
+) -> List[bool]:
+    """
+    Télécharge plusieurs fichiers (url, chemin) en parallèle.
+
+    Les threads partagent une seule session (pool de connexions).
+    Retourne un booléen par job, dans l'ordre de jobs ; les autres
+    arguments sont passés à download_gfs.
+    """
+    if not jobs:
+        return []
+
+    n = max(1, min(max_workers, len(jobs)))
+    own_session = session is None
+    if own_session:
+        session = make_session(n)
+
+    kwargs.setdefault("show_progress", n == 1)
+
+    try:
+        with ThreadPoolExecutor(max_workers=n) as pool:
+            futures = [
+                pool.submit(download_gfs, url, path, session=session, **kwargs)
+                for url, path in jobs
+            ]
+            return [f.result() for f in futures]
+    finally:
+        if own_session:
+            session.close()
+
+
+# ============================================================
+# Cache local (gfs_data/)
+# ============================================================
+
+@dataclass(frozen=True)
+class GfsRequest:
+    """
+    Sous-ensemble GFS demandé à NOMADS : les paramètres de build_gfs_url,
+    normalisés (variables en majuscules triées, niveaux triés).
+
+    levels vide = tous les niveaux.
+    """
+    date: str
+    cycle: int
+    fhour: int
+    lat_min: float
+    lat_max: float
+    lon_min: float
+    lon_max: float
+    vars_: Tuple[str, ...]
+    levels: Tuple[int, ...] = ()
+
+    @classmethod
+    def make(
+        cls,
+        date: str,
+        cycle: int,
+        fhour: int,
+        lat_min: float,
+        lat_max: float,
+        lon_min: float,
+        lon_max: float,
+        vars_: Iterable[str],
+        levels_hpa: Iterable[int] = (),
+    ) -> "GfsRequest":
+        return cls(
+            date=str(date),
+            cycle=int(cycle),
+            fhour=int(fhour),
+            lat_min=float(min(lat_min, lat_max)),
+            lat_max=float(max(lat_min, lat_max)),
+            lon_min=float(min(lon_min, lon_max)),
+            lon_max=float(max(lon_min, lon_max)),
+            vars_=tuple(sorted({v.strip().upper() for v in vars_})),
+            levels=tuple(sorted({int(lev) for lev in levels_hpa})),
+        )
+
+    @property
+    def key(self) -> str:
+        """
+        Empreinte des paramètres (sert de nom de fichier dans le cache).
+        """
+        blob = json.dumps(asdict(self), sort_keys=True)
+        return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16]
+
+    @property
+    def file_name(self) -> str:
+        return f"gfs_{self.date}_{self.cycle:02d}_f{self.fhour:03d}_{self.key}.grib2"
+
+    def url(self, base_url: str = BASE_URL) -> str:
+        return build_gfs_url(
+            date_yyyymmdd=self.date,
+            cycle_hour=self.cycle,
+            fhour=self.fhour,
+            lat_min=self.lat_min,
+            lat_max=self.lat_max,
+            lon_min=self.lon_min,
+            lon_max=self.lon_max,
+            vars_=list(self.vars_),
+            levels_hpa=list(self.levels),
+            all_levels=not self.levels,
+            base_url=base_url,
+        )
+
+    def covers(self, other: "GfsRequest") -> bool:
+        """
+        True si ce fichier contient tout ce que demande other : même run
+        et échéance, zone qui englobe, variables et niveaux inclus.
+        """
+        if (self.date, self.cycle, self.fhour) != (other.date, other.cycle, other.fhour):
+            return False
+
+        if not (
+            self.lat_min <= other.lat_min
+            and self.lat_max >= other.lat_max
+            and self.lon_min <= other.lon_min
+            and self.lon_max >= other.lon_max
+        ):
+            return False
+
+        if not set(other.vars_) <= set(self.vars_):
+            return False
+
+        # Tous les niveaux couvrent n'importe quelle liste ; l'inverse jamais
+        if not self.levels:
+            return True
+        return bool(other.levels) and set(other.levels) <= set(self.levels)
+
+
+class GfsCache:
+    """
+    Cache des GRIB GFS dans un dossier (gfs_data/ par défaut).
+
+    Chaque fichier est nommé d'après l'empreinte de sa requête et décrit
+    dans manifest.json (requête, taille, dernier usage). Une requête est
+    servie par n'importe quel fichier qui la couvre (zone plus grande,
+    plus de niveaux ou de variables). Au-delà de max_bytes, les fichiers
+    les moins récemment utilisés sont supprimés.
+
+    Seuls les fichiers du manifeste sont gérés : les autres fichiers du
+    dossier ne sont jamais touchés.
+    """
+
+    def __init__(self, root: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = int(max_bytes)
+        self.manifest_path = os.path.join(root, CACHE_MANIFEST)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = self._load()
+
+    # ------------------------
+    # Manifeste
+    # ------------------------
+    def _load(self) -> Dict[str, dict]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            entries = data.get("entries", {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+        # Fichiers supprimés ou modifiés à la main → entrée oubliée
+        valid = {}
+        for key, entry in entries.items():
+            path = os.path.join(self.root, entry.get("file", ""))
+            try:
+                if os.path.getsize(path) == entry["size"]:
+                    valid[key] = entry
+            except (OSError, KeyError):
+                continue
+        return valid
+
+    def _save(self) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "entries": self._entries}, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.manifest_path)
+
+    @staticmethod
+    def _request(entry: dict) -> GfsRequest:
+        req = dict(entry["request"])
+        req["vars_"] = tuple(req["vars_"])
+        req["levels"] = tuple(req["levels"])
+        return GfsRequest(**req)
+
+    # ------------------------
+    # Accès
+    # ------------------------
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(e["size"] for e in self._entries.values())
+
+    def path_for(self, req: GfsRequest) -> str:
+        """
+        Chemin où télécharger req.
+        """
+        return os.path.join(self.root, req.file_name)
+
+    def lookup(self, req: GfsRequest) -> Optional[str]:
+        """
+        Chemin d'un fichier du cache qui couvre req (le plus petit), ou None.
+        """
+        with self._lock:
+            best = None
+            best_rank = None
+            for key, entry in self._entries.items():
+                cached = self._request(entry)
+                if not cached.covers(req):
+                    continue
+
+                area = (cached.lat_max - cached.lat_min) * (cached.lon_max - cached.lon_min)
+                rank = (entry["size"], area)
+                if best_rank is None or rank < best_rank:
+                    best, best_rank = key, rank
+
+            if best is None:
+                return None
+
+            path = os.path.join(self.root, self._entries[best]["file"])
+            if not os.path.exists(path):
+                del self._entries[best]
+                self._save()
+                return None
+
+            self._entries[best]["last_used"] = time.time()
+            self._save()
+            return path
+
+    def add(self, req: GfsRequest, path: str) -> None:
+        """
+        Enregistre un fichier téléchargé pour req.
+        """
+        with self._lock:
+            now = time.time()
+            self._entries[req.key] = {
+                "file": os.path.relpath(path, self.root),
+                "request": asdict(req),
+                "size": os.path.getsize(path),
+                "created": now,
+                "last_used": now,
+            }
+            self._save()
+
+    def evict(self, keep: Iterable[str] = ()) -> List[str]:
+        """
+        Supprime les fichiers les moins récemment utilisés jusqu'à passer
+        sous max_bytes. Les chemins de keep ne sont jamais supprimés.
+        Retourne les chemins supprimés.
+        """
+        keep = {os.path.abspath(p) for p in keep}
+        removed: List[str] = []
+
+        with self._lock:
+            total = self.total_bytes
+            for key, entry in sorted(self._entries.items(), key=lambda kv: kv[1]["last_used"]):
+                if total <= self.max_bytes:
+                    break
+
+                path = os.path.join(self.root, entry["file"])
+                if os.path.abspath(path) in keep:
+                    continue
+
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+                # Annexes : index cfgrib et cube décodé (voir gfs_utils)
+                base = os.path.basename(path)
+                for side_dir in (".grib_idx", ".wind_cube"):
+                    pattern = os.path.join(self.root, side_dir, glob.escape(base) + ".*")
+                    for side in glob.glob(pattern):
+                        if os.path.isdir(side):
+                            shutil.rmtree(side, ignore_errors=True)
+                        else:
+                            try:
+                                os.remove(side)
+                            except OSError:
+                                pass
+
+                del self._entries[key]
+                total -= entry["size"]
+                removed.append(path)
+
+            if removed:
+                self._save()
+
+        for path in removed:
+            print(f"[GFS] 🗑 Cache plein, suppression de {os.path.basename(path)}")
+        return removed
+
+
+def download_cached(
+    reqs: Sequence[GfsRequest],
+    cache: Optional[GfsCache] = None,
+    base_url: str = BASE_URL,
+    **kwargs,
+) -> List[Optional[str]]:
+    """
+    Chemin local de chaque requête (None si indisponible).
+
+    Les requêtes déjà couvertes par le cache ne sont pas retéléchargées ;
+    les autres passent par download_many (les autres arguments lui sont
+    transmis), puis le cache est ramené sous sa taille maximale.
+    """
+    if cache is None:
+        cache = GfsCache()
+    os.makedirs(cache.root, exist_ok=True)
+
+    paths: List[Optional[str]] = [cache.lookup(req) for req in reqs]
+    for req, path in zip(reqs, paths):
+        if path is not None:
+            print(f"[GFS] ♻ f{req.fhour:03d} déjà en cache : {os.path.basename(path)}")
+
+    todo = [k for k, path in enumerate(paths) if path is None]
+    jobs = [(reqs[k].url(base_url), cache.path_for(reqs[k])) for k in todo]
+
+    for k, (_, path), ok in zip(todo, jobs, download_many(jobs, **kwargs)):
+        if ok:
+            cache.add(reqs[k], path)
+            paths[k] = path
+
+    cache.evict(keep=[p for p in paths if p is not None])
+    return paths
+
+
+# ============================================================
+# Dernier run disponible
+# ============================================================
+
+# url → (instant de la réponse, fichier présent)
+_HEAD_MEMO: Dict[str, Tuple[float, bool]] = {}
+_HEAD_LOCK = threading.Lock()
+
+
+def prod_file_url(date_yyyymmdd: str, cycle_hour: int, fhour: int, prod_url: str = PROD_URL) -> str:
+    """
+    URL de l'index (.idx) d'une échéance dans l'arborescence NOMADS.
+    L'index est publié avec le GRIB et ne pèse que quelques ko.
+    """
+    return (
+        f"{prod_url}/gfs.{date_yyyymmdd}/{cycle_hour:02d}/atmos/"
+        f"gfs.t{cycle_hour:02d}z.pgrb2.0p25.f{fhour:03d}.idx"
+    )
+
+
+def candidate_cycles(now: Optional[datetime] = None, lookback: int = CYCLE_LOOKBACK) -> List[Tuple[str, int]]:
+    """
+    Runs (date, cycle) du plus récent au plus ancien, à partir du cycle
+    en cours à l'instant now (UTC).
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+
+    step = 24 // len(GFS_CYCLES)
+    t = now.replace(hour=(now.hour // step) * step, minute=0, second=0, microsecond=0)
+
+    out = []
+    for _ in range(lookback):
+        out.append((t.strftime("%Y%m%d"), t.hour))
+        t -= timedelta(hours=step)
+    return out
+
+
+def _head_ok(url: str, session, timeout: float, ttl_s: float) -> bool:
+    """
+    True si url répond 200 à un HEAD. Réponse mémorisée ttl_s secondes ;
+    une erreur réseau compte comme absent et n'est pas mémorisée.
+    """
+    now = time.monotonic()
+    with _HEAD_LOCK:
+        hit = _HEAD_MEMO.get(url)
+    if hit is not None and now - hit[0] < ttl_s:
+        return hit[1]
+
     try:
-        with requests.get(url, stream=True, timeout=timeout) as response:
-
-            # Cas classique NOMADS : fichier pas encore publié
-            if response.status_code == 404:
-                print("[GFS] ❌ 404 – fichier non disponible sur NOMADS")
-                return False
-
-            # Autres erreurs HTTP
-            response.raise_for_status()
-
-            total_size = int(response.headers.get("Content-Length", "0")) or None
-            downloaded = 0
-            chunk_size = 1024 * 1024  # 1 Mo
-
-            with open(output_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    if not chunk:
-                        continue
-
-                    f.write(chunk)
-                    downloaded += len(chunk)
-
-                    # Affichage progression lisible
-                    if total_size:
-                        pct = 100.0 * downloaded / total_size
-                        print(
-                            f"\r[GFS] {downloaded/1e6:6.1f} / {total_size/1e6:6.1f} Mo ({pct:5.1f}%)",
-                            end="",
-                        )
-                    else:
-                        print(
-                            f"\r[GFS] {downloaded/1e6:6.1f} Mo téléchargés",
-                            end="",
-                        )
-
-        print("\n[GFS] ✅ Téléchargement terminé")
-        return True
-
-    except requests.RequestException as e:
-        print(f"\n[GFS] ❌ Erreur réseau : {e}")
+        response = session.head(url, timeout=timeout, allow_redirects=True)
+    except requests.RequestException:
         return False
+
+    ok = response.status_code == 200
+    with _HEAD_LOCK:
+        _HEAD_MEMO[url] = (now, ok)
+    return ok
+
+
+def latest_cycle(
+    fhours: Sequence[int] = (0,),
+    now: Optional[datetime] = None,
+    lookback: int = CYCLE_LOOKBACK,
+    prod_url: str = PROD_URL,
+    session: Optional[requests.Session] = None,
+    max_workers: int = MAX_PARALLEL_DOWNLOADS,
+    timeout: float = 10.0,
+    ttl_s: float = CYCLE_TTL_S,
+) -> Optional[Tuple[str, int]]:
+    """
+    Run (date, cycle) le plus récent dont toutes les échéances fhours
+    sont publiées, ou None.
+
+    Toutes les présences (runs × échéances) sont testées d'un coup par
+    des HEAD en parallèle ; les réponses sont mémorisées ttl_s secondes,
+    donc rouvrir le dialogue ne refait pas les requêtes.
+    """
+    cycles = candidate_cycles(now, lookback)
+    fhours = sorted(set(int(fh) for fh in fhours)) or [0]
+    urls = [
+        [prod_file_url(date, cycle, fh, prod_url) for fh in fhours]
+        for date, cycle in cycles
+    ]
+
+    own_session = session is None
+    if own_session:
+        session = make_session(max_workers)
+
+    try:
+        flat = [url for row in urls for url in row]
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            found = dict(zip(flat, pool.map(lambda u: _head_ok(u, session, timeout, ttl_s), flat)))
+    finally:
+        if own_session:
+            session.close()
+
+    for (date, cycle), row in zip(cycles, urls):
+        if all(found[url] for url in row):
+            return date, cycle
+    return None
+
+
+def clear_cycle_memo() -> None:
+    """
+    Oublie les réponses HEAD mémorisées.
+    """
+    with _HEAD_LOCK:
+        _HEAD_MEMO.clear()
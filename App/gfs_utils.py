@@ -2,40 +2,849 @@
 Extraction d’un profil de vent depuis un GRIB2 GFS.
 
 Ce module :
-- ouvre un GRIB GFS avec xarray + cfgrib
+- ouvre un GRIB GFS avec xarray + cfgrib (une seule fois par fichier)
 - extrait U/V sur niveaux isobares
-- convertit pression → altitude
+- convertit les niveaux en altitude : hauteur géopotentielle GFS (HGT)
+  quand le GRIB la contient, atmosphère standard sinon
 - retourne un WindProfile exploitable par le moteur
+- assemble plusieurs échéances en un champ interpolé dans le temps
+
+Le cube U/V est gardé en mémoire dans un GfsWindField : extraire le profil
+d'un autre point de lancement ne relit pas le fichier.
+
+Au premier décodage, le cube est aussi écrit à côté du GRIB en fichiers
+.npy (float32) ; les ouvertures suivantes les lisent en mémoire mappée,
+sans xarray / cfgrib / eccodes.
 
 Auteur : Jeremy
 """
 
 from __future__ import annotations
 
+import glob
 import math
 import os
-from typing import List
+import shutil
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from App.profiles import WindField, WindPoint, WindProfile
+
+# Dossier (à côté des GRIB) où je range les index cfgrib
+INDEX_DIR_NAME = ".grib_idx"
+
+# Dossier (à côté des GRIB) où je range les cubes décodés (.npy)
+CUBE_DIR_NAME = ".wind_cube"
+
+# Version du format de cube (à incrémenter si son contenu change)
+CUBE_FORMAT = 2
 
-import xarray as xr
+# Nombre de GRIB gardés ouverts (cubes en mémoire)
+FIELD_CACHE_SIZE = 4
 
-from App.profiles import WindPoint
+# Interpolation horizontale entre points de grille
+HORIZONTAL_METHODS = ("nearest", "bilinear", "idw")
 
+# Pas entre deux échéances GFS téléchargées (h)
+GFS_STEP_H = 3
 
-def pressure_hpa_to_alt_m(p_hpa: float) -> float:
+# Rayon terrestre moyen (m), pour passer du géopotentiel à l'altitude
+EARTH_RADIUS_M = 6371008.8
+
+# Pesanteur standard (m/s²), géopotentiel Z (m²/s²) → hauteur (gpm)
+G0 = 9.80665
+
+
+def pressure_hpa_to_alt_m(p_hpa):
     """
     Approximation altitude (m) à partir de la pression (hPa).
 
     Atmosphère standard (formule aviation).
-    Suffisant pour de la prédiction ballon.
+    Accepte un scalaire ou un tableau (calcul vectorisé).
+    Sert de repli quand le GRIB ne contient pas HGT.
+    """
+    p = np.maximum(np.asarray(p_hpa, dtype=float), 1.0)  # sécurité
+    alt = 44307.693 * (1.0 - (p / 1013.25) ** 0.190284)
+    return float(alt) if alt.ndim == 0 else alt
+
+
+def geopotential_to_alt_m(gh_m):
+    """
+    Hauteur géopotentielle (gpm, HGT du GFS) → altitude géométrique (m).
+    Vectorisé ; les NaN restent NaN.
+    """
+    gh = np.asarray(gh_m, dtype=float)
+    return EARTH_RADIUS_M * gh / (EARTH_RADIUS_M - gh)
+
+
+# ============================================================
+# Index cfgrib persistant
+# ============================================================
+
+def _file_key(path: str) -> Tuple[int, int]:
+    """
+    Clé de validité d'un fichier : (taille, mtime en ns).
+    """
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def _versioned_prefix(grib_path: str, dir_name: str) -> Tuple[str, str]:
+    """
+    (dossier, préfixe) d'un fichier annexe au GRIB, rangé dans
+    <dossier du GRIB>/<dir_name>/.
+
+    Le préfixe contient la taille et la date de modification du GRIB :
+    un fichier re-téléchargé a une autre clé, donc de nouvelles annexes,
+    sans risque de relire une annexe obsolète. Les annexes des anciennes
+    versions du fichier sont supprimées.
+    """
+    grib_path = os.path.abspath(grib_path)
+    size, mtime_ns = _file_key(grib_path)
+
+    side_dir = os.path.join(os.path.dirname(grib_path), dir_name)
+    os.makedirs(side_dir, exist_ok=True)
+
+    base = os.path.basename(grib_path)
+    prefix = f"{base}.{size}-{mtime_ns}."
+
+    for old in glob.glob(os.path.join(glob.escape(side_dir), glob.escape(base) + ".*")):
+        if not os.path.basename(old).startswith(prefix):
+            try:
+                if os.path.isdir(old):
+                    shutil.rmtree(old)
+                else:
+                    os.remove(old)
+            except OSError:
+                pass
+
+    return side_dir, prefix
+
+
+def grib_index_path(grib_path: str) -> str:
+    """
+    Chemin (modèle cfgrib) de l'index associé à un GRIB.
+
+    L'index est rangé dans gfs_data/.grib_idx/, versionné sur la taille
+    et la date du GRIB (voir _versioned_prefix).
+
+    Dossier du GRIB en lecture seule : "" (cfgrib décode alors sans
+    écrire d'index).
+    """
+    try:
+        index_dir, prefix = _versioned_prefix(grib_path, INDEX_DIR_NAME)
+    except OSError as e:
+        print(f"[GFS] Index cfgrib désactivé (dossier non inscriptible) : {e}")
+        return ""
+
+    # {short_hash} : complété par cfgrib selon les clés d'index
+    return os.path.join(index_dir, prefix + "{short_hash}.idx")
+
+
+def cube_path(grib_path: str) -> str:
+    """
+    Dossier du cube décodé (.npy) associé à un GRIB, dans
+    gfs_data/.wind_cube/, versionné comme l'index.
+    """
+    cube_dir, prefix = _versioned_prefix(grib_path, CUBE_DIR_NAME)
+    path = os.path.join(cube_dir, f"{prefix}v{CUBE_FORMAT}.cube")
+
+    # Cubes d'un ancien format : relus jamais, donc supprimés
+    for old in glob.glob(os.path.join(glob.escape(cube_dir), glob.escape(prefix) + "*.cube")):
+        if old != path:
+            shutil.rmtree(old, ignore_errors=True)
+
+    return path
+
+
+# ============================================================
+# Champ de vent GFS
+# ============================================================
+
+def _wind_var(ds, short: str, long: str):
+    # Gestion robuste des noms de variables
+    if short in ds:
+        return ds[short]
+    if long in ds:
+        return ds[long]
+    raise ValueError(f"Vent {short.upper()} introuvable dans le GRIB.")
+
+
+def _wrap_lon_to(lons, lon_deg):
+    """
+    Ramène une longitude à ±180° du centre de la grille lons (tableau
+    ou liste croissante) ; lon_deg : float ou tableau NumPy.
+
+    Un point juste à l'ouest d'une grille régionale reste à l'ouest
+    (et se borne au bord ouest) au lieu de passer à lon0 + 360.
+    """
+    c = 0.5 * (lons[0] + lons[-1])
+    return (lon_deg - c + 180.0) % 360.0 - 180.0 + c
+
+
+def _is_global_lon(lons: np.ndarray) -> bool:
+    """
+    Vrai si les longitudes font le tour complet (pas régulier) : on
+    interpole alors entre la dernière et la première colonne.
+    """
+    if len(lons) < 2:
+        return False
+    step = lons[1] - lons[0]
+    return abs(lons[-1] - lons[0] + step - 360.0) < 0.5 * step
+
+
+def _seam_fraction(lons, lon_deg):
+    """
+    Fraction dans la maille du raccord (dernière colonne → première)
+    d'une grille globale, pour une longitude déjà ramenée par _wrap_lon_to.
+    """
+    return ((lon_deg - lons[-1]) % 360.0) / (lons[0] + 360.0 - lons[-1])
+
+
+class GfsWindField(WindField):
+    """
+    Cube de vent GFS (niveaux × latitudes × longitudes) gardé en mémoire.
+
+    - latitudes / longitudes rangées par ordre croissant
+    - niveaux isobares dans l'ordre du fichier
+    - altitude des niveaux : hauteur géopotentielle du GRIB (gh) colonne
+      par colonne si elle est présente, sinon atmosphère standard (alts_m)
+    - wind_points(lat, lon) : profil interpolé au point demandé,
+      sans relire le GRIB
+    - columns(lats, lons) : colonnes U/V de nombreux points d'un coup
+      (Monte Carlo, balayage de points de lancement)
+
+    Interpolation horizontale (method) :
+    - "nearest"  : point de grille le plus proche
+    - "bilinear" : bilinéaire dans la maille (défaut)
+    - "idw"      : pondération inverse du carré de la distance aux 4 coins
+    Hors de la grille, la position est ramenée au bord.
+
+    C'est aussi un WindField : simulate_flight peut l'utiliser directement
+    (vent trilinéaire lat/lon/alt, voir GfsWindSampler).
+    """
+
+    def __init__(
+        self,
+        levels_hpa: np.ndarray,
+        lats_deg: np.ndarray,
+        lons_deg: np.ndarray,
+        u: np.ndarray,
+        v: np.ndarray,
+        source: Optional[str] = None,
+        t: Optional[np.ndarray] = None,
+        gh: Optional[np.ndarray] = None,
+    ):
+        lats_deg = np.asarray(lats_deg, dtype=float)
+        lons_deg = np.asarray(lons_deg, dtype=float)
+        cubes = {"u": u, "v": v, "t": t, "gh": gh}
+        cubes = {k: np.asarray(c) for k, c in cubes.items() if c is not None}
+
+        shape = (len(levels_hpa), len(lats_deg), len(lons_deg))
+        if any(c.shape != shape for c in cubes.values()):
+            raise ValueError("Dimensions U/V incohérentes avec la grille.")
+
+        # Grille croissante (GFS range les latitudes du nord au sud)
+        if len(lats_deg) > 1 and lats_deg[0] > lats_deg[-1]:
+            lats_deg = lats_deg[::-1]
+            cubes = {k: c[:, ::-1, :] for k, c in cubes.items()}
+        if len(lons_deg) > 1 and lons_deg[0] > lons_deg[-1]:
+            lons_deg = lons_deg[::-1]
+            cubes = {k: c[:, :, ::-1] for k, c in cubes.items()}
+
+        # Un cube mappé (from_cube) est déjà contigu : pas de copie
+        cubes = {k: np.ascontiguousarray(c) for k, c in cubes.items()}
+
+        self.levels_hpa = np.asarray(levels_hpa, dtype=float)
+        self.alts_m = pressure_hpa_to_alt_m(self.levels_hpa).reshape(-1)
+        self.lats_deg = lats_deg
+        self.lons_deg = lons_deg
+        self.u = cubes["u"]
+        self.v = cubes["v"]
+        self.t = cubes.get("t")     # température (K), si présente
+        self.gh = cubes.get("gh")   # hauteur géopotentielle (gpm), si présente
+        self.source = source
+
+        # Colonnes déjà préparées pour l'échantillonnage 4D, par (i, j)
+        self._column_cache: Dict[Tuple[int, int], Tuple[List[float], List[float], List[float]]] = {}
+        self._shared_sampler: Optional[GfsWindSampler] = None
+        self._lon_global = _is_global_lon(self.lons_deg)
+
+    # ------------------------
+    # Lecture GRIB
+    # ------------------------
+    @classmethod
+    def from_grib(cls, grib_path: str) -> "GfsWindField":
+        """
+        Ouvre le GRIB (index cfgrib persistant) et charge U/V en mémoire,
+        avec T et la hauteur géopotentielle s'ils sont présents.
+
+        Hypothèses :
+        - vent sur niveaux isobares (isobaricInhPa)
+        - coordonnées latitude / longitude standards
+        """
+        # Import lourd (xarray + cfgrib) seulement quand il faut décoder
+        import xarray as xr
+
+        with xr.open_dataset(
+            grib_path,
+            engine="cfgrib",
+            backend_kwargs={
+                "filter_by_keys": {
+                    "typeOfLevel": "isobaricInhPa",
+                },
+                "indexpath": grib_index_path(grib_path),
+            },
+        ) as ds:
+
+            u_var = _wind_var(ds, "u", "u_component_of_wind")
+            v_var = _wind_var(ds, "v", "v_component_of_wind")
+
+            # Coordonnées
+            if "latitude" not in ds.coords or "longitude" not in ds.coords:
+                raise ValueError("Coordonnées lat/lon absentes du GRIB.")
+
+            if "isobaricInhPa" not in u_var.dims:
+                raise ValueError("Dimension verticale isobaricInhPa absente.")
+
+            dims = ("isobaricInhPa", "latitude", "longitude")
+            u_var = u_var.transpose(*dims)
+            v_var = v_var.transpose(*dims)
+
+            def optional(*names):
+                # Variables facultatives (choisies au téléchargement)
+                for name in names:
+                    if name in ds and set(ds[name].dims) == set(dims):
+                        return ds[name].transpose(*dims).values
+                return None
+
+            t = optional("t", "air_temperature")
+
+            # HGT (gpm) ; à défaut le géopotentiel Z (m²/s²)
+            gh = optional("gh", "geopotential_height")
+            if gh is None:
+                z = optional("z", "geopotential")
+                gh = None if z is None else z / G0
+
+            return cls(
+                levels_hpa=u_var["isobaricInhPa"].values,
+                lats_deg=ds["latitude"].values,
+                lons_deg=ds["longitude"].values,
+                u=u_var.values,
+                v=v_var.values,
+                source=grib_path,
+                t=t,
+                gh=gh,
+            )
+
+    # ------------------------
+    # Cube décodé (.npy)
+    # ------------------------
+    def to_cube(self, cube_dir: str) -> None:
+        """
+        Écrit le cube en .npy : axes (float64) et U/V/T/HGT (float32).
+
+        Écriture dans un dossier temporaire puis renommage : un cube
+        interrompu n'est jamais relu.
+        """
+        tmp_dir = cube_dir + ".tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        arrays = {
+            "levels_hpa": self.levels_hpa,
+            "lats_deg": self.lats_deg,
+            "lons_deg": self.lons_deg,
+            "u": self.u.astype(np.float32, copy=False),
+            "v": self.v.astype(np.float32, copy=False),
+        }
+        for name in ("t", "gh"):
+            cube = getattr(self, name)
+            if cube is not None:
+                arrays[name] = cube.astype(np.float32, copy=False)
+
+        for name, arr in arrays.items():
+            np.save(os.path.join(tmp_dir, name + ".npy"), arr)
+
+        shutil.rmtree(cube_dir, ignore_errors=True)
+        os.replace(tmp_dir, cube_dir)
+
+    @classmethod
+    def from_cube(cls, cube_dir: str, source: Optional[str] = None) -> "GfsWindField":
+        """
+        Ouvre un cube écrit par to_cube. U/V/T/HGT restent sur disque
+        (mémoire mappée) : seules les mailles lues sont chargées.
+        """
+        def load(name: str, mmap: bool):
+            return np.load(os.path.join(cube_dir, name + ".npy"), mmap_mode="r" if mmap else None)
+
+        def optional(name: str):
+            if not os.path.exists(os.path.join(cube_dir, name + ".npy")):
+                return None
+            return load(name, True)
+
+        return cls(
+            levels_hpa=load("levels_hpa", False),
+            lats_deg=load("lats_deg", False),
+            lons_deg=load("lons_deg", False),
+            u=load("u", True),
+            v=load("v", True),
+            source=source,
+            t=optional("t"),
+            gh=optional("gh"),
+        )
+
+    # ------------------------
+    # Grille
+    # ------------------------
+    def _wrap_lon(self, lon_deg):
+        """
+        Ramène une longitude dans la convention de la grille
+        (-180..180 ou 0..360), à ±180° de son centre.
+        """
+        return _wrap_lon_to(self.lons_deg, np.asarray(lon_deg, dtype=float))
+
+    def contains(self, lat_deg: float, lon_deg: float) -> bool:
+        lon = float(self._wrap_lon(lon_deg))
+        return (
+            self.lats_deg[0] <= lat_deg <= self.lats_deg[-1]
+            and (self._lon_global or self.lons_deg[0] <= lon <= self.lons_deg[-1])
+        )
+
+    def nearest_index(self, lat_deg: float, lon_deg: float) -> Tuple[int, int]:
+        """
+        Indices (i_lat, i_lon) du point de grille le plus proche.
+        """
+        i = int(np.abs(self.lats_deg - lat_deg).argmin())
+        lon = float(self._wrap_lon(lon_deg))
+        # Distance en longitude modulo 360 (grille globale)
+        dlon = np.abs(self.lons_deg - lon)
+        dlon = np.minimum(dlon, 360.0 - dlon)
+        j = int(dlon.argmin())
+        return i, j
+
+    @staticmethod
+    def _axis(coords: np.ndarray, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Maille contenant x sur un axe croissant : (i0, i1, fraction).
+        """
+        n = len(coords)
+        if n == 1:
+            zeros = np.zeros(x.shape, dtype=np.intp)
+            return zeros, zeros, np.zeros(x.shape)
+
+        i0 = np.clip(np.searchsorted(coords, x, side="right") - 1, 0, n - 2)
+        i1 = i0 + 1
+        frac = (x - coords[i0]) / (coords[i1] - coords[i0])
+        return i0, i1, np.clip(frac, 0.0, 1.0)
+
+    def _corners(self, lats_deg, lons_deg, method: str):
+        """
+        Coins de maille et poids d'interpolation pour chaque point.
+
+        Retourne (i0, i1, j0, j1, w) ; w de forme (n, 4) dans l'ordre
+        (i0, j0), (i0, j1), (i1, j0), (i1, j1).
+        """
+        if method not in HORIZONTAL_METHODS:
+            raise ValueError(f"Interpolation horizontale inconnue : {method}")
+
+        lats = np.atleast_1d(np.asarray(lats_deg, dtype=float))
+        lons = np.atleast_1d(self._wrap_lon(lons_deg))
+
+        i0, i1, fy = self._axis(self.lats_deg, lats)
+        j0, j1, fx = self._axis(self.lons_deg, lons)
+
+        if self._lon_global:
+            # Entre la dernière et la première colonne : maille du raccord
+            seam = (lons < self.lons_deg[0]) | (lons > self.lons_deg[-1])
+            if seam.any():
+                j0 = np.where(seam, len(self.lons_deg) - 1, j0)
+                j1 = np.where(seam, 0, j1)
+                fx = np.where(seam, _seam_fraction(self.lons_deg, lons), fx)
+
+        if method == "nearest":
+            # À égalité, le premier point (comme argmin)
+            ny = (fy > 0.5).astype(float)
+            nx = (fx > 0.5).astype(float)
+            w = np.stack([(1 - ny) * (1 - nx), (1 - ny) * nx, ny * (1 - nx), ny * nx], axis=1)
+
+        elif method == "bilinear":
+            w = np.stack([(1 - fy) * (1 - fx), (1 - fy) * fx, fy * (1 - fx), fy * fx], axis=1)
+
+        else:
+            # Distances aux coins (en degrés de latitude, longitude réduite)
+            dlat = self.lats_deg[i1] - self.lats_deg[i0]
+            dlon = ((self.lons_deg[j1] - self.lons_deg[j0]) % 360.0) * np.cos(np.radians(lats))
+            dy = np.stack([fy, fy, fy - 1, fy - 1], axis=1) * dlat[:, None]
+            dx = np.stack([fx, fx - 1, fx, fx - 1], axis=1) * dlon[:, None]
+            d2 = dy * dy + dx * dx
+
+            exact = d2 == 0.0
+            with np.errstate(divide="ignore"):
+                w = np.where(exact.any(axis=1)[:, None], exact.astype(float), 1.0 / d2)
+            w /= w.sum(axis=1, keepdims=True)
+
+        return i0, i1, j0, j1, w
+
+    def columns(
+        self,
+        lats_deg,
+        lons_deg,
+        method: str = "bilinear",
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Colonnes de vent interpolées pour n points à la fois.
+
+        Retourne (u, v), tableaux (n_points, n_niveaux) alignés sur
+        levels_hpa (altitudes : alt_columns).
+        Les coins NaN sont ignorés (poids renormalisés sur les coins
+        valides) ; un niveau n'est NaN que si tous ses coins de poids
+        non nul le sont.
+        """
+        u, v = self._interp_cubes((self.u, self.v), lats_deg, lons_deg, method)
+        return u, v
+
+    def alt_columns(
+        self,
+        lats_deg,
+        lons_deg,
+        method: str = "bilinear",
+    ) -> np.ndarray:
+        """
+        Altitude (m) des niveaux pour n points : tableau (n_points, n_niveaux).
+
+        Hauteur géopotentielle interpolée comme le vent puis convertie en
+        altitude, d'un bloc pour tous les points ; atmosphère standard
+        sans HGT ou là où HGT manque.
+        """
+        n = np.atleast_1d(np.asarray(lats_deg)).shape[0]
+        if self.gh is None:
+            return np.tile(self.alts_m, (n, 1))
+
+        (gh,) = self._interp_cubes((self.gh,), lats_deg, lons_deg, method)
+        alts = geopotential_to_alt_m(gh)
+        return np.where(np.isnan(alts), self.alts_m, alts)
+
+    def grid_alts(self, i: int, j: int) -> np.ndarray:
+        """
+        Altitude (m) des niveaux au point de grille (i, j).
+        """
+        if self.gh is None:
+            return self.alts_m
+
+        alts = geopotential_to_alt_m(self.gh[:, i, j])
+        return np.where(np.isnan(alts), self.alts_m, alts)
+
+    def _interp_cubes(self, cubes, lats_deg, lons_deg, method: str) -> List[np.ndarray]:
+        """
+        Interpolation horizontale de plusieurs cubes avec les mêmes poids.
+
+        Coin NaN (point masqué ou manquant) : poids mis à zéro, les autres
+        renormalisés. Sans ce masque, un coin de poids nul (point pile sur
+        une ligne de grille) propagerait quand même NaN (0 * NaN).
+        """
+        i0, i1, j0, j1, w = self._corners(lats_deg, lons_deg, method)
+        corners = ((i0, j0), (i0, j1), (i1, j0), (i1, j1))
+
+        out = []
+        for cube in cubes:
+            num = np.zeros((len(i0), cube.shape[0]))
+            den = np.zeros_like(num)
+            for k, (ii, jj) in enumerate(corners):
+                val = cube[:, ii, jj].T
+                ok = ~np.isnan(val)
+                wk = np.where(ok, w[:, k, None], 0.0)
+                num += wk * np.where(ok, val, 0.0)
+                den += wk
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                out.append(np.where(den > 0.0, num / den, np.nan))
+        return out
+
+    # ------------------------
+    # Profils
+    # ------------------------
+    def _points_from_columns(
+        self,
+        u_col: np.ndarray,
+        v_col: np.ndarray,
+        alt_col: Optional[np.ndarray] = None,
+    ) -> List[WindPoint]:
+        """
+        Colonne U/V → points triés par altitude, niveaux NaN ignorés.
+        alt_col : altitude de chaque niveau (défaut : atmosphère standard).
+        """
+        points: List[WindPoint] = []
+        alts = self.alts_m if alt_col is None else alt_col
+
+        for alt_m, u, v in zip(alts.tolist(), u_col.tolist(), v_col.tolist()):
+            if math.isnan(u) or math.isnan(v):
+                continue
+
+            points.append(
+                WindPoint(
+                    alt_m=alt_m,
+                    wind_u_ms=float(u),
+                    wind_v_ms=float(v),
+                )
+            )
+
+        # Tri altitude croissante (logique moteur)
+        points.sort(key=lambda wp: wp.alt_m)
+
+        return points
+
+    def wind_points(
+        self,
+        lat_deg: float,
+        lon_deg: float,
+        method: str = "bilinear",
+    ) -> List[WindPoint]:
+        """
+        Profil (alt_m, u, v) au point demandé, trié par altitude
+        croissante, niveaux NaN ignorés.
+        """
+        if method == "nearest":
+            i, j = self.nearest_index(lat_deg, lon_deg)
+            return self._points_from_columns(self.u[:, i, j], self.v[:, i, j], self.grid_alts(i, j))
+
+        u, v = self.columns(lat_deg, lon_deg, method)
+        alts = self.alt_columns(lat_deg, lon_deg, method)
+        return self._points_from_columns(u[0], v[0], alts[0])
+
+    def wind_profile(
+        self,
+        lat_deg: float,
+        lon_deg: float,
+        method: str = "bilinear",
+    ) -> WindProfile:
+        return WindProfile(self.wind_points(lat_deg, lon_deg, method))
+
+    def wind_profiles(
+        self,
+        lats_deg,
+        lons_deg,
+        method: str = "bilinear",
+    ) -> List[WindProfile]:
+        """
+        Un WindProfile par point (lat, lon) : une seule interpolation
+        vectorisée pour tous les points.
+        """
+        u, v = self.columns(lats_deg, lons_deg, method)
+        alts = self.alt_columns(lats_deg, lons_deg, method)
+        return [
+            WindProfile(self._points_from_columns(u_col, v_col, alt_col))
+            for u_col, v_col, alt_col in zip(u, v, alts)
+        ]
+
+
+    # ------------------------
+    # Champ 4D (WindField)
+    # ------------------------
+    def column(self, i: int, j: int) -> Tuple[List[float], List[float], List[float]]:
+        """
+        Colonne (alts, u, v) du point de grille (i, j), triée par altitude,
+        niveaux NaN retirés. Préparée une fois puis gardée en cache.
+        """
+        key = (i, j)
+        col = self._column_cache.get(key)
+        if col is None:
+            points = self._points_from_columns(self.u[:, i, j], self.v[:, i, j], self.grid_alts(i, j))
+            if not points:
+                raise ValueError(f"Colonne GFS vide au point de grille ({i}, {j}).")
+            col = (
+                [p.alt_m for p in points],
+                [p.wind_u_ms for p in points],
+                [p.wind_v_ms for p in points],
+            )
+            self._column_cache[key] = col
+        return col
+
+    def sampler(self) -> "GfsWindSampler":
+        """
+        Nouvel échantillonneur (un par run : il garde sa maille courante).
+        """
+        return GfsWindSampler(self)
+
+    def value_at(
+        self,
+        lat_deg: float,
+        lon_deg: float,
+        alt_m: float,
+        t_s: float = 0.0,
+    ) -> Tuple[float, float]:
+        if self._shared_sampler is None:
+            self._shared_sampler = self.sampler()
+        return self._shared_sampler.value_at(lat_deg, lon_deg, alt_m, t_s)
+
+
+def _locate(coords: List[float], x: float) -> Tuple[int, float]:
+    """
+    Maille d'un axe croissant contenant x : (indice, fraction), bornée.
+    """
+    n = len(coords)
+    if n == 1:
+        return 0, 0.0
+
+    i = bisect_right(coords, x) - 1
+    if i < 0:
+        return 0, 0.0
+    if i >= n - 1:
+        return n - 2, 1.0
+    return i, (x - coords[i]) / (coords[i + 1] - coords[i])
+
+
+def _column_value(col: Tuple[List[float], List[float], List[float]], alt_m: float) -> Tuple[float, float]:
+    """
+    Interpolation verticale linéaire dans une colonne (saturée aux bouts).
+    """
+    alts, us, vs = col
+
+    if alt_m <= alts[0]:
+        return us[0], vs[0]
+    if alt_m >= alts[-1]:
+        return us[-1], vs[-1]
+
+    k = bisect_right(alts, alt_m) - 1
+    r = (alt_m - alts[k]) / (alts[k + 1] - alts[k])
+    return us[k] + r * (us[k + 1] - us[k]), vs[k] + r * (vs[k + 1] - vs[k])
+
+
+class GfsWindSampler(WindField):
     """
-    p_hpa = max(p_hpa, 1.0)  # sécurité
-    return 44307.693 * (1.0 - (p_hpa / 1013.25) ** 0.190284)
+    Lecture trilinéaire (lat, lon, alt) d'un GfsWindField pendant un run.
+
+    Interpolation verticale dans les 4 colonnes de la maille, puis
+    bilinéaire entre elles. Les 4 colonnes de la maille courante sont
+    gardées : tant que la sonde reste dans la même maille (0.25° ≈ 25 km),
+    un pas ne coûte que deux bisections par colonne.
+    """
+
+    def __init__(self, field: GfsWindField):
+        self._field = field
+        self._lats = field.lats_deg.tolist()
+        self._lons = field.lons_deg.tolist()
+        self._n_lat = len(self._lats)
+        self._n_lon = len(self._lons)
+        self._global = field._lon_global
+
+        self._cell: Optional[Tuple[int, int]] = None
+        self._cols = None
+
+    def _load_cell(self, i: int, j: int) -> None:
+        i1 = min(i + 1, self._n_lat - 1)
+        # j = n - 1 : maille du raccord d'une grille globale
+        j1 = (j + 1) % self._n_lon if self._global else min(j + 1, self._n_lon - 1)
+        column = self._field.column
+        self._cols = (column(i, j), column(i, j1), column(i1, j), column(i1, j1))
+        self._cell = (i, j)
+
+    def value_at(
+        self,
+        lat_deg: float,
+        lon_deg: float,
+        alt_m: float,
+        t_s: float = 0.0,
+    ) -> Tuple[float, float]:
+        # Mêmes règles que GfsWindField._corners : bornée au bord le plus
+        # proche, ou maille du raccord sur une grille globale
+        lon = _wrap_lon_to(self._lons, lon_deg)
+
+        i, fy = _locate(self._lats, lat_deg)
+        if self._global and not self._lons[0] <= lon <= self._lons[-1]:
+            j, fx = self._n_lon - 1, _seam_fraction(self._lons, lon)
+        else:
+            j, fx = _locate(self._lons, lon)
+
+        if self._cell != (i, j):
+            self._load_cell(i, j)
+
+        c00, c01, c10, c11 = self._cols
+        u00, v00 = _column_value(c00, alt_m)
+        u01, v01 = _column_value(c01, alt_m)
+        u10, v10 = _column_value(c10, alt_m)
+        u11, v11 = _column_value(c11, alt_m)
+
+        w00 = (1.0 - fy) * (1.0 - fx)
+        w01 = (1.0 - fy) * fx
+        w10 = fy * (1.0 - fx)
+        w11 = fy * fx
+
+        return (
+            w00 * u00 + w01 * u01 + w10 * u10 + w11 * u11,
+            w00 * v00 + w01 * v01 + w10 * v10 + w11 * v11,
+        )
+
+
+# ============================================================
+# Cache des champs ouverts
+# ============================================================
+
+_FIELDS: "OrderedDict[Tuple[str, int, int], GfsWindField]" = OrderedDict()
+
+
+def _load_field(path: str) -> GfsWindField:
+    """
+    Cube .npy s'il existe déjà, sinon décodage du GRIB puis écriture
+    du cube pour les fois suivantes. Dossier du GRIB en lecture seule :
+    décodage direct, sans cube.
+    """
+    try:
+        cube_dir = cube_path(path)
+    except OSError as e:
+        print(f"[GFS] Cube décodé désactivé (dossier non inscriptible) : {e}")
+        return GfsWindField.from_grib(path)
+
+    if os.path.isdir(cube_dir):
+        try:
+            return GfsWindField.from_cube(cube_dir, source=path)
+        except (OSError, ValueError) as e:
+            print(f"[GFS] Cube illisible, nouveau décodage du GRIB : {e}")
+
+    field = GfsWindField.from_grib(path)
+    try:
+        field.to_cube(cube_dir)
+    except OSError as e:
+        print(f"[GFS] Impossible d'écrire le cube décodé : {e}")
+    return field
+
+
+def open_wind_field(grib_path: str) -> GfsWindField:
+    """
+    GfsWindField d'un GRIB, relu seulement si le fichier a changé
+    (clé : chemin, taille, date de modification).
+
+    Le GRIB n'est décodé qu'une fois ; ensuite le cube .npy est ouvert
+    en mémoire mappée (voir cube_path).
+    """
+    path = os.path.abspath(grib_path)
+    key = (path,) + _file_key(path)
+
+    field = _FIELDS.get(key)
+    if field is not None:
+        _FIELDS.move_to_end(key)
+        return field
+
+    field = _load_field(path)
+
+    # Une seule version par fichier + taille bornée
+    for old in [k for k in _FIELDS if k[0] == path]:
+        del _FIELDS[old]
+    _FIELDS[key] = field
+    while len(_FIELDS) > FIELD_CACHE_SIZE:
+        _FIELDS.popitem(last=False)
+
+    return field
 
 
 def extract_wind_profile_from_gfs_grib(
     grib_path: str,
     lat_deg: float,
     lon_deg: float,
+    method: str = "bilinear",
 ) -> List[WindPoint]:
     """
     Extrait un profil vent (alt_m, u, v) depuis un fichier GFS GRIB2.
@@ -43,70 +852,176 @@ def extract_wind_profile_from_gfs_grib(
     Hypothèses :
     - vent sur niveaux isobares (isobaricInhPa)
     - coordonnées latitude / longitude standards
-    - interpolation au point de grille le plus proche
+    - interpolation horizontale bilinéaire par défaut
+      ("nearest" : point de grille le plus proche, comme avant)
+
+    Le GRIB n'est lu qu'une fois : les appels suivants (autre point de
+    lancement) réutilisent le cube en mémoire.
     """
+    return open_wind_field(grib_path).wind_points(lat_deg, lon_deg, method)
 
-    # ⚠️ cfgrib peut garder un index obsolète → on le supprime
-    idx_path = grib_path + ".idx"
-    if os.path.exists(idx_path):
-        os.remove(idx_path)
 
-    ds = xr.open_dataset(
-        grib_path,
-        engine="cfgrib",
-        backend_kwargs={
-            "filter_by_keys": {
-                "typeOfLevel": "isobaricInhPa",
-            }
-        },
-    )
+# ============================================================
+# Champ multi-échéances (interpolation temporelle)
+# ============================================================
 
-    # Gestion robuste des noms de variables
-    if "u" in ds:
-        u_var = ds["u"]
-    elif "u_component_of_wind" in ds:
-        u_var = ds["u_component_of_wind"]
-    else:
-        raise ValueError("Vent U introuvable dans le GRIB.")
-
-    if "v" in ds:
-        v_var = ds["v"]
-    elif "v_component_of_wind" in ds:
-        v_var = ds["v_component_of_wind"]
-    else:
-        raise ValueError("Vent V introuvable dans le GRIB.")
-
-    # Coordonnées
-    if "latitude" not in ds.coords or "longitude" not in ds.coords:
-        raise ValueError("Coordonnées lat/lon absentes du GRIB.")
-
-    # Sélection du point de grille le plus proche
-    u_point = u_var.sel(latitude=lat_deg, longitude=lon_deg, method="nearest")
-    v_point = v_var.sel(latitude=lat_deg, longitude=lon_deg, method="nearest")
-
-    if "isobaricInhPa" not in u_point.coords:
-        raise ValueError("Dimension verticale isobaricInhPa absente.")
-
-    levels_hpa = u_point["isobaricInhPa"].values
-    u_vals = u_point.values
-    v_vals = v_point.values
-
-    points: List[WindPoint] = []
-
-    for p_hpa, u, v in zip(levels_hpa, u_vals, v_vals):
-        if math.isnan(u) or math.isnan(v):
-            continue
-
-        alt_m = pressure_hpa_to_alt_m(float(p_hpa))
-        points.append(
-            WindPoint(
-                alt_m=alt_m,
-                wind_u_ms=float(u),
-                wind_v_ms=float(v),
-            )
+def forecast_window(launch_fhour: float, duration_h: float, step_h: int = GFS_STEP_H) -> List[int]:
+    """
+    Échéances GFS (h) qui encadrent le vol : de l'échéance juste avant
+    le lancement à celle juste après l'atterrissage estimé.
+    """
+    first = int(math.floor(launch_fhour / step_h)) * step_h
+    last = int(math.ceil((launch_fhour + max(duration_h, 0.0)) / step_h)) * step_h
+    return list(range(max(first, 0), max(last, first) + 1, step_h))
+
+
+class TimeInterpolatedWindField(WindField):
+    """
+    Vent GFS sur plusieurs échéances, interpolé linéairement dans le temps.
+
+    steps : (échéance en h, chemin GRIB), dans n'importe quel ordre.
+    launch_fhour : échéance correspondant à t = 0 de la simulation.
+
+    Les GRIB ne sont décodés qu'au premier besoin : seules les échéances
+    réellement traversées par le vol sont lues. Avant la première ou
+    après la dernière échéance, le vent est celui de l'échéance du bord.
+    """
+
+    def __init__(self, steps: Sequence[Tuple[float, str]], launch_fhour: float = 0.0):
+        if not steps:
+            raise ValueError("Aucune échéance GFS fournie.")
+
+        steps = sorted((float(fh), path) for fh, path in steps)
+        self.fhours: List[float] = [fh for fh, _ in steps]
+        self.paths: List[str] = [path for _, path in steps]
+        self.launch_fhour = float(launch_fhour)
+
+        self._fields: List[Optional[GfsWindField]] = [None] * len(steps)
+        self._shared_sampler: Optional[TimeInterpolatedSampler] = None
+
+    def __len__(self) -> int:
+        return len(self.fhours)
+
+    @property
+    def loaded_fhours(self) -> List[float]:
+        """
+        Échéances déjà décodées.
+        """
+        return [fh for fh, f in zip(self.fhours, self._fields) if f is not None]
+
+    def step_field(self, k: int) -> GfsWindField:
+        """
+        Champ de l'échéance k, décodé au premier appel.
+        """
+        field = self._fields[k]
+        if field is None:
+            field = open_wind_field(self.paths[k])
+            self._fields[k] = field
+        return field
+
+    def bracket(self, t_s: float) -> Tuple[int, float]:
+        """
+        (k, r) : le temps t_s tombe entre les échéances k et k+1, à la
+        fraction r. r vaut 0 ou 1 au bord (une seule échéance utile).
+        """
+        return _locate(self.fhours, self.launch_fhour + t_s / 3600.0)
+
+    # ------------------------
+    # Profils
+    # ------------------------
+    def wind_points(
+        self,
+        lat_deg: float,
+        lon_deg: float,
+        method: str = "bilinear",
+        t_s: float = 0.0,
+    ) -> List[WindPoint]:
+        """
+        Profil (alt_m, u, v) au point et à l'instant demandés.
+
+        Si les deux échéances n'ont pas les mêmes niveaux, je prends
+        la plus proche dans le temps.
+        """
+        k, r = self.bracket(t_s)
+        if r == 0.0 or len(self) == 1:
+            return self.step_field(k).wind_points(lat_deg, lon_deg, method)
+        if r == 1.0:
+            return self.step_field(k + 1).wind_points(lat_deg, lon_deg, method)
+
+        fa = self.step_field(k)
+        fb = self.step_field(k + 1)
+        if not np.array_equal(fa.levels_hpa, fb.levels_hpa):
+            return (fa if r < 0.5 else fb).wind_points(lat_deg, lon_deg, method)
+
+        ua, va = fa.columns(lat_deg, lon_deg, method)
+        ub, vb = fb.columns(lat_deg, lon_deg, method)
+        za = fa.alt_columns(lat_deg, lon_deg, method)
+        zb = fb.alt_columns(lat_deg, lon_deg, method)
+        return fa._points_from_columns(
+            (1.0 - r) * ua[0] + r * ub[0],
+            (1.0 - r) * va[0] + r * vb[0],
+            (1.0 - r) * za[0] + r * zb[0],
         )
 
-    # Tri altitude croissante (logique moteur)
-    points.sort(key=lambda wp: wp.alt_m)
+    def wind_profile(
+        self,
+        lat_deg: float,
+        lon_deg: float,
+        method: str = "bilinear",
+        t_s: float = 0.0,
+    ) -> WindProfile:
+        return WindProfile(self.wind_points(lat_deg, lon_deg, method, t_s))
+
+    # ------------------------
+    # Champ 4D (WindField)
+    # ------------------------
+    def sampler(self) -> "TimeInterpolatedSampler":
+        return TimeInterpolatedSampler(self)
+
+    def value_at(
+        self,
+        lat_deg: float,
+        lon_deg: float,
+        alt_m: float,
+        t_s: float = 0.0,
+    ) -> Tuple[float, float]:
+        if self._shared_sampler is None:
+            self._shared_sampler = self.sampler()
+        return self._shared_sampler.value_at(lat_deg, lon_deg, alt_m, t_s)
+
+
+class TimeInterpolatedSampler(WindField):
+    """
+    Échantillonneur d'un TimeInterpolatedWindField : un GfsWindSampler
+    par échéance (créé au premier besoin), puis interpolation linéaire
+    entre les deux échéances qui encadrent t.
+    """
+
+    def __init__(self, field: TimeInterpolatedWindField):
+        self._field = field
+        self._samplers: Dict[int, GfsWindSampler] = {}
+
+    def _step(self, k: int) -> GfsWindSampler:
+        sampler = self._samplers.get(k)
+        if sampler is None:
+            sampler = self._field.step_field(k).sampler()
+            self._samplers[k] = sampler
+        return sampler
+
+    def value_at(
+        self,
+        lat_deg: float,
+        lon_deg: float,
+        alt_m: float,
+        t_s: float = 0.0,
+    ) -> Tuple[float, float]:
+        k, r = self._field.bracket(t_s)
+
+        if r == 0.0:
+            return self._step(k).value_at(lat_deg, lon_deg, alt_m)
+        if r == 1.0:
+            return self._step(k + 1).value_at(lat_deg, lon_deg, alt_m)
 
-    return points
+        ua, va = self._step(k).value_at(lat_deg, lon_deg, alt_m)
+        ub, vb = self._step(k + 1).value_at(lat_deg, lon_deg, alt_m)
+        return ua + r * (ub - ua), va + r * (vb - va)
@@ -0,0 +1,681 @@
+"""
+integrators.py
+
+Intégrateurs d'ordre élevé pour le moteur de vol.
+
+Ici je gère :
+- le découpage du vol en couches d'altitude (points des profils,
+  seuil des 18 000 m, burst / rupture, sol)
+- un RK4 à pas fixe
+- un RK45 adaptatif (Dormand–Prince) avec contrôle d'erreur sur la
+  position horizontale (tolérance en mètres)
+- un solveur analytique couche par couche (coût en O(nombre de couches))
+
+Dans une couche, les profils sont linéaires en altitude : la vitesse
+verticale vaut s(ζ) = s0 + k·ζ (ζ = distance parcourue dans la couche).
+La position verticale est donc intégrée exactement, et les pas se
+terminent pile sur les bords de couche : aucun pas ne chevauche une
+cassure de profil. Seule la dérive horizontale passe par Runge-Kutta.
+
+Le vent étant lui aussi linéaire en altitude, la dérive d'une couche a
+même une forme fermée : c'est le solveur "analytic", pour lequel dt_s ne
+règle plus que l'échantillonnage de la trajectoire enregistrée.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from App.profiles import AscentProfile, DescentProfile, WindProfile
+from App.simulation import (
+    EARTH_RADIUS_M,
+    PHASE_ASCENT,
+    PHASE_DESCENT,
+    FlightSummary,
+    Trajectory,
+    _record_stride,
+)
+
+INTEGRATORS = ("euler", "rk4", "rk45", "analytic")
+
+# Altitude au-dessus de laquelle la descente est accélérée (cf. simulate_flight)
+HIGH_ALT_M = 18_000.0
+HIGH_ALT_FACTOR = 1.3
+
+# Bornes du facteur de changement de pas du RK45
+_RK45_SAFETY = 0.9
+_RK45_MIN_FACTOR = 0.2
+_RK45_MAX_FACTOR = 5.0
+
+
+# ============================================================
+# COUCHES D'ALTITUDE
+# ============================================================
+
+@dataclass
+class _Layer:
+    """
+    Tranche d'altitude parcourue dans un seul sens, sans cassure de profil.
+
+    z0 → z1 dans l'ordre de parcours ; s0, s1 : vitesse verticale (module,
+    m/s) aux deux bords ; (u0, v0) → (u1, v1) : vent aux deux bords.
+    """
+    z0: float
+    z1: float
+    s0: float
+    s1: float
+    u0: float
+    v0: float
+    u1: float
+    v1: float
+    phase_code: int
+
+    @property
+    def length(self) -> float:
+        return abs(self.z1 - self.z0)
+
+
+def _breakpoints(lo: float, hi: float, *alt_lists) -> List[float]:
+    """
+    Altitudes strictement comprises entre lo et hi, triées et sans doublon.
+    """
+    pts = {lo, hi}
+    for alts in alt_lists:
+        pts.update(a for a in alts if lo < a < hi)
+    return sorted(pts)
+
+
+def _make_layers(
+    alts: List[float],
+    ascending: bool,
+    speed_at,
+    wind_profile: WindProfile,
+    phase_code: int,
+) -> List[_Layer]:
+    """
+    Construit les couches entre altitudes consécutives.
+
+    speed_at(z, z_mid) donne la vitesse verticale en z, la règle
+    applicable (ex. seuil des 18 000 m) étant choisie sur le milieu z_mid.
+    """
+    if not ascending:
+        alts = alts[::-1]
+
+    layers = []
+    for z0, z1 in zip(alts[:-1], alts[1:]):
+        z_mid = 0.5 * (z0 + z1)
+        s0 = speed_at(z0, z_mid)
+        s1 = speed_at(z1, z_mid)
+
+        if not (s0 > 0.0 and s1 > 0.0):
+            raise ValueError(
+                f"Vitesse verticale nulle ou négative vers {min(z0, z1):.0f}–"
+                f"{max(z0, z1):.0f} m : la couche ne peut pas être traversée."
+            )
+
+        u0, v0 = wind_profile.value(z0)
+        u1, v1 = wind_profile.value(z1)
+        layers.append(_Layer(z0, z1, s0, s1, u0, v0, u1, v1, phase_code))
+
+    return layers
+
+
+def descent_layers(
+    alt0_m: float,
+    descent_profile: DescentProfile,
+    wind_profile: WindProfile,
+    high_alt_boost: bool = False,
+    factor: float = 1.0,
+) -> List[_Layer]:
+    """
+    Couches d'une descente alt0_m → sol.
+
+    high_alt_boost : applique ×1.3 au-dessus de 18 000 m (vol complet)
+    factor         : multiplicateur global (chute libre)
+    """
+    if alt0_m <= 0.0:
+        return []
+
+    extra = [HIGH_ALT_M] if high_alt_boost else []
+    alts = _breakpoints(0.0, alt0_m, descent_profile.alts_m.tolist(),
+                        wind_profile.alts_m.tolist(), extra)
+
+    def speed_at(z: float, z_mid: float) -> float:
+        v = descent_profile.value(z)
+        if high_alt_boost and z_mid > HIGH_ALT_M:
+            v *= HIGH_ALT_FACTOR
+        return v * factor
+
+    return _make_layers(alts, False, speed_at, wind_profile, PHASE_DESCENT)
+
+
+def flight_layers(
+    alt_start_m: float,
+    alt_burst_m: float,
+    ascent_profile: AscentProfile,
+    descent_profile: DescentProfile,
+    wind_profile: WindProfile,
+    ff_start_alt: float | None,
+    free_fall_factor: float,
+) -> Tuple[List[_Layer], List[_Layer], float]:
+    """
+    Couches d'un vol complet : (montée, descente, altitude de bascule).
+
+    Version continue des règles de simulate_flight :
+    - la montée s'arrête au burst, ou à ff_start_alt si elle est atteinte avant
+    - si la rupture a lieu (ff_start_alt <= burst), toute la descente est
+      multipliée par free_fall_factor
+    - la descente est accélérée (×1.3) au-dessus de 18 000 m
+    """
+    rupture = ff_start_alt is not None and ff_start_alt <= alt_burst_m
+
+    top = alt_burst_m
+    if rupture:
+        top = min(alt_burst_m, max(alt_start_m, ff_start_alt))
+    top = max(top, alt_start_m)
+
+    ascent = []
+    if top > alt_start_m:
+        alts = _breakpoints(alt_start_m, top, ascent_profile.alts_m.tolist(),
+                            wind_profile.alts_m.tolist())
+        ascent = _make_layers(
+            alts, True,
+            lambda z, z_mid: ascent_profile.value(z),
+            wind_profile, PHASE_ASCENT,
+        )
+
+    descent = descent_layers(
+        top, descent_profile, wind_profile,
+        high_alt_boost=True,
+        factor=free_fall_factor if rupture else 1.0,
+    )
+    return ascent, descent, top
+
+
+# ============================================================
+# MOUVEMENT VERTICAL EXACT DANS UNE COUCHE
+# ============================================================
+
+def _expm1_rel(x: float) -> float:
+    """(e^x − 1) / x, prolongée par 1 en 0."""
+    if abs(x) < 1e-8:
+        return 1.0 + 0.5 * x
+    return math.expm1(x) / x
+
+
+def _log1p_rel(x: float) -> float:
+    """log(1 + x) / x, prolongée par 1 en 0."""
+    if abs(x) < 1e-8:
+        return 1.0 - 0.5 * x
+    return math.log1p(x) / x
+
+
+def layer_duration(layer: _Layer) -> float:
+    """
+    Temps exact de traversée : s linéaire en ζ ⇒ T = L·log(s1/s0)/(s1 − s0).
+    """
+    return layer.length / layer.s0 * _log1p_rel(layer.s1 / layer.s0 - 1.0)
+
+
+def layer_distance(layer: _Layer, tau: float) -> float:
+    """
+    Distance verticale ζ parcourue après tau secondes dans la couche :
+    dζ/dt = s0 + k·ζ ⇒ ζ = s0·(e^{kτ} − 1)/k.
+    """
+    k = (layer.s1 - layer.s0) / layer.length
+    return min(layer.s0 * tau * _expm1_rel(k * tau), layer.length)
+
+
+def _expm1_quad(x: float) -> float:
+    """(e^x − 1 − x) / x², prolongée par 1/2 en 0."""
+    if abs(x) < 1e-4:
+        return 0.5 + x / 6.0 + x * x / 24.0
+    return (math.expm1(x) - x) / (x * x)
+
+
+def layer_drift(layer: _Layer, tau: float) -> Tuple[float, float]:
+    """
+    Déplacement horizontal exact (m, vers l'est et vers le nord) après
+    tau secondes dans la couche.
+
+    Avec w(ζ) = w0 + a·ζ (a = Δw/L) et dζ/dt = s0 + k·ζ :
+        ∫ w dt = w0·τ + a·s0·τ²·(e^{kτ} − 1 − kτ)/(kτ)²
+    (k → 0 redonne le vent moyen × durée).
+    """
+    inv_len = 1.0 / layer.length
+    k = (layer.s1 - layer.s0) * inv_len
+    q = layer.s0 * tau * tau * _expm1_quad(k * tau) * inv_len
+    east = layer.u0 * tau + (layer.u1 - layer.u0) * q
+    north = layer.v0 * tau + (layer.v1 - layer.v0) * q
+    return east, north
+
+
+# ============================================================
+# RUNGE-KUTTA SUR LA DÉRIVE HORIZONTALE
+# ============================================================
+
+class _LayerField:
+    """
+    Second membre (dlat/dt, dlon/dt) le long d'une couche, en fonction
+    du temps local tau (altitude connue exactement).
+    """
+
+    __slots__ = ("layer", "du", "dv", "inv_len", "k", "s0")
+
+    def __init__(self, layer: _Layer):
+        self.layer = layer
+        self.du = layer.u1 - layer.u0
+        self.dv = layer.v1 - layer.v0
+        self.inv_len = 1.0 / layer.length
+        self.k = (layer.s1 - layer.s0) * self.inv_len
+        self.s0 = layer.s0
+
+    def wind(self, tau: float) -> Tuple[float, float]:
+        zeta = self.s0 * tau * _expm1_rel(self.k * tau)
+        r = min(zeta * self.inv_len, 1.0)
+        layer = self.layer
+        return layer.u0 + r * self.du, layer.v0 + r * self.dv
+
+    def rhs(self, tau: float, lat: float) -> Tuple[float, float]:
+        u, v = self.wind(tau)
+        return v / EARTH_RADIUS_M, u / (EARTH_RADIUS_M * math.cos(lat))
+
+
+def _rk4_step(field: _LayerField, tau: float, lat: float, lon: float,
+              h: float) -> Tuple[float, float]:
+    k1a, k1o = field.rhs(tau, lat)
+    k2a, k2o = field.rhs(tau + 0.5 * h, lat + 0.5 * h * k1a)
+    k3a, k3o = field.rhs(tau + 0.5 * h, lat + 0.5 * h * k2a)
+    k4a, k4o = field.rhs(tau + h, lat + h * k3a)
+
+    lat_n = lat + h / 6.0 * (k1a + 2.0 * k2a + 2.0 * k3a + k4a)
+    lon_n = lon + h / 6.0 * (k1o + 2.0 * k2o + 2.0 * k3o + k4o)
+    return lat_n, lon_n
+
+
+# Tableau de Butcher Dormand–Prince 5(4)
+_DP_C = (0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0, 1.0)
+_DP_A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+_DP_B5 = (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0.0)
+_DP_B4 = (5179 / 57600, 0.0, 7571 / 16695, 393 / 640, -92097 / 339200,
+          187 / 2100, 1 / 40)
+
+
+def _rk45_step(field: _LayerField, tau: float, lat: float, lon: float,
+               h: float) -> Tuple[float, float, float]:
+    """
+    Un pas Dormand–Prince : (lat, lon) d'ordre 5 + erreur estimée (m).
+    """
+    ka: List[float] = []
+    ko: List[float] = []
+    for c, a in zip(_DP_C, _DP_A):
+        lat_i = lat + h * sum(aj * kj for aj, kj in zip(a, ka))
+        fa, fo = field.rhs(tau + c * h, lat_i)
+        ka.append(fa)
+        ko.append(fo)
+
+    lat5 = lat + h * sum(b * k for b, k in zip(_DP_B5, ka))
+    lon5 = lon + h * sum(b * k for b, k in zip(_DP_B5, ko))
+    err_lat = h * sum((b5 - b4) * k for b5, b4, k in zip(_DP_B5, _DP_B4, ka))
+    err_lon = h * sum((b5 - b4) * k for b5, b4, k in zip(_DP_B5, _DP_B4, ko))
+
+    err_m = EARTH_RADIUS_M * math.hypot(err_lat, err_lon * math.cos(lat5))
+    return lat5, lon5, err_m
+
+
+# ============================================================
+# BOUCLE D'INTÉGRATION
+# ============================================================
+
+def _integrate_layers(
+    ascent: List[_Layer],
+    descent: List[_Layer],
+    alt_start_m: float,
+    lat0_deg: float,
+    lon0_deg: float,
+    dt_s: float,
+    integrator: str,
+    tol_m: float,
+    max_steps: int,
+    record: str,
+    record_every: int,
+    with_burst: bool,
+) -> Trajectory:
+    if integrator not in ("rk4", "rk45"):
+        raise ValueError(f"Intégrateur inconnu : {integrator}")
+    if dt_s <= 0.0:
+        raise ValueError("Le pas de temps doit être > 0")
+    if integrator == "rk45" and tol_m <= 0.0:
+        raise ValueError("La tolérance doit être > 0")
+
+    stride = _record_stride(record, record_every)
+    states = Trajectory(capacity=1024 if stride else 1)
+
+    t = 0.0
+    lat = math.radians(lat0_deg)
+    lon = math.radians(lon0_deg)
+
+    lat0 = lat
+    lon0 = lon
+    cos_lat0 = math.cos(lat0)
+    max_d2 = 0.0
+    burst: Optional[Tuple[float, float, float, float]] = None
+    if with_burst and not ascent:
+        burst = (0.0, alt_start_m, lat, lon)
+
+    layers = ascent + descent
+
+    # État initial
+    row: Optional[Tuple] = None
+    if layers:
+        first = layers[0]
+        sign = -1.0 if first.phase_code == PHASE_ASCENT else 1.0
+        row = (t, first.z0, lat0_deg, lon0_deg, sign * first.s0,
+               first.u0, first.v0, first.phase_code)
+        if stride:
+            states.append(*row)
+
+    recorded = True
+    step = 0
+    h = dt_s
+
+    for n_layer, layer in enumerate(layers):
+        field = _LayerField(layer)
+        duration = layer_duration(layer)
+        direction = 1.0 if layer.z1 > layer.z0 else -1.0
+        sign = -1.0 if layer.phase_code == PHASE_ASCENT else 1.0
+        tau = 0.0
+
+        while tau < duration and step < max_steps:
+            remaining = duration - tau
+            last = h >= remaining
+            h_try = remaining if last else h
+
+            if integrator == "rk4":
+                lat_n, lon_n = _rk4_step(field, tau, lat, lon, h_try)
+            else:
+                lat_n, lon_n, err_m = _rk45_step(field, tau, lat, lon, h_try)
+                factor = _RK45_MAX_FACTOR
+                if err_m > 0.0:
+                    factor = _RK45_SAFETY * (tol_m / err_m) ** 0.2
+                    factor = min(_RK45_MAX_FACTOR, max(_RK45_MIN_FACTOR, factor))
+
+                if err_m > tol_m:
+                    # Pas refusé : on recommence plus court
+                    h = h_try * factor
+                    continue
+
+                if not last:
+                    h = h_try * factor
+                else:
+                    # Pas tronqué au bord de couche : on ne réduit pas h
+                    h = max(h, h_try * factor)
+
+            step += 1
+            tau = duration if last else tau + h_try
+            t += h_try
+            lat, lon = lat_n, lon_n
+
+            dx = (lon - lon0) * cos_lat0
+            dy = lat - lat0
+            d2 = dx * dx + dy * dy
+            if d2 > max_d2:
+                max_d2 = d2
+
+            if last:
+                alt = layer.z1
+                s = layer.s1
+                u, v = layer.u1, layer.v1
+            else:
+                zeta = layer_distance(layer, tau)
+                alt = layer.z0 + direction * zeta
+                s = layer.s0 + field.k * zeta
+                u, v = field.wind(tau)
+
+            row = (t, alt, math.degrees(lat), math.degrees(lon),
+                   sign * s, u, v, layer.phase_code)
+            recorded = stride != 0 and step % stride == 0
+            if recorded:
+                states.append(*row)
+
+        if step >= max_steps:
+            break
+
+        if with_burst and burst is None and n_layer == len(ascent) - 1:
+            burst = (t, layer.z1, lat, lon)
+
+    return _finish(states, row, recorded, t, lat, lon, max_d2, burst)
+
+
+def _finish(
+    states: Trajectory,
+    row: Optional[Tuple],
+    recorded: bool,
+    t: float,
+    lat: float,
+    lon: float,
+    max_d2: float,
+    burst: Optional[Tuple[float, float, float, float]],
+) -> Trajectory:
+    """
+    Ajoute le dernier état s'il manque et attache le FlightSummary.
+    """
+    # Le dernier état (impact) est toujours conservé
+    if row is not None and not recorded:
+        states.append(*row)
+
+    summary = FlightSummary(
+        impact_lat_deg=math.degrees(lat),
+        impact_lon_deg=math.degrees(lon),
+        flight_time_s=t,
+        max_drift_m=EARTH_RADIUS_M * math.sqrt(max_d2),
+    )
+    if burst is not None:
+        summary.burst_t_s = burst[0]
+        summary.burst_alt_m = float(burst[1])
+        summary.burst_lat_deg = math.degrees(burst[2])
+        summary.burst_lon_deg = math.degrees(burst[3])
+
+    states.summary = summary
+    return states
+
+
+# ============================================================
+# SOLVEUR ANALYTIQUE COUCHE PAR COUCHE
+# ============================================================
+
+def _solve_layers(
+    ascent: List[_Layer],
+    descent: List[_Layer],
+    alt_start_m: float,
+    lat0_deg: float,
+    lon0_deg: float,
+    dt_s: float,
+    record: str,
+    record_every: int,
+    with_burst: bool,
+) -> Trajectory:
+    """
+    Intègre chaque couche en forme fermée (layer_duration / layer_drift).
+
+    La latitude varie très peu dans une couche : la longitude est
+    convertie avec la latitude du milieu du déplacement.
+
+    Enregistrement :
+    - "impact" : aucun échantillon intermédiaire, coût O(nombre de couches)
+    - sinon    : un état à chaque multiple de dt_s et à chaque bord de
+      couche (dt_s ne change pas le point d'impact)
+    La dérive max est suivie sur les états calculés.
+    """
+    stride = _record_stride(record, record_every)
+    if stride and dt_s <= 0.0:
+        raise ValueError("Le pas de temps doit être > 0")
+
+    states = Trajectory(capacity=1024 if stride else 1)
+
+    t = 0.0
+    lat = math.radians(lat0_deg)
+    lon = math.radians(lon0_deg)
+
+    lat0 = lat
+    lon0 = lon
+    cos_lat0 = math.cos(lat0)
+    max_d2 = 0.0
+    burst: Optional[Tuple[float, float, float, float]] = None
+    if with_burst and not ascent:
+        burst = (0.0, alt_start_m, lat, lon)
+
+    layers = ascent + descent
+
+    row: Optional[Tuple] = None
+    if layers:
+        first = layers[0]
+        sign = -1.0 if first.phase_code == PHASE_ASCENT else 1.0
+        row = (t, first.z0, lat0_deg, lon0_deg, sign * first.s0,
+               first.u0, first.v0, first.phase_code)
+        if stride:
+            states.append(*row)
+
+    recorded = True
+    n_row = 0
+
+    def moved(layer: _Layer, tau: float) -> Tuple[float, float]:
+        east, north = layer_drift(layer, tau)
+        dlat = north / EARTH_RADIUS_M
+        dlon = east / (EARTH_RADIUS_M * math.cos(lat + 0.5 * dlat))
+        return lat + dlat, lon + dlon
+
+    for n_layer, layer in enumerate(layers):
+        duration = layer_duration(layer)
+        direction = 1.0 if layer.z1 > layer.z0 else -1.0
+        sign = -1.0 if layer.phase_code == PHASE_ASCENT else 1.0
+
+        # Échantillons intermédiaires sur la grille t = m·dt_s
+        if stride:
+            k = (layer.s1 - layer.s0) / layer.length
+            m = math.floor(t / dt_s) + 1
+            while m * dt_s < t + duration:
+                tau = m * dt_s - t
+                zeta = layer_distance(layer, tau)
+                r = zeta / layer.length
+                lat_i, lon_i = moved(layer, tau)
+
+                dx = (lon_i - lon0) * cos_lat0
+                dy = lat_i - lat0
+                max_d2 = max(max_d2, dx * dx + dy * dy)
+
+                n_row += 1
+                row = (
+                    m * dt_s,
+                    layer.z0 + direction * zeta,
+                    math.degrees(lat_i),
+                    math.degrees(lon_i),
+                    sign * (layer.s0 + k * zeta),
+                    layer.u0 + r * (layer.u1 - layer.u0),
+                    layer.v0 + r * (layer.v1 - layer.v0),
+                    layer.phase_code,
+                )
+                recorded = n_row % stride == 0
+                if recorded:
+                    states.append(*row)
+                m += 1
+
+        # Bord de couche
+        lat, lon = moved(layer, duration)
+        t += duration
+
+        dx = (lon - lon0) * cos_lat0
+        dy = lat - lat0
+        max_d2 = max(max_d2, dx * dx + dy * dy)
+
+        n_row += 1
+        row = (t, layer.z1, math.degrees(lat), math.degrees(lon),
+               sign * layer.s1, layer.u1, layer.v1, layer.phase_code)
+        recorded = stride != 0 and n_row % stride == 0
+        if recorded:
+            states.append(*row)
+
+        if with_burst and burst is None and n_layer == len(ascent) - 1:
+            burst = (t, layer.z1, lat, lon)
+
+    return _finish(states, row, recorded, t, lat, lon, max_d2, burst)
+
+
+def integrate_descent(
+    alt0_m: float,
+    lat0_deg: float,
+    lon0_deg: float,
+    dt_s: float,
+    descent_profile: DescentProfile,
+    wind_profile: WindProfile,
+    integrator: str = "rk45",
+    tol_m: float = 1.0,
+    max_steps: int = 40000,
+    record: str = "full",
+    record_every: int = 10,
+) -> Trajectory:
+    """
+    Descente seule avec un intégrateur RK (voir simulate_descent).
+
+    rk4      : pas fixe dt_s (raccourci aux bords de couche)
+    rk45     : pas initial dt_s, puis adapté pour rester sous tol_m (m) par pas
+    analytic : forme fermée par couche, dt_s = pas d'échantillonnage
+    """
+    descent = descent_layers(alt0_m, descent_profile, wind_profile)
+    if integrator == "analytic":
+        return _solve_layers(
+            [], descent, alt0_m, lat0_deg, lon0_deg, dt_s,
+            record, record_every, with_burst=False,
+        )
+    return _integrate_layers(
+        [], descent, alt0_m, lat0_deg, lon0_deg, dt_s,
+        integrator, tol_m, max_steps, record, record_every,
+        with_burst=False,
+    )
+
+
+def integrate_flight(
+    alt_start_m: float,
+    alt_burst_m: float,
+    lat0_deg: float,
+    lon0_deg: float,
+    dt_s: float,
+    ascent_profile: AscentProfile,
+    descent_profile: DescentProfile,
+    wind_profile: WindProfile,
+    ff_start_alt: float | None,
+    free_fall_factor: float,
+    integrator: str = "rk45",
+    tol_m: float = 1.0,
+    max_steps: int = 40000,
+    record: str = "full",
+    record_every: int = 10,
+) -> Trajectory:
+    """
+    Vol complet avec un intégrateur RK (voir simulate_flight).
+    """
+    ascent, descent, _ = flight_layers(
+        alt_start_m, alt_burst_m,
+        ascent_profile, descent_profile, wind_profile,
+        ff_start_alt, free_fall_factor,
+    )
+    if integrator == "analytic":
+        return _solve_layers(
+            ascent, descent, alt_start_m, lat0_deg, lon0_deg, dt_s,
+            record, record_every, with_burst=True,
+        )
+    return _integrate_layers(
+        ascent, descent, alt_start_m, lat0_deg, lon0_deg, dt_s,
+        integrator, tol_m, max_steps, record, record_every,
+        with_burst=True,
+    )
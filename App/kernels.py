@@ -0,0 +1,463 @@
+"""
+kernels.py
+
+Boucles d'intégration compilées (Numba) pour le schéma Euler.
+
+Ici je gère :
+- l'import optionnel de Numba (NUMBA_AVAILABLE)
+- les noyaux descente / vol complet sur tableaux plats de points de profil
+- les enveloppes qui rendent une Trajectory comme simulate_descent /
+  simulate_flight, et les impacts d'un lot Monte Carlo
+
+Les noyaux reprennent ligne à ligne les boucles de simulation.py, dans le
+même ordre d'opérations et sans fastmath : pour un dt donné, la trajectoire
+est identique au bit près à celle du chemin Python.
+
+Sans Numba, les noyaux restent du Python pur (utile pour vérifier
+l'équivalence) ; simulation.py et montecarlo.py retombent alors sur leurs
+chemins habituels, plus rapides que ce code non compilé.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Tuple
+
+import numpy as np
+
+from App.profiles import AscentProfile, DescentProfile, WindProfile
+from App.simulation import (
+    EARTH_RADIUS_M,
+    FlightSummary,
+    Trajectory,
+    _record_stride,
+)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # Numba est optionnel
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Remplaçant sans effet de numba.njit."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# Lignes du tableau de sortie des noyaux : colonnes de Trajectory + phase
+_N_OUT = len(Trajectory.COLUMNS) + 1
+
+
+# ============================================================
+# Interpolation (équivalent de *Profile.value)
+# ============================================================
+
+@njit(cache=True)
+def _interp(xp, fp, x):
+    """
+    Interpolation linéaire avec saturation, comme DescentProfile.value.
+    """
+    n = xp.shape[0]
+
+    if x <= xp[0]:
+        return fp[0]
+
+    if x >= xp[n - 1] or x != x:
+        return fp[n - 1]
+
+    # bisect_left(xp, x) - 1 : xp[i] < x <= xp[i + 1]
+    lo = 0
+    hi = n
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if xp[mid] < x:
+            lo = mid + 1
+        else:
+            hi = mid
+    i = lo - 1
+
+    ratio = (x - xp[i]) / (xp[i + 1] - xp[i])
+    return fp[i] + ratio * (fp[i + 1] - fp[i])
+
+
+@njit(cache=True)
+def _write_row(out, n, t, alt, lat_deg, lon_deg, v, u, w, phase):
+    out[0, n] = t
+    out[1, n] = alt
+    out[2, n] = lat_deg
+    out[3, n] = lon_deg
+    out[4, n] = v
+    out[5, n] = u
+    out[6, n] = w
+    out[7, n] = phase
+
+
+# ============================================================
+# Noyaux
+# ============================================================
+
+@njit(cache=True)
+def descent_kernel(
+    alt0_m, lat0_deg, lon0_deg, dt_s,
+    desc_alts, desc_v, wind_alts, wind_u, wind_v,
+    max_steps, stride, out,
+):
+    """
+    Boucle de simulate_descent. Écrit les états dans out (8 × capacité).
+
+    Retourne (n_états, t, lat_rad, lon_rad, dérive²_max).
+    """
+    t = 0.0
+    alt = alt0_m
+    lat = math.radians(lat0_deg)
+    lon = math.radians(lon0_deg)
+
+    lat0 = lat
+    lon0 = lon
+    cos_lat0 = math.cos(lat0)
+    max_d2 = 0.0
+
+    n = 0
+    have_row = False
+    recorded = False
+    r_t = r_alt = r_lat = r_lon = r_v = r_u = r_w = 0.0
+
+    for step in range(max_steps):
+
+        if alt <= 0.0:
+            break
+
+        v_desc = _interp(desc_alts, desc_v, alt)
+
+        if alt - v_desc * dt_s < 0:
+            dt = alt / (1e-6 if 1e-6 > v_desc else v_desc)
+        else:
+            dt = dt_s
+
+        alt_mid = alt - 0.5 * v_desc * dt
+        w_u = _interp(wind_alts, wind_u, alt_mid)
+        w_v = _interp(wind_alts, wind_v, alt_mid)
+
+        alt -= v_desc * dt
+        lat += (w_v * dt) / EARTH_RADIUS_M
+        lon += (w_u * dt) / (EARTH_RADIUS_M * math.cos(lat))
+
+        dx = (lon - lon0) * cos_lat0
+        dy = lat - lat0
+        d2 = dx * dx + dy * dy
+        if d2 > max_d2:
+            max_d2 = d2
+
+        # max(alt, 0.0) de la version Python
+        r_t = t
+        r_alt = 0.0 if 0.0 > alt else alt
+        r_lat = math.degrees(lat)
+        r_lon = math.degrees(lon)
+        r_v = v_desc
+        r_u = w_u
+        r_w = w_v
+        have_row = True
+
+        recorded = stride != 0 and step % stride == 0
+        if recorded:
+            _write_row(out, n, r_t, r_alt, r_lat, r_lon, r_v, r_u, r_w, 1.0)
+            n += 1
+
+        t += dt
+
+    if have_row and not recorded:
+        _write_row(out, n, r_t, r_alt, r_lat, r_lon, r_v, r_u, r_w, 1.0)
+        n += 1
+
+    return n, t, lat, lon, max_d2
+
+
+@njit(cache=True)
+def flight_kernel(
+    alt_start_m, alt_burst_m, lat0_deg, lon0_deg, dt_s,
+    asc_alts, asc_v, desc_alts, desc_v, wind_alts, wind_u, wind_v,
+    has_ff, ff_start_alt, free_fall_factor,
+    max_steps, stride, out,
+):
+    """
+    Boucle de simulate_flight. Écrit les états dans out (8 × capacité).
+
+    Retourne (n_états, t, lat_rad, lon_rad, dérive²_max,
+              burst_trouvé, burst_t, burst_alt, burst_lat_rad, burst_lon_rad).
+    """
+    t = 0.0
+    alt = alt_start_m
+    lat = math.radians(lat0_deg)
+    lon = math.radians(lon0_deg)
+
+    ascent = True
+    rupture = False
+
+    lat0 = lat
+    lon0 = lon
+    cos_lat0 = math.cos(lat0)
+    max_d2 = 0.0
+
+    has_burst = False
+    b_t = b_alt = b_lat = b_lon = 0.0
+
+    n = 0
+    have_row = False
+    recorded = False
+    r_t = r_alt = r_lat = r_lon = r_v = r_u = r_w = r_phase = 0.0
+
+    for step in range(max_steps):
+
+        # Détection rupture ballon
+        if has_ff and not rupture:
+            if alt >= ff_start_alt:
+                rupture = True
+                if ascent:
+                    has_burst = True
+                    b_t, b_alt, b_lat, b_lon = t, alt, lat, lon
+                ascent = False
+
+        # Vitesse verticale
+        if ascent:
+            v_vert = _interp(asc_alts, asc_v, alt)
+
+            if alt + v_vert * dt_s >= alt_burst_m:
+                dt = (alt_burst_m - alt) / (1e-6 if 1e-6 > v_vert else v_vert)
+                alt_next = alt_burst_m
+                ascent = False
+            else:
+                dt = dt_s
+                alt_next = alt + v_vert * dt
+
+            alt_mid = alt + 0.5 * v_vert * dt
+
+        else:
+            v_vert = _interp(desc_alts, desc_v, alt)
+
+            if alt > 18_000:
+                v_vert *= 1.3
+
+            if rupture:
+                v_vert *= free_fall_factor
+
+            if alt - v_vert * dt_s <= 0:
+                dt = alt / (1e-6 if 1e-6 > v_vert else v_vert)
+                alt_next = 0.0
+            else:
+                dt = dt_s
+                alt_next = alt - v_vert * dt
+
+            alt_mid = alt - 0.5 * v_vert * dt
+
+        # Vent (milieu de couche)
+        w_u = _interp(wind_alts, wind_u, alt_mid)
+        w_v = _interp(wind_alts, wind_v, alt_mid)
+
+        lat += (w_v * dt) / EARTH_RADIUS_M
+        lon += (w_u * dt) / (EARTH_RADIUS_M * math.cos(lat))
+
+        dx = (lon - lon0) * cos_lat0
+        dy = lat - lat0
+        d2 = dx * dx + dy * dy
+        if d2 > max_d2:
+            max_d2 = d2
+
+        # Sauvegarde état
+        r_t = t
+        r_alt = alt
+        r_lat = math.degrees(lat)
+        r_lon = math.degrees(lon)
+        r_u = w_u
+        r_w = w_v
+        if ascent:
+            r_v = -v_vert
+            r_phase = 0.0
+        else:
+            r_v = v_vert
+            r_phase = 1.0
+            if not has_burst:
+                has_burst = True
+                b_t, b_alt, b_lat, b_lon = t + dt, alt_next, lat, lon
+        have_row = True
+
+        recorded = stride != 0 and step % stride == 0
+        if recorded:
+            _write_row(out, n, r_t, r_alt, r_lat, r_lon, r_v, r_u, r_w, r_phase)
+            n += 1
+
+        t += dt
+        alt = alt_next
+
+        if not ascent and alt <= 0.0:
+            break
+
+    if have_row and not recorded:
+        _write_row(out, n, r_t, r_alt, r_lat, r_lon, r_v, r_u, r_w, r_phase)
+        n += 1
+
+    return n, t, lat, lon, max_d2, has_burst, b_t, b_alt, b_lat, b_lon
+
+
+# ============================================================
+# Enveloppes : profils → tableaux plats → Trajectory
+# ============================================================
+
+def _flat(arr) -> np.ndarray:
+    return np.ascontiguousarray(arr, dtype=np.float64)
+
+
+def _out_buffer(max_steps: int, stride: int) -> np.ndarray:
+    capacity = 1 if stride == 0 else (max_steps + stride - 1) // stride + 1
+    return np.empty((_N_OUT, capacity))
+
+
+def _to_trajectory(out: np.ndarray, n: int) -> Trajectory:
+    columns = {name: out[k, :n] for k, name in enumerate(Trajectory.COLUMNS)}
+    return Trajectory.from_columns(columns, out[_N_OUT - 1, :n].astype(np.int8))
+
+
+def simulate_descent_compiled(
+    alt0_m: float,
+    lat0_deg: float,
+    lon0_deg: float,
+    dt_s: float,
+    descent_profile: DescentProfile,
+    wind_profile: WindProfile,
+    max_steps: int = 40000,
+    record: str = "full",
+    record_every: int = 10,
+) -> Trajectory:
+    """
+    simulate_descent (Euler) via descent_kernel.
+    """
+    stride = _record_stride(record, record_every)
+    out = _out_buffer(max_steps, stride)
+
+    n, t, lat, lon, max_d2 = descent_kernel(
+        float(alt0_m), float(lat0_deg), float(lon0_deg), float(dt_s),
+        _flat(descent_profile.alts_m), _flat(descent_profile.speeds_ms),
+        _flat(wind_profile.alts_m), _flat(wind_profile.u_ms), _flat(wind_profile.v_ms),
+        int(max_steps), stride, out,
+    )
+
+    states = _to_trajectory(out, n)
+    states.summary = FlightSummary(
+        impact_lat_deg=math.degrees(lat),
+        impact_lon_deg=math.degrees(lon),
+        flight_time_s=t,
+        max_drift_m=EARTH_RADIUS_M * math.sqrt(max_d2),
+    )
+    return states
+
+
+def simulate_flight_compiled(
+    alt_start_m: float,
+    alt_burst_m: float,
+    lat0_deg: float,
+    lon0_deg: float,
+    dt_s: float,
+    ascent_profile: AscentProfile,
+    descent_profile: DescentProfile,
+    wind_profile: WindProfile,
+    ff_start_alt: float | None,
+    free_fall_factor: float,
+    max_steps: int = 40000,
+    record: str = "full",
+    record_every: int = 10,
+) -> Trajectory:
+    """
+    simulate_flight (Euler) via flight_kernel.
+    """
+    stride = _record_stride(record, record_every)
+    out = _out_buffer(max_steps, stride)
+
+    (n, t, lat, lon, max_d2,
+     has_burst, b_t, b_alt, b_lat, b_lon) = flight_kernel(
+        float(alt_start_m), float(alt_burst_m),
+        float(lat0_deg), float(lon0_deg), float(dt_s),
+        _flat(ascent_profile.alts_m), _flat(ascent_profile.speeds_ms),
+        _flat(descent_profile.alts_m), _flat(descent_profile.speeds_ms),
+        _flat(wind_profile.alts_m), _flat(wind_profile.u_ms), _flat(wind_profile.v_ms),
+        ff_start_alt is not None,
+        float(ff_start_alt) if ff_start_alt is not None else 0.0,
+        float(free_fall_factor),
+        int(max_steps), stride, out,
+    )
+
+    states = _to_trajectory(out, n)
+    summary = FlightSummary(
+        impact_lat_deg=math.degrees(lat),
+        impact_lon_deg=math.degrees(lon),
+        flight_time_s=t,
+        max_drift_m=EARTH_RADIUS_M * math.sqrt(max_d2),
+    )
+    if has_burst:
+        summary.burst_t_s = b_t
+        summary.burst_alt_m = b_alt
+        summary.burst_lat_deg = math.degrees(b_lat)
+        summary.burst_lon_deg = math.degrees(b_lon)
+
+    states.summary = summary
+    return states
+
+
+# ============================================================
+# Monte Carlo : impacts d'un lot de runs perturbés
+# ============================================================
+
+@njit(cache=True)
+def _landings_kernel(
+    alt_burst_m, lat0_deg, lon0_deg, dt_s,
+    asc_alts, asc_v, desc_alts, desc_table, wind_alts, u_table, v_table,
+    max_steps, lats_deg, lons_deg,
+):
+    out = np.empty((_N_OUT, 1))
+    n_ok = 0
+    for k in range(desc_table.shape[0]):
+        res = flight_kernel(
+            0.0, alt_burst_m, lat0_deg, lon0_deg, dt_s,
+            asc_alts, asc_v, desc_alts, desc_table[k],
+            wind_alts, u_table[k], v_table[k],
+            False, 0.0, 1.0,
+            max_steps, 0, out,
+        )
+        if res[0] == 0:
+            continue
+        lats_deg[n_ok] = math.degrees(res[2])
+        lons_deg[n_ok] = math.degrees(res[3])
+        n_ok += 1
+    return n_ok
+
+
+def landings_compiled(
+    alt_burst_m: float,
+    lat0_deg: float,
+    lon0_deg: float,
+    dt_s: float,
+    ascent_profile: AscentProfile,
+    desc_alts: np.ndarray,
+    desc_table: np.ndarray,
+    wind_alts: np.ndarray,
+    u_table: np.ndarray,
+    v_table: np.ndarray,
+    max_steps: int = 40000,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Impacts (lat_deg, lon_deg) de runs perturbés, un vol complet par ligne
+    des tables — mêmes valeurs que le chemin "loop" de run_monte_carlo.
+    """
+    n_runs = desc_table.shape[0]
+    lats = np.empty(n_runs)
+    lons = np.empty(n_runs)
+
+    n_ok = _landings_kernel(
+        float(alt_burst_m), float(lat0_deg), float(lon0_deg), float(dt_s),
+        _flat(ascent_profile.alts_m), _flat(ascent_profile.speeds_ms),
+        _flat(desc_alts), _flat(desc_table),
+        _flat(wind_alts), _flat(u_table), _flat(v_table),
+        int(max_steps), lats, lons,
+    )
+    return lats[:n_ok], lons[:n_ok]
+
@@ -1,30 +1,17 @@
 # main_window.py
 from __future__ import annotations
 import os
-import csv
-import math
-from App import simulation
-from App.simulation import simulate_descent, simulate_flight, State
+from App.simulation import simulate_descent, simulate_flight, Trajectory
 from App.profiles import AscentProfile, AscentPoint
-from App import gfs_utils
-import requests
 from PyQt5.QtWidgets import QApplication
-from App import gfs_download
 import datetime
 from App.map_widget import MAP_STYLES
 from App.themes import THEMES
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtWidgets import QSlider
 
-from mpl_toolkits.mplot3d import Axes3D  # noqa: F401 # nécessaire pour le 3D
-from PyQt5.QtWidgets import QSizePolicy
-
 from typing import List, Optional
-from App.montecarlo import ImpactSample, EllipseResult, run_monte_carlo
-from matplotlib.backends.backend_qt5agg import (
-    FigureCanvasQTAgg as FigureCanvas,
-    NavigationToolbar2QT as NavigationToolbar,
-)
+from App.montecarlo import ImpactSample, EllipseResult, BATCH_SIZE
 from PyQt5.QtGui import QIcon
 from PyQt5.QtCore import Qt
 
@@ -41,6 +28,7 @@ from PyQt5.QtWidgets import (
     QMessageBox,
     QTableWidget,
     QTableWidgetItem,
+    QTableView,
     QGroupBox,
     QTabWidget,
     QDialog,
@@ -49,718 +37,50 @@ from PyQt5.QtWidgets import (
     QLineEdit,
     QComboBox,
     QAction,
-    QSizePolicy,  
     QCheckBox,
+    QProgressBar,
 
 )
 
-from matplotlib.figure import Figure
-
-from App.profiles import DescentProfile, WindProfile, DescentPoint, WindPoint
-from App.simulation import simulate_descent, State
+from App.profiles import (
+    DescentProfile,
+    WindProfile,
+    DescentPoint,
+    WindPoint,
+    ascent_with_mass,
+    descent_with_mass,
+    read_ascent_csv,
+    read_descent_csv,
+    read_wind_csv,
+)
+from App.simulation import simulate_descent
 from App.map_widget import MapWidget
+from App.results_model import TrajectoryTableModel
+from App.workers import MonteCarloWorker, SimulationWorker, start_worker
 
 from App.version import __version__
 
-import matplotlib as mpl
 
+# Intégrateurs proposés (libellé, clé passée à simulate_*)
+INTEGRATOR_CHOICES = [
+    ("Euler (pas fixe)", "euler"),
+    ("RK4 (pas fixe)", "rk4"),
+    ("RK45 adaptatif", "rk45"),
+    ("Analytique (par couche)", "analytic"),
+]
 
+# Méthodes Monte Carlo proposées (libellé, clé passée à run_monte_carlo)
+MC_METHOD_CHOICES = [
+    ("Lots NumPy (Euler)", "batch"),
+    ("Noyau compilé Numba (Euler)", "compiled"),
+    ("Analytique (par couche)", "analytic"),
+]
 
 
 def app_icon(name: str) -> QIcon:
     path = os.path.join("resources", "icons", f"{name}.png")
     return QIcon(path)
 
-# Chutte 3D
-class ThreeDCanvas(FigureCanvas):
-    """
-    Trajectoire 3D : Est-Ouest (km), Nord-Sud (km), Altitude (m).
-    """
-    def __init__(self, parent: Optional[QWidget] = None):
-        fig = Figure(figsize=(7, 6))
-        super().__init__(fig)
-        self.setParent(parent)
-        
-        
-        self.ax3d = fig.add_subplot(111, projection="3d")
-                # Utiliser presque tout l'espace du canvas
-        fig.subplots_adjust(
-            left=0.02,
-            right=0.98,
-            top=0.97,
-            bottom=0.05,
-        )
-        fig.patch.set_facecolor("#717171")
-        self.ax3d.set_facecolor("#717171")
-
-        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.updateGeometry()
-
-        # Données stockées pour l'anim
-        self._xs_km: List[float] = []
-        self._ys_km: List[float] = []
-        self._alts: List[float] = []
-        self._marker = None
-        self._line = None
-        self._last_states: List[State] = []
-
-        # Élévation fixe (angle vertical) pour la vue 3D
-        self._fixed_elev = 25  # tu peux changer à 20 / 30 si tu préfères
-
-        # Bloquer la rotation en pitch/roll : on force l'elev à rester fixe
-        self.mpl_connect("motion_notify_event", self._on_3d_mouse_move)
-
-    def plot_trajectory_3d(self, states: List[State]):
-        self.ax3d.clear()
-        self._xs_km = []
-        self._ys_km = []
-        self._alts = []
-        self._marker = None
-        self._line = None
-        self._last_states = list(states) 
-
-        if not states:
-            self.ax3d.set_title("Aucune simulation disponible")
-            self.draw()
-            return
-
-        # Récupère les lat/lon/alt
-        lats = [s.lat_deg for s in states]
-        lons = [s.lon_deg for s in states]
-        alts = [s.alt_m for s in states]
-
-        # Référence locale = premier point
-        lat0_deg = lats[0]
-        lon0_deg = lons[0]
-        lat0_rad = math.radians(lat0_deg)
-
-        # ---------- Séparation des phases ----------
-        ascent = [s for s in states if s.phase == "ASCENT"]
-        descent = [s for s in states if s.phase == "DESCENT"]
-
-        def to_xyz(sub):
-            xs, ys, zs = [], [], []
-            for s in sub:
-                dlat = math.radians(s.lat_deg - lat0_deg)
-                dlon = math.radians(s.lon_deg - lon0_deg)
-                xs.append(simulation.EARTH_RADIUS_M * dlon * math.cos(lat0_rad) / 1000.0)
-                ys.append(simulation.EARTH_RADIUS_M * dlat / 1000.0)
-                zs.append(s.alt_m)
-            return xs, ys, zs
-
-        # ---------- Tracé montée ----------
-        if ascent:
-            xa, ya, za = to_xyz(ascent)
-            self.ax3d.plot(
-                xa, ya, za,
-                color="cyan",
-                linewidth=1.6,
-                label="Montée",
-            )
-
-        # ---------- Tracé descente ----------
-        if descent:
-            xd, yd, zd = to_xyz(descent)
-            self.ax3d.plot(
-                xd, yd, zd,
-                color="orange",
-                linewidth=1.6,
-                label="Descente",
-            )
-
-
-        xs_km: List[float] = []
-        ys_km: List[float] = []
-
-        for lat_deg, lon_deg in zip(lats, lons):
-            dlat = math.radians(lat_deg - lat0_deg)
-            dlon = math.radians(lon_deg - lon0_deg)
-
-            x_m = simulation.EARTH_RADIUS_M * dlon * math.cos(lat0_rad)   # Est +
-            y_m = simulation.EARTH_RADIUS_M * dlat                        # Nord +
-
-            xs_km.append(x_m / 1000.0)
-            ys_km.append(y_m / 1000.0)
-
-        self._xs_km = xs_km
-        self._ys_km = ys_km
-        self._alts = alts
-
-        # Limites Z
-        zmax = max(alts)
-        zmin = min(alts)
-        if zmax == zmin:
-            zmax = zmin + 10.0
-        self.ax3d.set_zlim(zmin, zmax)
-
-        # ----- Croix au sol + N / S / E / O -----
-        r = max(
-            max(abs(x) for x in xs_km + [0.0]),
-            max(abs(y) for y in ys_km + [0.0]),
-            0.1,
-        )
-        r *= 1.1
-        base_z = zmin
-
-        self.ax3d.plot([0, r], [0, 0], [base_z, base_z], linestyle="--", linewidth=1.0)
-        self.ax3d.plot([0, -r], [0, 0], [base_z, base_z], linestyle="--", linewidth=1.0)
-        self.ax3d.plot([0, 0], [0, r], [base_z, base_z], linestyle="--", linewidth=1.0)
-        self.ax3d.plot([0, 0], [0, -r], [base_z, base_z], linestyle="--", linewidth=1.0)
-
-        self.ax3d.text(r, 0, base_z, "E", fontsize=9)
-        self.ax3d.text(-r, 0, base_z, "O", fontsize=9)
-        self.ax3d.text(0, r, base_z, "N", fontsize=9)
-        self.ax3d.text(0, -r, base_z, "S", fontsize=9)
-
-        self.ax3d.set_xlabel("Est-Ouest (km)")
-        self.ax3d.set_ylabel("Nord-Sud (km)")
-        self.ax3d.set_zlabel("Altitude (m)")
-        self.ax3d.set_title("Trajectoire 3D de la chute")
-
-        # 👉 aspect un peu plus "écran large" pour que ça soit lisible
-        try:
-            self.ax3d.set_box_aspect((1.5, 1.5, 0.8))
-        except Exception:
-            # vieux Matplotlib : ignore si pas supporté
-            pass
-
-        self.ax3d.view_init(elev=self._fixed_elev, azim=135)
-
-        # Marqueur initial (au début de la chute)
-        self.update_marker(0) 
-        
-        self.draw()
-
-      
-
-    def reset_view(self):
-        """Recalcule complètement la vue 3D à partir de la dernière simulation."""
-        if not self._last_states:
-            return
-        self.plot_trajectory_3d(self._last_states)
-    
-
-    def update_marker(self, idx: int):
-        """Déplace le marqueur 3D sur l'échantillon idx."""
-        if not self._xs_km or not self._ys_km or not self._alts:
-            return
-        if idx < 0 or idx >= len(self._xs_km):
-            return
-
-        # Supprime l'ancien marqueur si besoin
-        if self._marker is not None:
-            self._marker.remove()
-            self._marker = None
-
-        x = self._xs_km[idx]
-        y = self._ys_km[idx]
-        z = self._alts[idx]
-
-        self._marker = self.ax3d.scatter([x], [y], [z], s=40)
-
-        self.draw_idle()
-
-
-
-    def _on_3d_mouse_move(self, event):
-        # On ne s'occupe que de notre axe 3D
-        if event.inaxes is not self.ax3d:
-            return
-
-        # On ne réagit que quand le bouton gauche est enfoncé (rotation)
-        if not hasattr(event, "button"):
-            return
-        # Matplotlib : 1 = bouton gauche
-        if event.button != 1:
-            return
-
-        # On laisse Matplotlib mettre à jour l'azim, mais on réimpose l'elev fixe
-        current_azim = self.ax3d.azim
-        self.ax3d.view_init(elev=self._fixed_elev, azim=current_azim)
-        self.draw_idle()
-
-
-# ---------- Canvas trajectoire 2D ----------
-
-
-class TrajectoryCanvas(FigureCanvas):
-    def __init__(self, parent: Optional[QWidget] = None):
-        self.figure = Figure(figsize=(7, 7))
-        super().__init__(self.figure)
-        self.setParent(parent)
-
-       
-        self.info_label = None
-
-        self.mpl_connect("motion_notify_event", self._on_mouse_move)
-        self.current_states: list[State] | None = None
-
-        
-        self.states: List[State] = []
-        self.cursor_lines = {}
-        self.cursor_points = {}
-
-        # 4 sous-graphiques : 2 x 2
-        self.ax_alt = self.figure.add_subplot(2, 2, 1)
-        self.ax_dist = self.figure.add_subplot(2, 2, 2)
-        self.ax_map = self.figure.add_subplot(2, 2, 3)
-        self.ax_polar = self.figure.add_subplot(2, 2, 4, projection="polar")
-
-
-        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.updateGeometry()
-        
-
-        # 🎨 thème sombre
-        self.figure.patch.set_facecolor("#2b2b2b")
-        for ax in (self.ax_alt, self.ax_dist, self.ax_map, self.ax_polar):
-            ax.set_facecolor("#2b2b2b")
-            ax.tick_params(colors="white")
-            for spine in ax.spines.values():
-                spine.set_color("white")
-
-        import matplotlib.ticker as mticker
-        # Empêche matplotlib d'afficher (x,y) automatiques
-        for ax in (self.ax_alt, self.ax_dist, self.ax_map, self.ax_polar):
-            ax.format_coord = lambda x, y: ""
-
-        for ax in (self.ax_alt, self.ax_dist, self.ax_map):
-            ax.ticklabel_format(style="plain", useOffset=False)
-        self.ax_alt.xaxis.set_major_formatter(mticker.FormatStrFormatter("%.1f"))
-        self.ax_alt.yaxis.set_major_formatter(mticker.FormatStrFormatter("%.0f"))
-        self.ax_dist.xaxis.set_major_formatter(mticker.FormatStrFormatter("%.1f"))
-        self.ax_dist.yaxis.set_major_formatter(mticker.FormatStrFormatter("%.0f"))
-        self.ax_map.xaxis.set_major_formatter(mticker.FormatStrFormatter("%.5f"))
-        self.ax_map.yaxis.set_major_formatter(mticker.FormatStrFormatter("%.5f"))
-        
-        self.ax_polar.yaxis.set_major_formatter(mticker.FormatStrFormatter("%.1f"))    
-
-        self.draw_idle()   
-
-    # =========================================================
-    # Utilitaires
-    # =========================================================
-
-    def _split_phases(self, states: List[State]):
-        ascent = [s for s in states if s.phase == "ASCENT"]
-        descent = [s for s in states if s.phase == "DESCENT"]
-        return ascent, descent
-
-    def _compute_local_xy_km(self, states: List[State]):
-        lat0_rad = math.radians(states[0].lat_deg)
-        lat_ref = states[0].lat_deg
-        lon_ref = states[0].lon_deg
-
-        xs, ys = [], []
-
-        for s in states:
-            dlat = math.radians(s.lat_deg - lat_ref)
-            dlon = math.radians(s.lon_deg - lon_ref)
-
-            x = simulation.EARTH_RADIUS_M * dlon * math.cos(lat0_rad)
-            y = simulation.EARTH_RADIUS_M * dlat
-
-            xs.append(x / 1000.0)
-            ys.append(y / 1000.0)
-
-        return xs, ys
-
-    # =========================================================
-    # Tracé principal
-    # =========================================================
-    def _on_mouse_move(self, event):
-        if event.inaxes is None:
-            return
-
-        if not self.current_states or not hasattr(self, "_cursor_data"):
-            return
-
-        if event.xdata is None:
-            return
-
-        # temps cible (min → s)
-        t_target_s = event.xdata * 60.0
-
-        # index temporel le plus proche
-        times = self._cursor_data["t"]
-        idx = min(range(len(times)), key=lambda i: abs(times[i] - t_target_s))
-
-        # valeurs
-        t_min = times[idx] / 60.0
-        alt = self._cursor_data["alt"][idx]
-        lon = self._cursor_data["lon"][idx]
-        lat = self._cursor_data["lat"][idx]
-        dist = self._cursor_data["dist"][idx]
-        theta = self._cursor_data["theta"][idx]
-
-        # ----- ligne verticale (temps) -----
-        self.cursor_lines["time"].set_xdata([t_min, t_min])
-
-        # ----- point distance -----
-        self.cursor_points["dist"].set_data(
-            [dist],
-            [alt],
-        )
-
-        # ----- point carte -----
-        self.cursor_points["map"].set_data(
-            [lon],
-            [lat],
-        )
-
-        # ----- point polaire -----
-        self.cursor_points["polar"].set_data(
-            [theta],
-            [dist],
-        )
-
-        # ----- message -----
-        if self.info_label:
-            self.info_label.setText(
-                f"T = {t_min:6.1f} min   |   "
-                f"ALT = {alt:7.0f} m   |   "
-                f"DIST = {dist:6.1f} km   |   "
-                f"LAT = {lat:.5f}   |   "
-                f"LON = {lon:.5f}   |   "
-                f"AZ = {math.degrees(theta)%360:5.1f}°"
-            )
-
-
-        self.draw_idle()
-
-
-
-    #-----------------------------------------------------------------------
-    def plot_trajectory(self, states: List[State]):
-
-        self.current_states = states
-
-        for ax in (self.ax_alt, self.ax_dist, self.ax_map, self.ax_polar):
-            ax.clear()
-            ax.set_facecolor("#2b2b2b")
-            ax.tick_params(colors="white")
-            for spine in ax.spines.values():
-                spine.set_color("white")
-
-        if not states:
-            self.draw_idle()
-            return
-
-        ascent, descent = self._split_phases(states)
-        xs, ys = self._compute_local_xy_km(states)
-
-        dist = [math.hypot(x, y) for x, y in zip(xs, ys)]
-        theta = [math.atan2(x, y) for x, y in zip(xs, ys)]
-
-        n_ascent = len(ascent)
-
-        # ---------- 1) Altitude vs temps ----------
-        if ascent:
-            t = [s.t_s / 60.0 for s in ascent]
-            alt = [s.alt_m for s in ascent]
-            self.ax_alt.plot(t, alt, color="cyan", label="Montée")
-
-        if descent:
-            t = [s.t_s / 60.0 for s in descent]
-            alt = [s.alt_m for s in descent]
-            self.ax_alt.plot(t, alt, color="orange", label="Descente")
-
-        self.ax_alt.set_title("Altitude vs Temps", color="white")
-        self.ax_alt.set_xlabel("Temps (min)", color="white")
-        self.ax_alt.set_ylabel("Altitude (m)", color="white")
-        self.ax_alt.grid(True, alpha=0.3)
-        self.ax_alt.legend()
-
-        # ---------- 2) Altitude vs distance ----------
-        if ascent:
-            self.ax_dist.plot(
-                dist[:n_ascent],
-                [s.alt_m for s in ascent],
-                color="cyan",
-                label="Montée",
-            )
-
-        if descent:
-            self.ax_dist.plot(
-                dist[n_ascent:],
-                [s.alt_m for s in descent],
-                color="orange",
-                label="Descente",
-            )
-
-        self.ax_dist.set_title("Altitude vs Distance sol", color="white")
-        self.ax_dist.set_xlabel("Distance horizontale (km)", color="white")
-        self.ax_dist.set_ylabel("Altitude (m)", color="white")
-        self.ax_dist.grid(True, alpha=0.3)
-        self.ax_dist.legend()
-
-        # ---------- 3) Trajectoire au sol ----------
-        if ascent:
-            self.ax_map.plot(
-                [s.lon_deg for s in ascent],
-                [s.lat_deg for s in ascent],
-                color="cyan",
-                label="Montée",
-            )
-
-        if descent:
-            self.ax_map.plot(
-                [s.lon_deg for s in descent],
-                [s.lat_deg for s in descent],
-                color="orange",
-                label="Descente",
-            )
-
-        self.ax_map.set_title("Trajectoire au sol", color="white")
-        self.ax_map.set_xlabel("Longitude (°)", color="white")
-        self.ax_map.set_ylabel("Latitude (°)", color="white")
-        self.ax_map.grid(True, alpha=0.3)
-        self.ax_map.legend()
-
-        # ---------- 4) Vue polaire ----------
-        if ascent:
-            self.ax_polar.plot(
-                theta[:n_ascent],
-                dist[:n_ascent],
-                color="cyan",
-                label="Montée",
-            )
-
-        if descent:
-            self.ax_polar.plot(
-                theta[n_ascent:],
-                dist[n_ascent:],
-                color="orange",
-                label="Descente",
-            )
-
-        self.ax_polar.set_theta_zero_location("N")
-        self.ax_polar.set_theta_direction(-1)
-        self.ax_polar.set_thetagrids([0, 90, 180, 270], labels=["N", "E", "S", "W"])
-        self.ax_polar.set_title("Vue polaire", color="white")
-        self.ax_polar.grid(True, alpha=0.3)
-        self.ax_polar.legend(loc="upper right")
-
-        # ----- curseurs -----
-        self.cursor_lines["time"] = self.ax_alt.axvline(
-            x=0, color="white", linestyle="--", alpha=0.7
-        )
-
-        self.cursor_points["dist"] = self.ax_dist.plot(
-            [], [], "o", color="white"
-        )[0]
-
-        self.cursor_points["map"] = self.ax_map.plot(
-            [], [], "o", color="white"
-        )[0]
-
-        self.cursor_points["polar"] = self.ax_polar.plot(
-            [], [], "o", color="white"
-        )[0]
-
-        self._cursor_data = {
-            "t": [s.t_s for s in states],
-            "alt": [s.alt_m for s in states],
-            "lat": [s.lat_deg for s in states],
-            "lon": [s.lon_deg for s in states],
-            "xs": xs,
-            "ys": ys,
-            "dist": dist,
-            "theta": theta,
-        }
-
-        # ---------- zoom auto ----------
-        for ax in (self.ax_alt, self.ax_dist, self.ax_map):
-            ax.relim()
-            ax.autoscale(enable=True)
-
-        self.figure.tight_layout()
-        self.draw_idle()
-
-class MonteCarloCanvas(FigureCanvas):
-    def __init__(self, parent: Optional[QWidget] = None):
-        fig = Figure(figsize=(8, 5))
-        super().__init__(fig)
-        self.setParent(parent)
-
-        # Deux graphes l'un sous l'autre : zone d'impact en haut, histo en bas
-        self.ax_xy = fig.add_subplot(2, 1, 1)
-        self.ax_dist = fig.add_subplot(2, 1, 2)
-        fig.patch.set_facecolor("#71717171")
-        for ax in (self.ax_xy, self.ax_dist):
-            ax.set_facecolor("#71717171")
-
-        fig.subplots_adjust(
-            left=0.07,
-            right=0.98,
-            top=0.95,
-            bottom=0.08,
-            hspace=0.35,
-        )
-
-        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.updateGeometry()
-
-        # --- stockage pour tooltips ---
-        self._samples: List[ImpactSample] = []
-        self._xs_km: List[float] = []
-        self._ys_km: List[float] = []
-        self._rs_km: List[float] = []
-        self._sc = None          # scatter
-        self._annot = None       # annotation (créée dans plot_impacts)
-
-        # Connexion événement souris
-        self.mpl_connect("motion_notify_event", self._on_hover)
-
-    def plot_impacts(self, samples: List[ImpactSample], ellipse: Optional[EllipseResult]):
-        # Clear
-        self.ax_xy.clear()
-        self.ax_dist.clear()
-
-        # Réinitialise les structures
-        self._samples = []
-        self._xs_km = []
-        self._ys_km = []
-        self._rs_km = []
-        self._sc = None
-        self._annot = None
-
-        if not samples:
-            self.ax_xy.set_title("Aucun impact Monte Carlo (pas de données)")
-            self.ax_xy.grid(True)
-            self.ax_dist.set_title("Distribution distance (vide)")
-            self.ax_dist.grid(True)
-            self.draw()
-            return
-
-        # Stocke les samples pour les tooltips
-        self._samples = samples
-        xs_km = [s.x_m / 1000.0 for s in samples]
-        ys_km = [s.y_m / 1000.0 for s in samples]
-        rs_km = [(s.x_m**2 + s.y_m**2) ** 0.5 / 1000.0 for s in samples]
-        self._xs_km = xs_km
-        self._ys_km = ys_km
-        self._rs_km = rs_km
-
-        # Annotation (bulle) APRÈS le clear
-        self._annot = self.ax_xy.annotate(
-            "",
-            xy=(0, 0),
-            xytext=(10, 10),
-            textcoords="offset points",
-            bbox=dict(boxstyle="round", fc="w", alpha=0.8),
-            arrowprops=dict(arrowstyle="->"),
-        )
-        self._annot.set_visible(False)
-
-        # ---------- 1) Nuage XY + ellipse ----------
-        self._sc = self.ax_xy.scatter(
-            xs_km,
-            ys_km,
-            s=20,          # un peu plus gros, plus facile à viser
-            alpha=0.6,
-            label="Impacts",
-            picker=True,   # important pour contains()
-        )
-        self.ax_xy.scatter([0.0], [0.0], marker="+", s=60, label="Largage")
-
-        # Centre pour cadrer le zoom
-        if ellipse is not None and ellipse.a_m > 0.0 and ellipse.b_m > 0.0:
-            cx_km = ellipse.cx_m / 1000.0
-            cy_km = ellipse.cy_m / 1000.0
-        else:
-            cx_km = sum(xs_km) / len(xs_km)
-            cy_km = sum(ys_km) / len(ys_km)
-
-        # Ellipse si dispo
-        if ellipse is not None and ellipse.a_m > 0.0 and ellipse.b_m > 0.0:
-            a_km = ellipse.a_m / 1000.0
-            b_km = ellipse.b_m / 1000.0
-            ts = [i * 2.0 * math.pi / 200 for i in range(201)]
-            ex = []
-            ey = []
-            cos_a = math.cos(ellipse.angle_rad)
-            sin_a = math.sin(ellipse.angle_rad)
-            for t in ts:
-                xr = a_km * math.cos(t)
-                yr = b_km * math.sin(t)
-                x = cx_km + xr * cos_a - yr * sin_a
-                y = cy_km + xr * sin_a + yr * cos_a
-                ex.append(x)
-                ey.append(y)
-
-            self.ax_xy.plot(ex, ey, linewidth=1.5, label="Ellipse ~zone")
-            self.ax_xy.scatter([cx_km], [cy_km], marker="x", s=50, label="Centre ellipse")
-            
-
-        # Zoom autour du centre
-        max_dx = max(abs(x - cx_km) for x in xs_km + [cx_km])
-        max_dy = max(abs(y - cy_km) for y in ys_km + [cy_km])
-        r = max(max_dx, max_dy, 0.2) * 1.2
-
-        self.ax_xy.set_xlim(cx_km - r, cx_km + r)
-        self.ax_xy.set_ylim(cy_km - r, cy_km + r)
-
-        # repère croix sur le largage (0,0)
-        self.ax_xy.axhline(0.0, linewidth=0.7)
-        self.ax_xy.axvline(0.0, linewidth=0.7)
-
-        self.ax_xy.set_xlabel("Est-Ouest (km)  [Est + / Ouest -]")
-        self.ax_xy.set_ylabel("Nord-Sud (km)  [Nord + / Sud -]")
-        self.ax_xy.set_title("Monte Carlo - zone d'impact (sol)")
-        self.ax_xy.grid(True)
-        self.ax_xy.legend()
-
-        # ---------- 2) Histogramme des distances ----------
-        self.ax_dist.hist(rs_km, bins=20, alpha=0.7)
-        self.ax_dist.set_xlabel("Distance au largage (km)")
-        self.ax_dist.set_ylabel("Nombre d'impacts")
-        self.ax_dist.set_title("Distribution des distances")
-
-        if rs_km:
-            mean_r = sum(rs_km) / len(rs_km)
-            self.ax_dist.axvline(mean_r, linestyle="--", label=f"moy ~ {mean_r:.1f} km")
-            self.ax_dist.legend()
-
-        self.ax_dist.grid(True)
-
-        self.figure.tight_layout()
-        self.draw()
-
-    def _on_hover(self, event):
-        # Pas de données ou pas d'annotation
-        if self._sc is None or self._annot is None or not self._samples:
-            return
-
-        # On ne gère que l'axe du haut
-        if event.inaxes is not self.ax_xy:
-            if self._annot.get_visible():
-                self._annot.set_visible(False)
-                self.draw_idle()
-            return
-
-        contains, info = self._sc.contains(event)
-        if not contains:
-            if self._annot.get_visible():
-                self._annot.set_visible(False)
-                self.draw_idle()
-            return
-
-        idx = info["ind"][0]
-        s = self._samples[idx]
-        x = self._xs_km[idx]
-        y = self._ys_km[idx]
-        r = self._rs_km[idx]
-
-        self._annot.xy = (x, y)
-        self._annot.set_text(
-            f"Lat  {s.lat_deg:.4f}°\n"
-            f"Lon  {s.lon_deg:.4f}°\n"
-            f"Dist {r:.1f} km"
-        )
-        self._annot.set_visible(True)
-        self.draw_idle()
-
 
 class GfsDownloadDialog(QDialog):
     """
@@ -800,12 +120,32 @@ class GfsDownloadDialog(QDialog):
         self.cycle_combo.setCurrentIndex(idx)
         layout.addRow("Cycle :", self.cycle_combo)
 
-        # Heure de prévision
+        # Ou : demander à NOMADS le dernier run qui couvre le vol
+        self.btn_latest = QPushButton("Dernier run publié")
+        self.btn_latest.setToolTip(
+            "Interroge NOMADS (requêtes HEAD) et choisit le run le plus récent\n"
+            "dont toutes les échéances du vol sont déjà publiées."
+        )
+        self.btn_latest.clicked.connect(self._on_detect_latest_cycle)
+        layout.addRow("", self.btn_latest)
+
+        # Heure de prévision au lancement + durée du vol → fenêtre d'échéances
         self.fhour_spin = QSpinBox()
         self.fhour_spin.setRange(0, 240)
         self.fhour_spin.setSingleStep(3)
         self.fhour_spin.setValue(3)
-        layout.addRow("Heure de prévision (fXXX) :", self.fhour_spin)
+        layout.addRow("Heure de prévision au lancement (fXXX) :", self.fhour_spin)
+
+        self.duration_spin = QDoubleSpinBox()
+        self.duration_spin.setRange(0.0, 48.0)
+        self.duration_spin.setDecimals(1)
+        self.duration_spin.setSingleStep(0.5)
+        self.duration_spin.setValue(3.0)
+        self.duration_spin.setToolTip(
+            "Toutes les échéances GFS (pas de 3 h) entre le lancement et\n"
+            "l'atterrissage estimé sont téléchargées, puis interpolées dans le temps."
+        )
+        layout.addRow("Durée du vol (h) :", self.duration_spin)
 
         # Domaine autour du point de lancement
         self.lat_span = QDoubleSpinBox()
@@ -828,7 +168,12 @@ class GfsDownloadDialog(QDialog):
         self.levels_edit.setPlaceholderText("Vide = tous les niveaux (recommandé)")
         layout.addRow("Niveaux (hPa) :", self.levels_edit)
 
-        self.vars_edit = QLineEdit("UGRD VGRD TMP")
+        # HGT : altitude réelle des niveaux (sinon atmosphère standard)
+        self.vars_edit = QLineEdit("UGRD VGRD TMP HGT")
+        self.vars_edit.setToolTip(
+            "UGRD/VGRD : vent (obligatoires).\n"
+            "HGT : hauteur géopotentielle, pour placer les niveaux à leur altitude réelle."
+        )
         layout.addRow("Variables :", self.vars_edit)
 
         buttons = QDialogButtonBox(
@@ -838,6 +183,29 @@ class GfsDownloadDialog(QDialog):
         buttons.rejected.connect(self.reject)
         layout.addWidget(buttons)
 
+    def _on_detect_latest_cycle(self):
+        from App import gfs_download, gfs_utils  # chargés au premier usage
+
+        fhours = gfs_utils.forecast_window(self.fhour_spin.value(), self.duration_spin.value())
+
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            found = gfs_download.latest_cycle(fhours)
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        if found is None:
+            QMessageBox.warning(
+                self,
+                "GFS",
+                "Aucun run récent ne contient toutes les échéances demandées.",
+            )
+            return
+
+        date_str, cycle = found
+        self.date_edit.setText(date_str)
+        self.cycle_combo.setCurrentIndex(self.cycle_combo.findData(cycle))
+
     def get_config(self):
         date_str = self.date_edit.text().strip()
         cycle = self.cycle_combo.currentData()
@@ -861,7 +229,7 @@ class GfsDownloadDialog(QDialog):
                 vars_.append(tok.strip())
 
         if not vars_:
-            vars_ = ["UGRD", "VGRD"]
+            vars_ = ["UGRD", "VGRD", "HGT"]
 
         lat_span = self.lat_span.value()
         lon_span = self.lon_span.value()
@@ -870,6 +238,7 @@ class GfsDownloadDialog(QDialog):
             "date": date_str,
             "cycle": int(cycle),
             "fhour": int(fhour),
+            "duration_h": float(self.duration_spin.value()),
             "levels": levels,
             "vars": vars_,
             "lat_span": float(lat_span),
@@ -884,7 +253,8 @@ class MonteCarloDialog(QDialog):
         layout = QFormLayout(self)
 
         self.sb_runs = QSpinBox()
-        self.sb_runs.setRange(1, 200)
+        self.sb_runs.setRange(1, 100_000)
+        self.sb_runs.setSingleStep(50)
         self.sb_runs.setValue(50)
         layout.addRow("Nombre de runs :", self.sb_runs)
 
@@ -910,6 +280,33 @@ class MonteCarloDialog(QDialog):
 
         layout.addRow("σ vent (m/s) :", self.sb_sigma_wind)
 
+        self.cb_method = QComboBox()
+        for label, key in MC_METHOD_CHOICES:
+            self.cb_method.addItem(label, key)
+        self.cb_method.setToolTip(
+            "Lots NumPy : schéma Euler au pas de temps choisi.\n"
+            "Noyau compilé : mêmes impacts, boucle compilée par Numba si installé.\n"
+            "Analytique : chaque vol résolu couche par couche, sans erreur de pas."
+        )
+        layout.addRow("Méthode :", self.cb_method)
+
+        # Parallélisme : lots de runs répartis sur plusieurs processus
+        self.sb_workers = QSpinBox()
+        self.sb_workers.setRange(1, os.cpu_count() or 1)
+        self.sb_workers.setValue(os.cpu_count() or 1)
+        self.sb_workers.setToolTip("Nombre de processus utilisés pour les lots de runs.")
+        layout.addRow("Processus :", self.sb_workers)
+
+        self.sb_chunk = QSpinBox()
+        self.sb_chunk.setRange(100, 50_000)
+        self.sb_chunk.setSingleStep(500)
+        self.sb_chunk.setValue(BATCH_SIZE)
+        self.sb_chunk.setToolTip(
+            "Nombre de runs intégrés ensemble.\n"
+            "À seed égal, le résultat dépend de cette taille mais pas du nombre de processus."
+        )
+        layout.addRow("Taille de lot :", self.sb_chunk)
+
         buttons = QDialogButtonBox(
             QDialogButtonBox.Ok | QDialogButtonBox.Cancel
         )
@@ -923,6 +320,9 @@ class MonteCarloDialog(QDialog):
             "sigma_desc_rel": self.sb_sigma_desc.value(),
             "sigma_wind_ms": self.sb_sigma_wind.value(),
             "k_sigma": self.sb_k_sigma.value(),
+            "n_workers": self.sb_workers.value(),
+            "chunk_size": self.sb_chunk.value(),
+            "method": self.cb_method.currentData(),
         }
 
 # ---------- Fenêtre principale ----------
@@ -932,7 +332,15 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.setWindowTitle(f"Prévision de ballon sonde - v{__version__}")
 
-        self.current_states: List[State] = []
+        self.current_states = Trajectory()
+
+        # Dernier champ de vent GFS chargé (cube en mémoire), ou None
+        self.gfs_field = None
+
+        # Calcul de fond en cours (un seul à la fois) + threads pas encore
+        # terminés, gardés en vie jusqu'à leur arrêt effectif
+        self._job_worker = None
+        self._running_jobs = []
 
         self._build_ui()
         self._build_menu()
@@ -1072,6 +480,51 @@ class MainWindow(QMainWindow):
         row_dt.addWidget(self.sb_dt)
         params_layout.addLayout(row_dt)
 
+        # Intégrateur
+        row_integ = QHBoxLayout()
+        row_integ.addWidget(QLabel("Intégrateur :"))
+        self.cb_integrator = QComboBox()
+        for label, key in INTEGRATOR_CHOICES:
+            self.cb_integrator.addItem(label, key)
+        self.cb_integrator.setToolTip(
+            "Euler : schéma historique à pas fixe.\n"
+            "RK4 : Runge-Kutta d'ordre 4, même pas de temps.\n"
+            "RK45 : pas adaptatif, précis même avec peu de points.\n"
+            "Analytique : résolution exacte par couche, le pas ne sert qu'à l'affichage."
+        )
+        row_integ.addWidget(self.cb_integrator)
+        params_layout.addLayout(row_integ)
+
+        row_tol = QHBoxLayout()
+        row_tol.addWidget(QLabel("Tolérance RK45 (m) :"))
+        self.sb_tol = QDoubleSpinBox()
+        self.sb_tol.setRange(0.01, 1000.0)
+        self.sb_tol.setDecimals(2)
+        self.sb_tol.setValue(1.0)
+        self.sb_tol.setToolTip("Erreur de position horizontale tolérée par pas (RK45).")
+        row_tol.addWidget(self.sb_tol)
+        params_layout.addLayout(row_tol)
+
+        self.cb_compiled = QCheckBox("Noyau compilé (Numba)")
+        self.cb_compiled.setToolTip(
+            "Boucle Euler compilée par Numba : même trajectoire, plus rapide.\n"
+            "Sans Numba installé, la boucle Python est utilisée."
+        )
+        params_layout.addWidget(self.cb_compiled)
+
+        self.cb_wind_4d = QCheckBox("Vent 4D (GFS)")
+        self.cb_wind_4d.setToolTip(
+            "Lit le vent GFS à la position de la sonde à chaque pas\n"
+            "(lat/lon/altitude, et temps si plusieurs échéances sont téléchargées)\n"
+            "au lieu du seul profil vertical du point de départ.\n"
+            "Disponible après chargement d'un GRIB GFS, intégrateur Euler."
+        )
+        self.cb_wind_4d.setEnabled(False)
+        params_layout.addWidget(self.cb_wind_4d)
+
+        self.sb_tol.setEnabled(False)
+        self.cb_integrator.currentIndexChanged.connect(self._on_integrator_changed)
+
         gb_params.setLayout(params_layout)
 
         btn_simulate = QPushButton("Lancer la simulation")
@@ -1085,39 +538,40 @@ class MainWindow(QMainWindow):
         control_layout.addWidget(gb_params)
         control_layout.addWidget(btn_simulate)
         control_layout.addWidget(btn_mc) 
+
+        # Calcul en cours (thread de fond) : progression + annulation
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        self.btn_cancel = QPushButton("Annuler le calcul")
+        self.btn_cancel.setVisible(False)
+        self.btn_cancel.clicked.connect(self.on_cancel_job)
+        control_layout.addWidget(self.progress_bar)
+        control_layout.addWidget(self.btn_cancel)
+
+        self.btn_simulate = btn_simulate
+        self.btn_mc = btn_mc
+
         control_layout.addStretch()
 
         # ---- Onglets à droite ----
         self.tabs = QTabWidget()
 
-        # Tableau résultat
-        self.table_results = QTableWidget()
-        self.table_results.setColumnCount(7)
-        self.table_results.setHorizontalHeaderLabels(
-            [
-                "Temps écoulé (s)",
-                "Phase",
-                "Alt (m)",
-                "Lat (°)",
-                "Lon (°)",
-                "Vitesse (m/s)",
-                "u (m/s)",
-                "v (m/s)",
-            ]
-        )
-        header_item = self.table_results.horizontalHeaderItem(0)
-        if header_item is not None:
-            header_item.setToolTip("Temps depuis le début de la descente.")
+        # Tableau résultat : vue sur un modèle branché sur la trajectoire
+        # (cellules formatées à la demande, seules les lignes visibles coûtent)
+        self.results_model = TrajectoryTableModel(self)
+        self.table_results = QTableView()
+        self.table_results.setModel(self.results_model)
         self.tabs.addTab(self.table_results, "Résultats")
 
         # ---- Onglet Trajectoire 2D ----
-        from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT
+        # Les graphes Matplotlib sont créés à la première ouverture de leur
+        # onglet (_ensure_*_canvas) : Matplotlib n'est pas importé au démarrage.
+        self.canvas = None
+        self.canvas3d = None
+        self.mc_canvas = None
 
         self.tab_traj2d = QWidget()
-        traj_layout = QVBoxLayout(self.tab_traj2d)
-
-        self.canvas = TrajectoryCanvas(self.tab_traj2d)
-        self.traj_toolbar = NavigationToolbar2QT(self.canvas, self)
+        self.traj_layout = QVBoxLayout(self.tab_traj2d)
 
         self.lbl_traj_info = QLabel("Déplace la souris sur les graphes")
         self.lbl_traj_info.setAlignment(Qt.AlignCenter)
@@ -1132,20 +586,14 @@ class MainWindow(QMainWindow):
             }
         """)
 
-        traj_layout.addWidget(self.traj_toolbar)
-        traj_layout.addWidget(self.canvas)
-        traj_layout.addWidget(self.lbl_traj_info)
+        self.traj_layout.addWidget(self.lbl_traj_info)
 
-        self.canvas.toolbar = self.traj_toolbar
         self.tabs.addTab(self.tab_traj2d, "Trajectoire 2D")
-        self.canvas.info_label = self.lbl_traj_info
 
 
         # Trajectoire 3D + contrôles animation
-        self.canvas3d = ThreeDCanvas()
         self.tab_3d = QWidget()
-        tab3d_layout = QVBoxLayout(self.tab_3d)
-        tab3d_layout.addWidget(self.canvas3d)
+        self.tab3d_layout = QVBoxLayout(self.tab_3d)
 
         controls_layout = QHBoxLayout()
         self.btn_anim_play = QPushButton("")
@@ -1169,7 +617,7 @@ class MainWindow(QMainWindow):
         controls_layout.addWidget(self.lbl_anim_time)
 
 
-        tab3d_layout.addLayout(controls_layout)
+        self.tab3d_layout.addLayout(controls_layout)
 
         self.tabs.addTab(self.tab_3d, "Trajectoire 3D")
         
@@ -1214,14 +662,21 @@ class MainWindow(QMainWindow):
 
         
         # Onglet Monte Carlo avec toolbar de zoom/pan
-        self.mc_canvas = MonteCarloCanvas()
         self.mc_tab = QWidget()                          # ⬅️ on crée bien l'attribut ici
-        mc_layout = QVBoxLayout(self.mc_tab)
-        mc_toolbar = NavigationToolbar(self.mc_canvas, self)
-        mc_layout.addWidget(mc_toolbar)
-        mc_layout.addWidget(self.mc_canvas)
+        self.mc_layout = QVBoxLayout(self.mc_tab)
         self.tabs.addTab(self.mc_tab, "Monte Carlo")
 
+        # Vues de la trajectoire : chaque onglet n'est redessiné que s'il est
+        # marqué « sale » (nouvelle simulation) et qu'il devient visible
+        self._trajectory_views = {
+            self.table_results: self._render_results_view,
+            self.tab_traj2d: self._render_traj2d_view,
+            self.tab_3d: self._render_3d_view,
+            self.tab_map: self._render_map_view,
+        }
+        self._dirty_tabs = set()
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+
 
         main_layout.addLayout(control_layout, 0)
         main_layout.addWidget(self.tabs, 1)
@@ -1320,9 +775,89 @@ class MainWindow(QMainWindow):
         tile = MAP_STYLES.get(style_name, "CartoDB dark_matter")
         self.map_widget.set_map_style(tile)
             
+    # ---------- Vues rendues à la demande ----------
+
+    def _invalidate_trajectory_views(self):
+        """
+        Nouvelle trajectoire : toutes les vues sont à refaire. Chacune sera
+        redessinée quand son onglet deviendra visible (_render_tab).
+        """
+        self._dirty_tabs = set(self._trajectory_views)
+
+    def _on_tab_changed(self, index: int):
+        self._render_tab(self.tabs.widget(index))
+
+    def _render_tab(self, widget):
+        if widget is self.mc_tab:
+            self._ensure_mc_canvas()
+            return
+
+        if widget not in self._dirty_tabs:
+            if widget is self.tab_traj2d:
+                self._ensure_traj_canvas()
+            elif widget is self.tab_3d:
+                self._ensure_3d_canvas()
+            return
+
+        self._dirty_tabs.discard(widget)
+        self._trajectory_views[widget]()
+
+    def _render_results_view(self):
+        self.results_model.set_trajectory(self.current_states)
+
+    def _render_traj2d_view(self):
+        self._ensure_traj_canvas().plot_trajectory(self.current_states)
+
+    def _render_3d_view(self):
+        canvas = self._ensure_3d_canvas()
+        canvas.plot_trajectory_3d(self.current_states)
+        if self.slider_anim.value() > 0:
+            canvas.update_marker(self.slider_anim.value())
+
+    def _render_map_view(self):
+        self.map_widget.show_trajectory(self.current_states)
+
+    def _ensure_traj_canvas(self):
+        """
+        Graphes 2D, créés à la première ouverture de l'onglet.
+        """
+        if self.canvas is None:
+            from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT
+            from App.canvases import TrajectoryCanvas
+
+            self.canvas = TrajectoryCanvas(self.tab_traj2d)
+            self.traj_toolbar = NavigationToolbar2QT(self.canvas, self)
+            self.traj_layout.insertWidget(0, self.traj_toolbar)
+            self.traj_layout.insertWidget(1, self.canvas)
+
+            self.canvas.toolbar = self.traj_toolbar
+            self.canvas.info_label = self.lbl_traj_info
+        return self.canvas
+
+    def _ensure_3d_canvas(self):
+        """
+        Vue 3D (toolkit mplot3d), créée à la première ouverture de l'onglet.
+        """
+        if self.canvas3d is None:
+            from App.canvases import ThreeDCanvas
+
+            self.canvas3d = ThreeDCanvas()
+            self.tab3d_layout.insertWidget(0, self.canvas3d)
+        return self.canvas3d
+
+    def _ensure_mc_canvas(self):
+        if self.mc_canvas is None:
+            from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT
+            from App.canvases import MonteCarloCanvas
+
+            self.mc_canvas = MonteCarloCanvas()
+            self.mc_layout.addWidget(NavigationToolbar2QT(self.mc_canvas, self))
+            self.mc_layout.addWidget(self.mc_canvas)
+        return self.mc_canvas
+
     def _on_reset_3d_view(self):
         # recadre la vue 3D sur toute la trajectoire
-        self.canvas3d.reset_view()
+        self._ensure_3d_canvas().reset_view()
 
     def start_3d_animation(self):
         if not self.current_states:
@@ -1373,8 +908,10 @@ class MainWindow(QMainWindow):
         if idx < 0 or idx >= len(self.current_states):
             return
 
-        self.canvas3d.update_marker(idx)
-        t = self.current_states[idx].t_s
+        # Vue 3D pas encore redessinée : le marqueur suivra au rendu
+        if self.canvas3d is not None and self.tab_3d not in self._dirty_tabs:
+            self.canvas3d.update_marker(idx)
+        t = float(self.current_states.t_s[idx])
         self.lbl_anim_time.setText(f"t = {t:.1f} s")
        
 
@@ -1416,8 +953,9 @@ class MainWindow(QMainWindow):
 
         params = dlg.get_params()
 
-        try:
-            impacts, ellipse = run_monte_carlo(
+        worker = MonteCarloWorker(
+            k_sigma=params["k_sigma"],
+            kwargs=dict(
                 n_runs=params["n_runs"],
                 alt0_m=alt0,
                 lat0_deg=lat0,
@@ -1428,24 +966,103 @@ class MainWindow(QMainWindow):
                 base_wind=wind_profile,
                 sigma_desc_rel=params["sigma_desc_rel"],
                 sigma_wind_ms=params["sigma_wind_ms"],
-                k_sigma=params["k_sigma"],
-            )
-        except Exception as e:
-            QMessageBox.critical(self, "Erreur Monte Carlo", str(e))
-            return
+                n_workers=params["n_workers"],
+                chunk_size=params["chunk_size"],
+                method=params["method"],
+            ),
+        )
+        worker.progress.connect(self._on_job_progress)
+        worker.batch_ready.connect(self._ensure_mc_canvas().add_impacts)
+        worker.finished.connect(self._on_monte_carlo_finished)
+        worker.failed.connect(self._on_monte_carlo_failed)
+
+        # Origine du repère local des impacts (ellipse sur la carte)
+        self._mc_origin = (lat0, lon0)
+
+        # Le nuage se remplit au fil des lots
+        self.mc_canvas.begin_impacts()
+        self.tabs.setCurrentWidget(self.mc_tab)
+
+        self._start_job(worker, maximum=params["n_runs"])
+
+    def _on_monte_carlo_failed(self, msg: str):
+        QMessageBox.critical(self, "Erreur Monte Carlo", msg)
+
+    def _on_monte_carlo_finished(self, impacts: List[ImpactSample], ellipse: Optional[EllipseResult]):
+        lat0, lon0 = self._mc_origin
+        self.map_widget.show_impacts(impacts, ellipse, lat0, lon0)
 
         if not impacts:
-            QMessageBox.information(
-                self,
-                "Monte Carlo",
-                "Aucun impact n'a été calculé.\n"
-                "Vérifie profil vent / descente / chute libre.",
-            )
+            self.mc_canvas.plot_impacts([], None)
+            if not self._job_worker.is_cancelled:
+                QMessageBox.information(
+                    self,
+                    "Monte Carlo",
+                    "Aucun impact n'a été calculé.\n"
+                    "Vérifie profil vent / descente / chute libre.",
+                )
             return
 
         self.mc_canvas.plot_impacts(impacts, ellipse)
         self.tabs.setCurrentWidget(self.mc_tab)
 
+    # ---------- Calculs en tâche de fond ----------
+
+    def _start_job(self, worker, maximum: int = 0):
+        """
+        Démarre un worker dans son thread et passe l'UI en mode « calcul ».
+
+        maximum = 0 → barre de progression indéterminée.
+        """
+        self._job_worker = worker
+        worker.done.connect(self._on_job_done)
+
+        self.btn_simulate.setEnabled(False)
+        self.btn_mc.setEnabled(False)
+
+        self.progress_bar.setRange(0, maximum)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.btn_cancel.setEnabled(True)
+        self.btn_cancel.setVisible(True)
+
+        thread = start_worker(worker, self)
+        thread.finished.connect(self._on_job_thread_finished)
+        self._running_jobs.append((worker, thread))
+
+    def _on_job_progress(self, done: int, total: int):
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+
+    def on_cancel_job(self):
+        if self._job_worker is None:
+            return
+        self._job_worker.cancel()
+        self.btn_cancel.setEnabled(False)
+
+    def _on_job_done(self):
+        self._job_worker = None
+
+        self.btn_simulate.setEnabled(True)
+        self.btn_mc.setEnabled(True)
+        self.progress_bar.setVisible(False)
+        self.btn_cancel.setVisible(False)
+
+    def _on_job_thread_finished(self):
+        for job in list(self._running_jobs):
+            _, thread = job
+            if thread.isFinished():
+                self._running_jobs.remove(job)
+                thread.deleteLater()
+
+    def closeEvent(self, event):
+        # On n'abandonne pas un thread Qt en cours d'exécution
+        if self._job_worker is not None:
+            self._job_worker.cancel()
+        for _, thread in self._running_jobs:
+            thread.wait()
+        super().closeEvent(event)
+
 
     def _build_menu(self):
         menubar = self.menuBar()
@@ -1493,7 +1110,7 @@ class MainWindow(QMainWindow):
         default_desc_csv = "descent_profile_default.csv"
         if os.path.exists(default_desc_csv):
             try:
-                points = self._read_descent_csv_points(default_desc_csv)
+                points = read_descent_csv(default_desc_csv)
                 self._fill_desc_table_from_points(points)
                 self.lbl_descent_file.setText(
                     f"Profil de descente : {default_desc_csv} [par défaut]"
@@ -1511,9 +1128,13 @@ class MainWindow(QMainWindow):
     # ---------- Actions UI ----------
     def on_download_gfs_from_nomads(self):
         """
-        Télécharge un ou plusieurs GRIB2 GFS 0.25° depuis NOMADS
-        et remplit le profil vent pour la lat/lon initiale.
+        Télécharge depuis NOMADS les GRIB2 GFS 0.25° qui couvrent le vol
+        (lancement → atterrissage), les assemble en un champ interpolé
+        dans le temps et remplit le profil vent pour la lat/lon initiale.
         """
+        # GFS (requests, lecture GRIB) chargé au premier usage, pas au démarrage
+        from App import gfs_download, gfs_utils
+
         lat0 = self.sb_lat0.value()
         lon0 = self.sb_lon0.value()
 
@@ -1533,19 +1154,14 @@ class MainWindow(QMainWindow):
         lon_min = lon0 - cfg["lon_span"]
         lon_max = lon0 + cfg["lon_span"]
 
-        # Dossier de sortie
-        os.makedirs("gfs_data", exist_ok=True)
-
-        # 👉 liste des fhour à tenter (0,3,6,… jusqu’à fhour max)
-        max_fhour = cfg["fhour"]
-        fhours = list(range(0, max_fhour + 1, 3))
-
-        downloaded_path = None
+        # 👉 fenêtre d'échéances qui couvre le vol (lancement → atterrissage)
+        launch_fhour = cfg["fhour"]
+        fhours = gfs_utils.forecast_window(launch_fhour, cfg["duration_h"])
 
-        for fh in fhours:
-            url = gfs_download.build_gfs_url(
-                date_yyyymmdd=cfg["date"],
-                cycle_hour=cfg["cycle"],
+        reqs = [
+            gfs_download.GfsRequest.make(
+                date=cfg["date"],
+                cycle=cfg["cycle"],
                 fhour=fh,
                 lat_min=lat_min,
                 lat_max=lat_max,
@@ -1553,19 +1169,21 @@ class MainWindow(QMainWindow):
                 lon_max=lon_max,
                 vars_=cfg["vars"],
                 levels_hpa=cfg["levels"],
-                all_levels=(len(cfg["levels"]) == 0),
             )
+            for fh in fhours
+        ]
 
-            out_name = f"gfs_{cfg['date']}_{cfg['cycle']:02d}_f{fh:03d}.grib2"
-            out_path = os.path.join("gfs_data", out_name)
+        # Cache gfs_data/ d'abord, puis les échéances manquantes en parallèle
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            paths = gfs_download.download_cached(reqs)
+        finally:
+            QApplication.restoreOverrideCursor()
 
-            ok = gfs_download.download_gfs(url, out_path)
-            if ok:
-                downloaded_path = out_path
-                print(f"[GFS] ✔ Utilisation de {out_name}")
-                break
+        steps = [(fh, path) for fh, path in zip(fhours, paths) if path is not None]
+        missing = [fh for fh, path in zip(fhours, paths) if path is None]
 
-        if downloaded_path is None:
+        if not steps:
             QMessageBox.critical(
                 self,
                 "GFS indisponible",
@@ -1574,13 +1192,14 @@ class MainWindow(QMainWindow):
             )
             return
 
-        # Extraction du profil vent
+        if missing:
+            print(f"[GFS] ⚠ Échéances manquantes : {', '.join(f'f{fh:03d}' for fh in missing)}")
+
+        # Extraction du profil vent au lancement ; les autres échéances
+        # ne sont décodées que si la simulation les traverse
         try:
-            points = gfs_utils.extract_wind_profile_from_gfs_grib(
-                grib_path=downloaded_path,
-                lat_deg=lat0,
-                lon_deg=lon0,
-            )
+            field = gfs_utils.TimeInterpolatedWindField(steps, launch_fhour=launch_fhour)
+            points = field.wind_points(lat0, lon0)
         except Exception as e:
             QMessageBox.critical(
                 self,
@@ -1589,8 +1208,15 @@ class MainWindow(QMainWindow):
             )
             return
 
+        self.gfs_field = field
+        self.cb_wind_4d.setEnabled(True)
         self._fill_wind_table_from_points(points)
-        self.lbl_wind_file.setText(f"Profil de vent : GFS NOMADS {os.path.basename(downloaded_path)}")
+
+        first, last = steps[0][0], steps[-1][0]
+        span = f"f{first:03d}" if first == last else f"f{first:03d}–f{last:03d}"
+        self.lbl_wind_file.setText(
+            f"Profil de vent : GFS NOMADS {cfg['date']} {cfg['cycle']:02d}z {span} ({len(steps)} échéances)"
+        )
 
 
 
@@ -1605,7 +1231,7 @@ class MainWindow(QMainWindow):
             return
 
         try:
-            points = self._read_ascent_csv_points(path)
+            points = read_ascent_csv(path)
         except Exception as e:
             QMessageBox.critical(self, "Erreur chargement montée", str(e))
             return
@@ -1625,7 +1251,7 @@ class MainWindow(QMainWindow):
             return
 
         try:
-            points = self._read_descent_csv_points(path)
+            points = read_descent_csv(path)
         except Exception as e:
             QMessageBox.critical(self, "Erreur chargement descente", str(e))
             return
@@ -1644,7 +1270,7 @@ class MainWindow(QMainWindow):
             return
 
         try:
-            points = self._read_wind_csv_points(path)
+            points = read_wind_csv(path)
         except Exception as e:
             QMessageBox.critical(self, "Erreur chargement vent", str(e))
             return
@@ -1656,6 +1282,8 @@ class MainWindow(QMainWindow):
         """
         Charge un fichier GFS GRIB2 et génère le profil vent pour la lat/lon courante.
         """
+        from App import gfs_utils  # lecture GRIB chargée au premier usage
+
         path, _ = QFileDialog.getOpenFileName(
             self,
             "Choisir un fichier GFS (GRIB2)",
@@ -1669,16 +1297,15 @@ class MainWindow(QMainWindow):
         lon0 = self.sb_lon0.value()
 
         try:
-            points = gfs_utils.extract_wind_profile_from_gfs_grib(
-                grib_path=path,
-                lat_deg=lat0,
-                lon_deg=lon0,
-            )
+            field = gfs_utils.open_wind_field(path)
+            points = field.wind_points(lat0, lon0)
         except Exception as e:
             QMessageBox.critical(self, "Erreur GFS", f"Impossible d'extraire le profil vent GFS :\n{e}")
             return
 
         # On pousse ça dans la table profil vent
+        self.gfs_field = field
+        self.cb_wind_4d.setEnabled(True)
         self._fill_wind_table_from_points(points)
         self.lbl_wind_file.setText(f"Profil de vent : GFS {path}")
     
@@ -1691,6 +1318,11 @@ class MainWindow(QMainWindow):
         return False
     
 
+    def _on_integrator_changed(self, _index: int):
+        key = self.cb_integrator.currentData()
+        self.sb_tol.setEnabled(key == "rk45")
+        self.cb_compiled.setEnabled(key == "euler")
+
     def on_simulate(self):
         alt0 = self.sb_alt0.value()
         lat0 = self.sb_lat0.value()
@@ -1715,11 +1347,28 @@ class MainWindow(QMainWindow):
         ff_alt = self.sb_ff_start_alt.value() if self.cb_free_fall.isChecked() else None
         ff_factor = self.sb_free_factor.value()
 
+        # ---------- INTÉGRATEUR ----------
+        integrator = self.cb_integrator.currentData()
+        tol_m = self.sb_tol.value()
+        compiled = self.cb_compiled.isChecked()
+
+        # ---------- VENT 4D ----------
+        if self.cb_wind_4d.isChecked() and self.gfs_field is not None:
+            if integrator != "euler":
+                QMessageBox.warning(
+                    self,
+                    "Vent 4D",
+                    "Le vent 4D (GFS) n'est disponible qu'avec l'intégrateur Euler.",
+                )
+                return
+            wind_profile = self.gfs_field
+
         try:
             if use_ascent:
                 ascent_profile = self._build_effective_ascent_profile()
 
-                self.current_states = simulate_flight(
+                func = simulate_flight
+                kwargs = dict(
                     alt_start_m=0.0,
                     alt_burst_m=alt0,
                     lat0_deg=lat0,
@@ -1730,27 +1379,40 @@ class MainWindow(QMainWindow):
                     wind_profile=wind_profile,
                     ff_start_alt=ff_alt,
                     free_fall_factor=ff_factor,
+                    integrator=integrator,
+                    tol_m=tol_m,
+                    compiled=compiled,
                 )
             else:
                 # mode descente seule
-                self.current_states = simulate_descent(
+                func = simulate_descent
+                kwargs = dict(
                     alt0_m=alt0,
                     lat0_deg=lat0,
                     lon0_deg=lon0,
                     dt_s=dt,
                     descent_profile=descent_profile,
                     wind_profile=wind_profile,
+                    integrator=integrator,
+                    tol_m=tol_m,
+                    compiled=compiled,
                 )
 
         except Exception as e:
             QMessageBox.critical(self, "Erreur simulation", str(e))
             return
 
-        # ---------- AFFICHAGE ----------
-        self._populate_results_table(self.current_states)
-        self.canvas.plot_trajectory(self.current_states)
-        self.canvas3d.plot_trajectory_3d(self.current_states)
-        self.map_widget.show_trajectory(self.current_states)
+        worker = SimulationWorker(func, kwargs)
+        worker.finished.connect(self._on_simulation_finished)
+        worker.failed.connect(self._on_simulation_failed)
+        self._start_job(worker)
+
+    def _on_simulation_failed(self, msg: str):
+        QMessageBox.critical(self, "Erreur simulation", msg)
+
+    def _on_simulation_finished(self, states: Trajectory):
+        self.current_states = states
+        self._invalidate_trajectory_views()
 
         # ---------- ANIMATION 3D ----------
         n = len(self.current_states)
@@ -1768,6 +1430,10 @@ class MainWindow(QMainWindow):
             self.slider_anim.setEnabled(False)
             self.lbl_anim_time.setText("t = 0.0 s")
 
+        # ---------- AFFICHAGE ----------
+        # Onglet visible seulement ; les autres à leur prochaine ouverture
+        self._render_tab(self.tabs.currentWidget())
+
 
 
 
@@ -1896,213 +1562,12 @@ class MainWindow(QMainWindow):
     
     def _build_effective_descent_profile(self, alt0_m: float) -> DescentProfile:
         """
-        Profil de descente effectif avec :
-        - effet de masse progressif (réaliste)
-        - compatible Predictor
+        Profil de descente de la table, corrigé de la masse (descent_with_mass).
         """
-        base_profile = self._get_descent_profile_from_table()
-
-        m = self.sb_mass.value()
-        if m <= 0:
-            return base_profile
-
-        m_ref = 1.0
-        mass_factor = math.sqrt(m / m_ref)
-
-        points: List[DescentPoint] = []
-
-        for p in base_profile.points:
-            alt = p.alt_m
-
-            # 🔥 effet masse progressif (clé)
-            if alt > 20000:
-                alpha = 0.15      # presque pas d'effet en très haute altitude
-            elif alt < 3000:
-                alpha = 1.0      # plein effet proche du sol
-            else:
-                alpha = 1.0 - (20000 - alt) / (20000 - 3000)
-
-            factor = 1.0 + alpha * (mass_factor - 1.0)
-            factor = max(0.85, min(factor, 1.5))
-
-            v = p.descent_ms * factor
-            v = max(v, 0.5)  # sécurité
-
-            points.append(
-                DescentPoint(
-                    alt_m=alt,
-                    descent_ms=v,
-                )
-            )
-
-        return DescentProfile(points)
-
-
+        return descent_with_mass(self._get_descent_profile_from_table(), self.sb_mass.value())
 
     def _build_effective_ascent_profile(self) -> AscentProfile:
         """
-        Profil d'ascension avec effet de masse progressif (réaliste).
-        """
-        base_profile = self._get_ascent_profile_from_table()
-
-        m = self.sb_mass.value()
-        if m <= 0:
-            return base_profile
-
-        m_ref = 1.0
-        mass_factor = math.sqrt(m_ref / m)
-
-        points: List[AscentPoint] = []
-
-        for p in base_profile.points:
-            alt = p.alt_m
-
-            # 🔥 effet masse progressif
-            if alt > 20000:
-                alpha = 0.2    # quasi nul en haute altitude
-            elif alt < 5000:
-                alpha = 1.0
-            else:
-                alpha = 1.0 - (alt - 5000) / (20000 - 5000)
-
-            factor = 1.0 + alpha * (mass_factor - 1.0)
-
-            v = p.ascent_ms * factor
-            v = max(v, 0.3)
-
-            points.append(
-                AscentPoint(
-                    alt_m=alt,
-                    ascent_ms=v,
-                )
-            )
-
-        return AscentProfile(points)
-
-
-    # ---------- Lecture CSV ----------
-
-    def _read_ascent_csv_points(self, path: str) -> List[AscentPoint]:
-        """
-        Lit un CSV de profil ascendant.
-        Colonnes attendues (noms tolérants) :
-        - altitude : alt, altitude
-        - vitesse montée : ascent, montée, vit, vitesse
+        Profil d'ascension de la table, corrigé de la masse (ascent_with_mass).
         """
-        points: List[AscentPoint] = []
-
-        with open(path, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f, delimiter=";")
-            columns = {name.lower(): name for name in (reader.fieldnames or [])}
-
-            def find_col(keys):
-                for k in keys:
-                    for c in columns:
-                        if k in c:
-                            return columns[c]
-                raise ValueError(f"Colonne manquante dans {path}: {keys}")
-
-            alt_col = find_col(["alt"])
-            asc_col = find_col(["ascent", "mont", "vit", "vitesse"])
-
-            for row in reader:
-                alt = float(row[alt_col].replace(",", "."))
-                asc = float(row[asc_col].replace(",", "."))
-                points.append(AscentPoint(alt_m=alt, ascent_ms=asc))
-
-        if not points:
-            raise ValueError("Aucun point lu dans le CSV d'ascension")
-
-        return points
-
-    def _read_descent_csv_points(self, path: str) -> List[DescentPoint]:
-        points: List[DescentPoint] = []
-        with open(path, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f, delimiter=";")
-            columns = {name.lower(): name for name in (reader.fieldnames or [])}
-
-            def find_col(keys):
-                for k in keys:
-                    for c in columns:
-                        if k in c:
-                            return columns[c]
-                raise ValueError(f"Colonne manquante dans {path}: {keys}")
-
-            alt_col = find_col(["alt"])
-            desc_col = find_col(["descent", "vit", "vitesse"])
-
-            for row in reader:
-                alt = float(row[alt_col].replace(",", "."))
-                desc = float(row[desc_col].replace(",", "."))
-                points.append(DescentPoint(alt_m=alt, descent_ms=desc))
-
-        if not points:
-            raise ValueError("Aucun point lu dans le CSV de descente")
-        return points
-
-    def _read_wind_csv_points(self, path: str) -> List[WindPoint]:
-        points: List[WindPoint] = []
-        with open(path, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f, delimiter=";")
-            columns = {name.lower(): name for name in (reader.fieldnames or [])}
-
-            def find_col(keys):
-                for k in keys:
-                    for c in columns:
-                        if k in c:
-                            return columns[c]
-                raise ValueError(f"Colonne manquante dans {path}: {keys}")
-
-            alt_col = find_col(["alt"])
-            u_col = find_col(["u"])
-            v_col = find_col(["v"])
-
-            for row in reader:
-                alt = float(row[alt_col].replace(",", "."))
-                u = float(row[u_col].replace(",", "."))
-                v = float(row[v_col].replace(",", "."))
-                points.append(WindPoint(alt_m=alt, wind_u_ms=u, wind_v_ms=v))
-
-        if not points:
-            raise ValueError("Aucun point lu dans le CSV de vent")
-        return points
-
-    # ---------- Table résultats ----------
-
-    def _populate_results_table(self, states: List[State]):
-        self.table_results.setRowCount(len(states))
-
-        for i, s in enumerate(states):
-
-            # vitesse verticale lisible
-            if s.phase == "ASCENT":
-                v_vert = abs(s.descent_ms)
-            else:
-                v_vert = abs(s.descent_ms)
-
-            values = [
-                f"{s.t_s:.1f}",
-                s.phase,
-                f"{s.alt_m:.0f}",
-                f"{s.lat_deg:.5f}",
-                f"{s.lon_deg:.5f}",
-                f"{v_vert:.2f}",
-                f"{s.wind_u_ms:.2f}",
-                f"{s.wind_v_ms:.2f}",
-            ]
-
-            for j, v in enumerate(values):
-                item = QTableWidgetItem(v)
-                item.setTextAlignment(
-                    Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
-                )
-
-                # Mise en couleur par phase (lisibilité ++)
-                if s.phase == "ASCENT":
-                    item.setForeground(Qt.GlobalColor.cyan)
-                else:
-                    item.setForeground(Qt.GlobalColor.yellow)
-
-                self.table_results.setItem(i, j, item)
-
-        self.table_results.resizeColumnsToContents()
\ No newline at end of file
+        return ascent_with_mass(self._get_ascent_profile_from_table(), self.sb_mass.value())
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from typing import List, Optional
+import json
+from typing import Any, Dict, List, Optional
 
-import folium
+import numpy as np
 from PyQt5.QtWebEngineWidgets import QWebEngineView
 
-# Import du State de la simulation
-from App.simulation import State
+# Trajectoire de la simulation (colonnes NumPy)
+from App.simulation import Trajectory
+from App.montecarlo import EllipseResult, ImpactSample
+from App.simplify import display_mask
 
 
 # =========================================================
@@ -20,6 +23,164 @@ MAP_STYLES = {
     "Gris sobre": "Esri.WorldGrayCanvas",
 }
 
+# Décimales des coordonnées envoyées à la page (1e-5 ° ~ 1 m)
+COORD_DECIMALS = 5
+
+# Zoom quand la carte se recentre sur une trajectoire
+TRAJECTORY_ZOOM = 7
+
+
+# =========================================================
+# Script de la page : couches pilotées depuis Python
+# =========================================================
+# Enfant de la carte folium (rendu après sa création) ; ensuite tout passe
+# par runJavaScript("sp.<fonction>(<json>)").
+_PAGE_SCRIPT = """
+window.sp = (function (map) {
+    var tiles = null;
+    var traj = L.layerGroup().addTo(map);
+    var impacts = L.layerGroup().addTo(map);
+    var dots = L.canvas({padding: 0.5});
+    var placed = false;
+
+    function label(p) {  // [lat, lon, titre, couleur]
+        var html = '<div style="background:#000;color:' + p[3] + ';padding:6px 8px;'
+            + 'border-radius:6px;font-size:12px;font-weight:bold;'
+            + 'box-shadow:0 0 8px ' + p[3] + ';white-space:nowrap;">'
+            + p[2] + '<br>Lat ' + p[0].toFixed(4) + '°<br>Lon ' + p[1].toFixed(4) + '°</div>';
+        return L.marker([p[0], p[1]], {icon: L.divIcon({html: html, className: 'empty'})});
+    }
+
+    return {
+        setTiles: function (t) {
+            if (tiles) { map.removeLayer(tiles); }
+            tiles = L.tileLayer(t.url, t.options).addTo(map);
+            tiles.bringToBack();
+        },
+        setView: function (v) {
+            map.setView([v[0], v[1]], v[2]);
+            placed = false;
+        },
+        setTrajectory: function (d) {
+            traj.clearLayers();
+            if (d.asc.length) {
+                L.polyline(d.asc, {color: '#00bfff', weight: 4, opacity: 1}).addTo(traj);
+            }
+            if (d.desc.length) {
+                L.polyline(d.desc, {color: '#ffa500', weight: 4, opacity: 1, dashArray: '6,6'}).addTo(traj);
+            }
+            d.labels.forEach(function (p) { label(p).addTo(traj); });
+
+            // Pan / zoom de l'utilisateur conservés, sauf si la trajectoire sort de l'écran
+            var all = d.asc.concat(d.desc);
+            if (all.length && (!placed || !map.getBounds().intersects(L.latLngBounds(all)))) {
+                map.setView(d.center, d.zoom);
+            }
+            placed = true;
+        },
+        setImpacts: function (d) {
+            impacts.clearLayers();
+            d.points.forEach(function (p) {
+                L.circleMarker(p, {renderer: dots, radius: 2, stroke: false,
+                                   fillColor: '#ffa500', fillOpacity: 0.7}).addTo(impacts);
+            });
+            if (d.ellipse) {
+                L.polygon(d.ellipse, {color: '#ff4444', weight: 2, fill: false}).addTo(impacts);
+            }
+        },
+        clear: function () {
+            traj.clearLayers();
+            impacts.clearLayers();
+        }
+    };
+})(%s);
+"""
+
+
+def _camel(key: str) -> str:
+    head, *rest = key.split("_")
+    return head + "".join(w.capitalize() for w in rest)
+
+
+def _latlon_list(lats: np.ndarray, lons: np.ndarray) -> List[List[float]]:
+    return np.round(np.column_stack((lats, lons)), COORD_DECIMALS).tolist()
+
+
+def tile_payload(tile_style: str) -> Dict[str, Any]:
+    """
+    URL + options Leaflet d'un style de tuiles (résolu par folium /
+    xyzservices, comme folium.TileLayer).
+    """
+    import folium
+
+    layer = folium.TileLayer(tiles=tile_style)
+    return {
+        "url": layer.tiles,
+        "options": {_camel(k): v for k, v in layer.options.items()},
+    }
+
+
+def trajectory_payload(states: Trajectory) -> Dict[str, Any]:
+    """
+    Trajectoire pour sp.setTrajectory : montée, descente, étiquettes
+    (lancement, burst, impact) et centre de la vue.
+
+    Lignes simplifiées à DISPLAY_TOLERANCE_M près (Douglas–Peucker) :
+    lancement, burst et impact restent des points du tracé.
+    """
+    keep = display_mask(states)
+    ascent = states.ascent_mask & keep
+    descent = states.descent_mask & keep
+    lats = states.lat_deg
+    lons = states.lon_deg
+
+    asc_pts = _latlon_list(lats[ascent], lons[ascent])
+    desc_pts = _latlon_list(lats[descent], lons[descent])
+
+    labels = []
+    if asc_pts:
+        labels.append(asc_pts[0] + ["🚀 Lancement", "#00ff88"])
+        labels.append(asc_pts[-1] + ["💥 Burst", "#ff4444"])
+    if desc_pts:
+        labels.append(desc_pts[-1] + ["🎯 Impact", "#ffa500"])
+
+    # Centre de la carte : burst, sinon premier point
+    center = asc_pts[-1] if asc_pts else (desc_pts[0] if desc_pts else None)
+
+    return {
+        "asc": asc_pts,
+        "desc": desc_pts,
+        "labels": labels,
+        "center": center,
+        "zoom": TRAJECTORY_ZOOM,
+    }
+
+
+def impacts_payload(
+    impacts: List[ImpactSample],
+    ellipse: Optional[EllipseResult],
+    lat0_deg: float,
+    lon0_deg: float,
+) -> Dict[str, Any]:
+    """
+    Nuage d'impacts Monte Carlo (+ contour de l'ellipse) pour sp.setImpacts.
+    """
+    from App.export import ellipse_latlon
+
+    points = _latlon_list(
+        np.array([s.lat_deg for s in impacts]),
+        np.array([s.lon_deg for s in impacts]),
+    )
+
+    ring = None
+    if ellipse is not None and ellipse.a_m > 0.0 and ellipse.b_m > 0.0:
+        ring = [
+            [round(lat, COORD_DECIMALS), round(lon, COORD_DECIMALS)]
+            for lon, lat in ellipse_latlon(ellipse, lat0_deg, lon0_deg)
+        ]
+
+    return {"points": points, "ellipse": ring}
+
 
 class MapWidget(QWebEngineView):
     """
@@ -28,7 +189,12 @@ class MapWidget(QWebEngineView):
     - Affiche une carte centrée sur la position initiale
     - Trace la trajectoire montée / descente
     - Marque les points clés : lancement, burst, impact
+    - Affiche le nuage d'impacts Monte Carlo et son ellipse
     - Permet de changer dynamiquement le style de carte
+
+    La page (Leaflet) n'est chargée qu'une fois, au premier affichage.
+    Ensuite chaque mise à jour est un appel runJavaScript avec un JSON
+    compact : pas de rechargement des tuiles, pan / zoom conservés.
     """
 
     def __init__(
@@ -48,11 +214,71 @@ class MapWidget(QWebEngineView):
         # Style de carte actif
         self._tile_style: str = "CartoDB dark_matter"
 
-        # Dernière trajectoire affichée
-        self._last_states: List[State] = []
+        # État affiché (repoussé en entier quand la page finit de charger)
+        self._view = (default_lat, default_lon, default_zoom)
+        self._last_states = Trajectory()
+        self._impacts: Optional[Dict[str, Any]] = None
 
-        # Affiche la carte vide au démarrage
-        self.show_base_map()
+        # Page construite au premier affichage (showEvent) : folium
+        # (pandas, branca, jinja2) n'est importé qu'à ce moment-là
+        self._page_built = False
+        self._page_ready = False
+        self.loadFinished.connect(self._on_load_finished)
+
+    def showEvent(self, event):
+        if not self._page_built:
+            self._build_page()
+        super().showEvent(event)
+
+    # =====================================================
+    # Page Leaflet (une seule fois)
+    # =====================================================
+    def _build_page(self):
+        import folium
+        from branca.element import MacroElement
+        from jinja2 import Template
+
+        m = folium.Map(
+            location=self._view[:2],
+            zoom_start=self._view[2],
+            tiles=None,
+            control_scale=True,
+        )
+
+        bridge = MacroElement()
+        bridge._template = Template(
+            "{% macro script(this, kwargs) %}"
+            + _PAGE_SCRIPT % "{{ this._parent.get_name() }}"
+            + "{% endmacro %}"
+        )
+        m.add_child(bridge)
+
+        self._page_built = True
+        self._page_ready = False
+        self.setHtml(m.get_root().render())
+
+    def _on_load_finished(self, ok: bool):
+        self._page_ready = ok
+        if not ok:
+            return
+
+        self._call("setTiles", tile_payload(self._tile_style))
+        self._call("setView", self._view)
+        if self._last_states:
+            self._call("setTrajectory", trajectory_payload(self._last_states))
+        if self._impacts is not None:
+            self._call("setImpacts", self._impacts)
+
+    def _call(self, func: str, payload) -> bool:
+        """
+        sp.<func>(payload) dans la page. Sans page prête, ne fait rien :
+        l'état gardé côté Python est envoyé à la fin du chargement.
+        """
+        if not self._page_ready:
+            return False
+        data = json.dumps(payload, separators=(",", ":"))
+        self.page().runJavaScript(f"sp.{func}({data});")
+        return True
 
     # =====================================================
     # Carte de base
@@ -70,26 +296,17 @@ class MapWidget(QWebEngineView):
         lon = lon if lon is not None else self.default_lon
         zoom = zoom if zoom is not None else self.default_zoom
 
-        m = folium.Map(
-            location=(lat, lon),
-            zoom_start=zoom,
-            tiles=None,
-            control_scale=True,
-        )
-
-        folium.TileLayer(
-            tiles=self._tile_style,
-            name="Base",
-            control=False,
-        ).add_to(m)
+        self._view = (lat, lon, zoom)
+        self._last_states = Trajectory()
+        self._impacts = None
 
-        self.setHtml(m.get_root().render())
+        if self._call("clear", None):
+            self._call("setView", self._view)
 
     def clear_map(self):
         """
         Efface la trajectoire et revient à la carte de base.
         """
-        self._last_states = []
         self.show_base_map()
 
     # =====================================================
@@ -97,114 +314,46 @@ class MapWidget(QWebEngineView):
     # =====================================================
     def set_map_style(self, tile_style: str):
         """
-        Change le style de carte (tiles).
+        Change le style de carte (tiles) : seule la couche de tuiles est
+        remplacée, la vue et les tracés restent en place.
         """
         try:
-            self._tile_style = tile_style
-            if self._last_states:
-                self.show_trajectory(self._last_states)
-            else:
-                self.show_base_map()
+            payload = tile_payload(tile_style)
         except Exception:
             # fallback de sécurité
-            self._tile_style = "CartoDB dark_matter"
-            self.show_base_map()
+            tile_style = "CartoDB dark_matter"
+            payload = tile_payload(tile_style)
+
+        self._tile_style = tile_style
+        self._call("setTiles", payload)
 
     # =====================================================
     # Affichage de la trajectoire
     # =====================================================
-    def show_trajectory(self, states: List[State]):
+    def show_trajectory(self, states: Trajectory):
         """
         Affiche la trajectoire complète sur la carte.
         """
-        self._last_states = states
-
         if not states:
             self.show_base_map()
             return
 
-        # Séparation montée / descente
-        ascent = [s for s in states if s.phase == "ASCENT"]
-        descent = [s for s in states if s.phase == "DESCENT"]
-
-        # Centre de la carte
-        if ascent:
-            center = (ascent[-1].lat_deg, ascent[-1].lon_deg)
-        else:
-            center = (states[0].lat_deg, states[0].lon_deg)
-
-        m = folium.Map(
-            location=center,
-            zoom_start=7,
-            tiles=None,
-            control_scale=True,
-        )
-
-        folium.TileLayer(
-            tiles=self._tile_style,
-            name="Base",
-            control=False,
-        ).add_to(m)
-
-        # ------------------------
-        # Montée
-        # ------------------------
-        if ascent:
-            folium.PolyLine(
-                [(s.lat_deg, s.lon_deg) for s in ascent],
-                color="#00bfff",
-                weight=4,
-                opacity=1,
-            ).add_to(m)
-
-            launch = ascent[0]
-            burst = ascent[-1]
-
-            self._add_label(m, launch, "🚀 Lancement", "#00ff88")
-            self._add_label(m, burst, "💥 Burst", "#ff4444")
-
-        # ------------------------
-        # Descente
-        # ------------------------
-        if descent:
-            folium.PolyLine(
-                [(s.lat_deg, s.lon_deg) for s in descent],
-                color="#ffa500",
-                weight=4,
-                opacity=1,
-                dash_array="6,6",
-            ).add_to(m)
-
-            impact = descent[-1]
-            self._add_label(m, impact, "🎯 Impact", "#ffa500")
-
-        self.setHtml(m.get_root().render())
+        self._last_states = states
+        self._call("setTrajectory", trajectory_payload(states))
 
     # =====================================================
-    # Helpers
+    # Monte Carlo
     # =====================================================
-    def _add_label(self, m, s: State, title: str, color: str):
+    def show_impacts(
+        self,
+        impacts: List[ImpactSample],
+        ellipse: Optional[EllipseResult],
+        lat0_deg: float,
+        lon0_deg: float,
+    ):
         """
-        Ajoute une étiquette HTML stylée sur la carte.
+        Affiche le nuage d'impacts et l'ellipse (repère local centré sur
+        le lancement lat0 / lon0). Liste vide → efface le nuage.
         """
-        folium.Marker(
-            location=(s.lat_deg, s.lon_deg),
-            icon=folium.DivIcon(
-                html=f"""
-                <div style="
-                    background:#000;
-                    color:{color};
-                    padding:6px 8px;
-                    border-radius:6px;
-                    font-size:12px;
-                    font-weight:bold;
-                    box-shadow:0 0 8px {color};
-                    white-space:nowrap;
-                ">
-                    {title}<br>
-                    Lat {s.lat_deg:.4f}°<br>
-                    Lon {s.lon_deg:.4f}°
-                </div>
-                """
-            ),
-        ).add_to(m)
+        self._impacts = impacts_payload(impacts, ellipse, lat0_deg, lon0_deg)
+        self._call("setImpacts", self._impacts)
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import math
-import random
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import numpy as np
 
 from App.profiles import (
     AscentProfile,
@@ -72,7 +75,7 @@ def _compute_local_xy(
     return x, y
 
 
-def _compute_ellipse_from_samples(
+def compute_ellipse_from_samples(
     samples: List[ImpactSample],
     k_sigma: float = 2.4477,   # ≈ 95 % (χ² à 2 ddl)
 ) -> Optional[EllipseResult]:
@@ -87,18 +90,20 @@ def _compute_ellipse_from_samples(
     if len(samples) < 3:
         return None
 
-    xs = [s.x_m for s in samples]
-    ys = [s.y_m for s in samples]
+    xs = np.fromiter((s.x_m for s in samples), dtype=float, count=len(samples))
+    ys = np.fromiter((s.y_m for s in samples), dtype=float, count=len(samples))
     n = float(len(xs))
 
     # Centre de gravité
-    mx = sum(xs) / n
-    my = sum(ys) / n
+    mx = float(xs.sum()) / n
+    my = float(ys.sum()) / n
 
     # Covariances
-    sxx = sum((x - mx) ** 2 for x in xs) / n
-    syy = sum((y - my) ** 2 for y in ys) / n
-    sxy = sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / n
+    dx = xs - mx
+    dy = ys - my
+    sxx = float(np.dot(dx, dx)) / n
+    syy = float(np.dot(dy, dy)) / n
+    sxy = float(np.dot(dx, dy)) / n
 
     # Valeurs propres (ellipse)
     trace = sxx + syy
@@ -126,10 +131,489 @@ def _compute_ellipse_from_samples(
     )
 
 
+# ============================================================
+# Moteur vectorisé (tous les runs en parallèle)
+# ============================================================
+
+# Taille de lot par défaut (runs intégrés ensemble) : borne la mémoire des
+# tables perturbées (n_runs × n_niveaux) tout en gardant des tableaux assez
+# gros pour NumPy, et donne assez de lots à répartir entre processus.
+BATCH_SIZE = 5_000
+
+# Méthodes d'intégration acceptées par run_monte_carlo
+MC_METHODS = ("batch", "loop", "analytic", "compiled")
+
+# Un lot exécuté dans ce processus rend compte de sa progression tous les
+# PROGRESS_STEPS pas (moteur "batch") ou à chaque run ("loop", "analytic")
+PROGRESS_STEPS = 100
+
+# Rappel de progression d'un lot : runs du lot déjà posés → False pour
+# abandonner le lot (annulation)
+ChunkProgress = Callable[[int], bool]
+
+
+class _ChunkCancelled(Exception):
+    """
+    Lot abandonné à la demande du rappel de progression.
+    """
+
+
+def _locate(xp: np.ndarray, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Segment et ratio d'interpolation de chaque altitude x sur la grille xp.
+
+    Même règle que les profils (App.profiles) : segment tel que
+    xp[i] < x <= xp[i + 1], saturation aux bornes (la borne basse l'emporte).
+    Hors plage je renvoie ratio = 0 sur le point extrême : la valeur
+    interpolée est alors exactement celle de ce point.
+
+    Les tables associées doivent être complétées d'une colonne
+    (voir _pad_table) pour que i + 1 reste valide au point haut.
+    """
+    last = len(xp) - 1
+
+    i = np.searchsorted(xp, x, side="left") - 1
+    np.clip(i, 0, max(last - 1, 0), out=i)
+
+    if last == 0:
+        return i, np.zeros(x.shape)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = (x - xp[i]) / (xp[i + 1] - xp[i])
+
+    high = x >= xp[-1]
+    low = x <= xp[0]
+    i[high] = last
+    i[low] = 0
+    ratio[high | low] = 0.0
+    return i, ratio
+
+
+def _pad_table(table: np.ndarray) -> np.ndarray:
+    """
+    Duplique la dernière colonne : tables (n_runs, n + 1) aplaties ensuite
+    pour des gathers 1D (plus rapides que l'indexation 2D).
+    """
+    return np.concatenate([table, table[:, -1:]], axis=1)
+
+
+def _gather(
+    flat: np.ndarray,
+    ncols: int,
+    rows: np.ndarray,
+    i: np.ndarray,
+    ratio: np.ndarray,
+) -> np.ndarray:
+    """
+    y1 + ratio * (y2 - y1) sur la ligne de chaque run (tables aplaties).
+    """
+    k = rows * ncols + i
+    y1 = flat[k]
+    y2 = flat[k + 1]
+    return y1 + ratio * (y2 - y1)
+
+
+def _draw_perturbations(
+    rng: np.random.Generator,
+    n_runs: int,
+    base_descent: DescentProfile,
+    base_wind: WindProfile,
+    sigma_desc_rel: float,
+    sigma_wind_ms: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Tire les perturbations de n_runs runs et retourne les tables perturbées :
+    (descente, vent u, vent v), une ligne par run.
+
+    - bruit global (un facteur par run) sur la vitesse de descente
+    - bruit gaussien indépendant sur u/v à chaque niveau de vent
+    """
+    f_desc = 1.0 + rng.normal(0.0, sigma_desc_rel, size=n_runs)
+    noise_u = rng.normal(0.0, sigma_wind_ms, size=(n_runs, len(base_wind.alts_m)))
+    noise_v = rng.normal(0.0, sigma_wind_ms, size=(n_runs, len(base_wind.alts_m)))
+
+    desc = np.maximum(0.3, base_descent.speeds_ms[None, :] * f_desc[:, None])
+    u = base_wind.u_ms[None, :] + noise_u
+    v = base_wind.v_ms[None, :] + noise_v
+    return desc, u, v
+
+
+def _integrate_batch(
+    alt_burst_m: float,
+    lat0_deg: float,
+    lon0_deg: float,
+    dt_s: float,
+    ascent_profile: AscentProfile,
+    desc_alts: np.ndarray,
+    desc_table: np.ndarray,
+    wind_alts: np.ndarray,
+    u_table: np.ndarray,
+    v_table: np.ndarray,
+    max_steps: int = 40000,
+    progress: Optional[ChunkProgress] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Intègre en parallèle un lot de vols complets (montée depuis le sol,
+    burst, descente), un run par ligne des tables perturbées.
+
+    Même schéma que simulate_flight (sans chute libre) : état de chaque run
+    dans des tableaux (alt, lat, lon, phase), pas de temps ajusté run par
+    run au burst et au sol, runs posés masqués.
+
+    progress : appelé tous les PROGRESS_STEPS pas avec le nombre de runs
+    posés ; s'il renvoie False, le lot est abandonné (_ChunkCancelled).
+
+    Je retourne (lat_deg, lon_deg) des points d'impact.
+    """
+    n = desc_table.shape[0]
+
+    # Tables complétées puis aplaties (voir _locate / _gather)
+    desc_flat = _pad_table(desc_table).ravel()
+    u_flat = _pad_table(u_table).ravel()
+    v_flat = _pad_table(v_table).ravel()
+    desc_cols = desc_table.shape[1] + 1
+    wind_cols = u_table.shape[1] + 1
+
+    alt = np.zeros(n)
+    lat = np.full(n, math.radians(lat0_deg))
+    lon = np.full(n, math.radians(lon0_deg))
+    ascending = np.ones(n, dtype=bool)
+    active = np.ones(n, dtype=bool)
+
+    for step in range(max_steps):
+
+        idx = np.flatnonzero(active)
+        if idx.size == 0:
+            break
+
+        if progress is not None and step and step % PROGRESS_STEPS == 0:
+            if not progress(n - idx.size):
+                raise _ChunkCancelled()
+
+        a = alt[idx]
+        asc = ascending[idx]
+
+        dt = np.full(idx.size, dt_s)
+        alt_next = np.empty(idx.size)
+        alt_mid = np.empty(idx.size)
+
+        # ======================
+        # Montée (profil commun)
+        # ======================
+        ia = np.flatnonzero(asc)
+        if ia.size:
+            za = a[ia]
+            w = ascent_profile.values(za)
+
+            burst = za + w * dt_s >= alt_burst_m
+            dta = np.where(burst, (alt_burst_m - za) / np.maximum(w, 1e-6), dt_s)
+
+            dt[ia] = dta
+            alt_next[ia] = np.where(burst, alt_burst_m, za + w * dta)
+            alt_mid[ia] = za + 0.5 * w * dta
+
+            asc[ia[burst]] = False
+
+        # ======================
+        # Descente (profil par run)
+        # ======================
+        idsc = np.flatnonzero(~ascending[idx])
+        if idsc.size:
+            zd = a[idsc]
+            seg, ratio = _locate(desc_alts, zd)
+            w = _gather(desc_flat, desc_cols, idx[idsc], seg, ratio)
+
+            # Accélération post-burst (zone critique haute altitude)
+            w = np.where(zd > 18_000, w * 1.3, w)
+
+            ground = zd - w * dt_s <= 0
+            dtd = np.where(ground, zd / np.maximum(w, 1e-6), dt_s)
+
+            dt[idsc] = dtd
+            alt_next[idsc] = np.where(ground, 0.0, zd - w * dtd)
+            alt_mid[idsc] = zd - 0.5 * w * dtd
+
+        # ======================
+        # Vent (milieu de couche)
+        # ======================
+        seg, ratio = _locate(wind_alts, alt_mid)
+        wind_u = _gather(u_flat, wind_cols, idx, seg, ratio)
+        wind_v = _gather(v_flat, wind_cols, idx, seg, ratio)
+
+        la = lat[idx] + (wind_v * dt) / EARTH_RADIUS_M
+        lat[idx] = la
+        lon[idx] += (wind_u * dt) / (EARTH_RADIUS_M * np.cos(la))
+
+        alt[idx] = alt_next
+        ascending[idx] = asc
+
+        # Runs arrivés au sol
+        active[idx[~asc & (alt_next <= 0.0)]] = False
+
+    return np.degrees(lat), np.degrees(lon)
+
+
+def _impacts_from_arrays(
+    lat0_deg: float,
+    lon0_deg: float,
+    lats_deg: np.ndarray,
+    lons_deg: np.ndarray,
+) -> List[ImpactSample]:
+    """
+    Projection locale vectorisée (même repère que _compute_local_xy).
+    """
+    lat0_rad = math.radians(lat0_deg)
+    xs = EARTH_RADIUS_M * np.radians(lons_deg - lon0_deg) * math.cos(lat0_rad)
+    ys = EARTH_RADIUS_M * np.radians(lats_deg - lat0_deg)
+
+    return [
+        ImpactSample(lat_deg=la, lon_deg=lo, x_m=x, y_m=y)
+        for la, lo, x, y in zip(
+            lats_deg.tolist(), lons_deg.tolist(), xs.tolist(), ys.tolist()
+        )
+    ]
+
+
+def _simulate_one_landing(
+    alt0_m: float,
+    lat0_deg: float,
+    lon0_deg: float,
+    dt_s: float,
+    base_ascent: AscentProfile,
+    base_descent: DescentProfile,
+    base_wind: WindProfile,
+    desc_row: np.ndarray,
+    u_row: np.ndarray,
+    v_row: np.ndarray,
+    integrator: str = "euler",
+) -> Optional[Tuple[float, float]]:
+    """
+    Un run « classique » : profils perturbés reconstruits puis simulate_flight.
+
+    Je retourne (lat_deg, lon_deg) du point d'impact.
+    """
+    descent_profile = DescentProfile([
+        DescentPoint(alt_m=p.alt_m, descent_ms=float(d))
+        for p, d in zip(base_descent.points, desc_row)
+    ])
+
+    wind_profile = WindProfile([
+        WindPoint(alt_m=p.alt_m, wind_u_ms=float(wu), wind_v_ms=float(wv))
+        for p, wu, wv in zip(base_wind.points, u_row, v_row)
+    ])
+
+    states = simulate_flight(
+        alt_start_m=0.0,
+        alt_burst_m=alt0_m,
+        lat0_deg=lat0_deg,
+        lon0_deg=lon0_deg,
+        dt_s=dt_s,
+        ascent_profile=base_ascent,
+        descent_profile=descent_profile,
+        wind_profile=wind_profile,
+        ff_start_alt=None,
+        free_fall_factor=1.0,
+        record="impact",
+        integrator=integrator,
+    )
+
+    if not states:
+        return None
+
+    return states.summary.impact_lat_deg, states.summary.impact_lon_deg
+
+
+# ============================================================
+# Découpage en lots (séquentiel ou multi-processus)
+# ============================================================
+
+@dataclass
+class _ChunkTask:
+    """
+    Un lot de runs Monte Carlo, autonome et sérialisable (pickle) pour
+    pouvoir être exécuté dans un processus du pool.
+    """
+    n_runs: int
+    seed_seq: np.random.SeedSequence
+    alt0_m: float
+    lat0_deg: float
+    lon0_deg: float
+    dt_s: float
+    base_ascent: AscentProfile
+    base_descent: DescentProfile
+    base_wind: WindProfile
+    sigma_desc_rel: float
+    sigma_wind_ms: float
+    method: str
+
+
+def _run_chunk(
+    task: _ChunkTask,
+    progress: Optional[ChunkProgress] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Exécute un lot et retourne les impacts (lat_deg, lon_deg) en tableaux.
+
+    Le lot tire ses perturbations dans son propre flux aléatoire
+    (task.seed_seq) : le résultat ne dépend pas du processus qui l'exécute.
+
+    progress (lot exécuté dans ce processus seulement) : voir
+    _integrate_batch ; le noyau compilé n'en rend pas compte.
+    """
+    rng = np.random.default_rng(task.seed_seq)
+
+    desc, u, v = _draw_perturbations(
+        rng,
+        task.n_runs,
+        task.base_descent,
+        task.base_wind,
+        task.sigma_desc_rel,
+        task.sigma_wind_ms,
+    )
+
+    if task.method == "compiled":
+        # Import local : Numba est long à importer
+        from App import kernels
+        if kernels.NUMBA_AVAILABLE:
+            return kernels.landings_compiled(
+                alt_burst_m=task.alt0_m,
+                lat0_deg=task.lat0_deg,
+                lon0_deg=task.lon0_deg,
+                dt_s=task.dt_s,
+                ascent_profile=task.base_ascent,
+                desc_alts=task.base_descent.alts_m,
+                desc_table=desc,
+                wind_alts=task.base_wind.alts_m,
+                u_table=u,
+                v_table=v,
+            )
+
+    if task.method in ("batch", "compiled"):
+        return _integrate_batch(
+            alt_burst_m=task.alt0_m,
+            lat0_deg=task.lat0_deg,
+            lon0_deg=task.lon0_deg,
+            dt_s=task.dt_s,
+            ascent_profile=task.base_ascent,
+            desc_alts=task.base_descent.alts_m,
+            desc_table=desc,
+            wind_alts=task.base_wind.alts_m,
+            u_table=u,
+            v_table=v,
+            progress=progress,
+        )
+
+    integrator = "analytic" if task.method == "analytic" else "euler"
+
+    lats: List[float] = []
+    lons: List[float] = []
+    for k in range(task.n_runs):
+        landing = _simulate_one_landing(
+            task.alt0_m, task.lat0_deg, task.lon0_deg, task.dt_s,
+            task.base_ascent, task.base_descent, task.base_wind,
+            desc[k], u[k], v[k],
+            integrator=integrator,
+        )
+        if landing is not None:
+            lats.append(landing[0])
+            lons.append(landing[1])
+
+        if progress is not None and not progress(k + 1):
+            raise _ChunkCancelled()
+
+    return np.asarray(lats, dtype=float), np.asarray(lons, dtype=float)
+
+
 # ============================================================
 # Monte Carlo principal
 # ============================================================
 
+def iter_monte_carlo(
+    n_runs: int,
+    alt0_m: float,
+    lat0_deg: float,
+    lon0_deg: float,
+    dt_s: float,
+    base_ascent: AscentProfile,
+    base_descent: DescentProfile,
+    base_wind: WindProfile,
+    sigma_desc_rel: float = 0.10,
+    sigma_wind_ms: float = 2.0,
+    seed: Optional[int] = None,
+    method: str = "batch",
+    n_workers: Optional[int] = 1,
+    chunk_size: int = BATCH_SIZE,
+    progress: Optional[ChunkProgress] = None,
+) -> Iterator[Tuple[int, List[ImpactSample]]]:
+    """
+    Version incrémentale de run_monte_carlo : je produis les impacts
+    lot par lot, dans l'ordre des lots, sous la forme
+    (nombre de runs du lot, impacts du lot).
+
+    Utile pour afficher la progression et le nuage au fil de l'eau.
+    Si le consommateur s'arrête en cours de route (annulation),
+    les lots pas encore démarrés dans le pool sont abandonnés.
+
+    progress : quand les lots tournent dans ce processus (un seul
+    processus utile, par exemple un seul lot), appelé en cours de lot avec
+    le nombre de runs du lot déjà posés. S'il renvoie False, le lot en
+    cours est abandonné et l'itération s'arrête. Sans effet sur les impacts.
+    """
+    if method not in MC_METHODS:
+        raise ValueError(f"Méthode Monte Carlo inconnue : {method}")
+    if chunk_size < 1:
+        raise ValueError("chunk_size doit être >= 1")
+
+    sizes = [
+        min(chunk_size, n_runs - start)
+        for start in range(0, n_runs, chunk_size)
+    ]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    tasks = [
+        _ChunkTask(
+            n_runs=n,
+            seed_seq=ss,
+            alt0_m=alt0_m,
+            lat0_deg=lat0_deg,
+            lon0_deg=lon0_deg,
+            dt_s=dt_s,
+            base_ascent=base_ascent,
+            base_descent=base_descent,
+            base_wind=base_wind,
+            sigma_desc_rel=sigma_desc_rel,
+            sigma_wind_ms=sigma_wind_ms,
+            method=method,
+        )
+        for n, ss in zip(sizes, seeds)
+    ]
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = max(1, min(n_workers, len(tasks)))
+
+    if n_workers == 1:
+        for task in tasks:
+            try:
+                lats, lons = _run_chunk(task, progress)
+            except _ChunkCancelled:
+                return
+            yield task.n_runs, _impacts_from_arrays(lat0_deg, lon0_deg, lats, lons)
+        return
+
+    pool = ProcessPoolExecutor(max_workers=n_workers)
+    futures = [pool.submit(_run_chunk, task) for task in tasks]
+    try:
+        # Lecture dans l'ordre de soumission → résultat déterministe
+        for task, fut in zip(tasks, futures):
+            lats, lons = fut.result()
+            yield task.n_runs, _impacts_from_arrays(lat0_deg, lon0_deg, lats, lons)
+    finally:
+        for fut in futures:
+            fut.cancel()
+        pool.shutdown(wait=True)
+
+
 def run_monte_carlo(
     n_runs: int,
     alt0_m: float,
@@ -143,6 +627,9 @@ def run_monte_carlo(
     sigma_wind_ms: float = 2.0,
     k_sigma: float = 2.4477,
     seed: Optional[int] = None,
+    method: str = "batch",
+    n_workers: Optional[int] = 1,
+    chunk_size: int = BATCH_SIZE,
 ) -> Tuple[List[ImpactSample], Optional[EllipseResult]]:
     """
     Je lance N simulations complètes avec perturbations aléatoires :
@@ -152,76 +639,48 @@ def run_monte_carlo(
     - simulation montée + descente complète
     - récupération du point d'impact sol
 
+    method :
+    - "batch" : tous les runs d'un lot intégrés ensemble sur des tableaux NumPy
+    - "loop"  : un simulate_flight par run (référence, plus lent)
+    - "analytic" : un run par vol, résolu couche par couche en forme fermée
+      (le pas dt_s n'a plus d'effet sur les impacts)
+    - "compiled" : boucle "loop" compilée par Numba (App.kernels) ;
+      sans Numba, repli sur "batch" (mêmes impacts)
+
+    Parallélisme :
+    - les n_runs sont découpés en lots de chunk_size runs
+    - n_workers > 1 → lots répartis sur un ProcessPoolExecutor
+      (None = tous les cœurs)
+
+    Reproductibilité : chaque lot a son propre flux aléatoire dérivé de
+    `seed` (SeedSequence.spawn). Pour un seed et un chunk_size donnés, les
+    impacts sont identiques quel que soit n_workers, et identiques entre
+    "batch", "loop" et "compiled" ("analytic" n'a pas l'erreur de pas
+    de temps).
+
     Je retourne :
     - la liste des impacts
     - l'ellipse de covariance associée (si possible)
     """
-    rng = random.Random(seed)
     impacts: List[ImpactSample] = []
 
-    for _ in range(n_runs):
-
-        # ----------------------------------------------------
-        # Bruit sur le profil de descente
-        # ----------------------------------------------------
-        f_desc = 1.0 + rng.gauss(0.0, sigma_desc_rel)
-
-        descent_profile = DescentProfile([
-            DescentPoint(
-                alt_m=p.alt_m,
-                descent_ms=max(0.3, p.descent_ms * f_desc),
-            )
-            for p in base_descent.points
-        ])
-
-        # ----------------------------------------------------
-        # Bruit sur le vent
-        # ----------------------------------------------------
-        wind_profile = WindProfile([
-            WindPoint(
-                alt_m=p.alt_m,
-                wind_u_ms=p.wind_u_ms + rng.gauss(0.0, sigma_wind_ms),
-                wind_v_ms=p.wind_v_ms + rng.gauss(0.0, sigma_wind_ms),
-            )
-            for p in base_wind.points
-        ])
-
-        # ----------------------------------------------------
-        # Simulation complète (montée + descente)
-        # ----------------------------------------------------
-        states = simulate_flight(
-            alt_start_m=0.0,
-            alt_burst_m=alt0_m,
-            lat0_deg=lat0_deg,
-            lon0_deg=lon0_deg,
-            dt_s=dt_s,
-            ascent_profile=base_ascent,
-            descent_profile=descent_profile,
-            wind_profile=wind_profile,
-            ff_start_alt=None,
-            free_fall_factor=1.0,
-        )
-
-        if not states:
-            continue
-
-        impact = states[-1]
-
-        x_m, y_m = _compute_local_xy(
-            lat0_deg=lat0_deg,
-            lon0_deg=lon0_deg,
-            lat_deg=impact.lat_deg,
-            lon_deg=impact.lon_deg,
-        )
-
-        impacts.append(
-            ImpactSample(
-                lat_deg=impact.lat_deg,
-                lon_deg=impact.lon_deg,
-                x_m=x_m,
-                y_m=y_m,
-            )
-        )
-
-    ellipse = _compute_ellipse_from_samples(impacts, k_sigma=k_sigma)
+    for _, chunk in iter_monte_carlo(
+        n_runs=n_runs,
+        alt0_m=alt0_m,
+        lat0_deg=lat0_deg,
+        lon0_deg=lon0_deg,
+        dt_s=dt_s,
+        base_ascent=base_ascent,
+        base_descent=base_descent,
+        base_wind=base_wind,
+        sigma_desc_rel=sigma_desc_rel,
+        sigma_wind_ms=sigma_wind_ms,
+        seed=seed,
+        method=method,
+        n_workers=n_workers,
+        chunk_size=chunk_size,
+    ):
+        impacts.extend(chunk)
+
+    ellipse = compute_ellipse_from_samples(impacts, k_sigma=k_sigma)
     return impacts, ellipse
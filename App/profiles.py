@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import csv
+import math
+from bisect import bisect_left
 from dataclasses import dataclass
 from typing import List, Tuple
 
+import numpy as np
+
 
 # ============================================================
 # Points unitaires (issus CSV / table UI / GFS)
@@ -46,11 +51,96 @@ class WindPoint:
     wind_v_ms: float
 
 
+# ============================================================
+# Moteur d'interpolation commun
+# ============================================================
+
+def _readonly(arr: np.ndarray) -> np.ndarray:
+    arr.flags.writeable = False
+    return arr
+
+
+class _PiecewiseLinearProfile:
+    """
+    Base commune des profils : tables altitude → valeurs, linéaires par morceaux.
+
+    Les points triés sont copiés une fois dans des tableaux contigus :
+    - listes Python pour value() (appelé à chaque pas, sans surcoût NumPy)
+    - tableaux NumPy en lecture seule pour values() et les moteurs vectorisés
+
+    La recherche du segment se fait par bisection (O(log n)), avec un indice
+    « dernier segment » mémorisé : pendant une montée ou une descente
+    l'altitude varie peu d'un pas à l'autre, donc le segment précédent
+    (ou son voisin) est presque toujours le bon.
+    """
+
+    def _init_tables(self, alts: List[float]) -> None:
+        self._alt_list = [float(a) for a in alts]
+        self._seg = 0
+
+        self.alts_m = _readonly(np.asarray(self._alt_list, dtype=float))
+
+    def _segment(self, alt_m: float) -> int:
+        """
+        Indice i du segment tel que alts[i] < alt_m <= alts[i + 1].
+
+        C'est le premier segment [p1, p2] contenant alt_m, exactement comme
+        le parcours linéaire historique (un point de cassure appartient au
+        segment du dessous).
+        """
+        alts = self._alt_list
+        i = self._seg
+
+        if alts[i] < alt_m <= alts[i + 1]:
+            return i
+
+        # Voisins directs : cas typique d'une marche monotone en altitude
+        if i + 2 < len(alts) and alts[i + 1] < alt_m <= alts[i + 2]:
+            i += 1
+        elif i > 0 and alts[i - 1] < alt_m <= alts[i]:
+            i -= 1
+        else:
+            i = bisect_left(alts, alt_m) - 1
+
+        self._seg = i
+        return i
+
+    def _interp_many(self, alts_m, table: np.ndarray) -> np.ndarray:
+        """
+        Interpolation vectorisée, identique bit à bit à value().
+        """
+        x = np.asarray(alts_m, dtype=float)
+        xp = self.alts_m
+
+        if len(xp) == 1:
+            return np.full(x.shape, table[0])
+
+        i = np.searchsorted(xp, x, side="left") - 1
+        np.clip(i, 0, len(xp) - 2, out=i)
+
+        x1 = xp[i]
+        x2 = xp[i + 1]
+        y1 = table[i]
+        y2 = table[i + 1]
+
+        # Les segments dégénérés (altitudes en double) ne sont jamais
+        # retenus hors des zones saturées ci-dessous
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = (x - x1) / (x2 - x1)
+            out = y1 + ratio * (y2 - y1)
+
+        # Saturation hors plage (+ NaN → dernière valeur), même priorité
+        # que value() : la borne basse l'emporte
+        out = np.where((x >= xp[-1]) | np.isnan(x), table[-1], out)
+        out = np.where(x <= xp[0], table[0], out)
+        return out
+
+
 # ============================================================
 # Profils interpolés
 # ============================================================
 
-class DescentProfile:
+class DescentProfile(_PiecewiseLinearProfile):
     """
     Profil de descente altitude → vitesse verticale (m/s).
 
@@ -65,29 +155,38 @@ class DescentProfile:
         # Je trie toujours par altitude croissante
         self.points = sorted(points, key=lambda p: p.alt_m)
 
+        self._init_tables([p.alt_m for p in self.points])
+        self._v = [p.descent_ms for p in self.points]
+        self.speeds_ms = _readonly(np.asarray(self._v, dtype=float))
+
     def value(self, alt_m: float) -> float:
         """
         Retourne la vitesse de descente interpolée à l'altitude donnée.
         """
+        alts = self._alt_list
+        vals = self._v
+
         # Sous le premier point → saturation basse
-        if alt_m <= self.points[0].alt_m:
-            return self.points[0].descent_ms
+        if alt_m <= alts[0]:
+            return vals[0]
 
-        # Au-dessus du dernier point → saturation haute
-        if alt_m >= self.points[-1].alt_m:
-            return self.points[-1].descent_ms
+        # Au-dessus du dernier point (ou altitude NaN) → saturation haute
+        if alt_m >= alts[-1] or alt_m != alt_m:
+            return vals[-1]
 
-        # Interpolation linéaire
-        for p1, p2 in zip(self.points[:-1], self.points[1:]):
-            if p1.alt_m <= alt_m <= p2.alt_m:
-                ratio = (alt_m - p1.alt_m) / (p2.alt_m - p1.alt_m)
-                return p1.descent_ms + ratio * (p2.descent_ms - p1.descent_ms)
+        # Interpolation linéaire sur le segment trouvé par bisection
+        i = self._segment(alt_m)
+        ratio = (alt_m - alts[i]) / (alts[i + 1] - alts[i])
+        return vals[i] + ratio * (vals[i + 1] - vals[i])
 
-        # Sécurité (ne devrait jamais arriver)
-        return self.points[-1].descent_ms
+    def values(self, alts_m: np.ndarray) -> np.ndarray:
+        """
+        Version vectorisée de value() sur un tableau d'altitudes.
+        """
+        return self._interp_many(alts_m, self.speeds_ms)
 
 
-class AscentProfile:
+class AscentProfile(_PiecewiseLinearProfile):
     """
     Profil de montée altitude → vitesse verticale (m/s).
 
@@ -101,25 +200,35 @@ class AscentProfile:
 
         self.points = sorted(points, key=lambda p: p.alt_m)
 
+        self._init_tables([p.alt_m for p in self.points])
+        self._v = [p.ascent_ms for p in self.points]
+        self.speeds_ms = _readonly(np.asarray(self._v, dtype=float))
+
     def value(self, alt_m: float) -> float:
         """
         Retourne la vitesse de montée interpolée à l'altitude donnée.
         """
-        if alt_m <= self.points[0].alt_m:
-            return self.points[0].ascent_ms
+        alts = self._alt_list
+        vals = self._v
+
+        if alt_m <= alts[0]:
+            return vals[0]
 
-        if alt_m >= self.points[-1].alt_m:
-            return self.points[-1].ascent_ms
+        if alt_m >= alts[-1] or alt_m != alt_m:
+            return vals[-1]
 
-        for p1, p2 in zip(self.points[:-1], self.points[1:]):
-            if p1.alt_m <= alt_m <= p2.alt_m:
-                ratio = (alt_m - p1.alt_m) / (p2.alt_m - p1.alt_m)
-                return p1.ascent_ms + ratio * (p2.ascent_ms - p1.ascent_ms)
+        i = self._segment(alt_m)
+        ratio = (alt_m - alts[i]) / (alts[i + 1] - alts[i])
+        return vals[i] + ratio * (vals[i + 1] - vals[i])
 
-        return self.points[-1].ascent_ms
+    def values(self, alts_m: np.ndarray) -> np.ndarray:
+        """
+        Version vectorisée de value() sur un tableau d'altitudes.
+        """
+        return self._interp_many(alts_m, self.speeds_ms)
 
 
-class WindProfile:
+class WindProfile(_PiecewiseLinearProfile):
     """
     Profil de vent altitude → (u, v) en m/s.
 
@@ -135,24 +244,216 @@ class WindProfile:
 
         self.points = sorted(points, key=lambda p: p.alt_m)
 
+        self._init_tables([p.alt_m for p in self.points])
+        self._u = [p.wind_u_ms for p in self.points]
+        self._w = [p.wind_v_ms for p in self.points]
+        self.u_ms = _readonly(np.asarray(self._u, dtype=float))
+        self.v_ms = _readonly(np.asarray(self._w, dtype=float))
+
     def value(self, alt_m: float) -> Tuple[float, float]:
         """
         Retourne (u, v) interpolés à l'altitude donnée.
         """
-        if alt_m <= self.points[0].alt_m:
-            p = self.points[0]
-            return p.wind_u_ms, p.wind_v_ms
+        alts = self._alt_list
+        us = self._u
+        vs = self._w
+
+        if alt_m <= alts[0]:
+            return us[0], vs[0]
+
+        if alt_m >= alts[-1] or alt_m != alt_m:
+            return us[-1], vs[-1]
+
+        i = self._segment(alt_m)
+        ratio = (alt_m - alts[i]) / (alts[i + 1] - alts[i])
+        u = us[i] + ratio * (us[i + 1] - us[i])
+        v = vs[i] + ratio * (vs[i + 1] - vs[i])
+        return u, v
+
+    def values(self, alts_m: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Version vectorisée de value() : retourne (u, v) pour chaque altitude.
+        """
+        return (
+            self._interp_many(alts_m, self.u_ms),
+            self._interp_many(alts_m, self.v_ms),
+        )
+
+
+# ============================================================
+# Champ de vent 4D
+# ============================================================
+
+class WindField:
+    """
+    Champ de vent (lat, lon, alt, t) → (u, v) en m/s.
+
+    Interface acceptée par simulate_flight / simulate_descent à la place
+    d'un WindProfile : le vent suit alors la position de la sonde pendant
+    la dérive (et l'heure de vol si le champ a plusieurs échéances).
+
+    sampler() retourne l'objet à interroger pendant un run : les champs
+    sur grille y gardent la maille courante en cache.
+    """
+
+    def value_at(
+        self,
+        lat_deg: float,
+        lon_deg: float,
+        alt_m: float,
+        t_s: float = 0.0,
+    ) -> Tuple[float, float]:
+        raise NotImplementedError
+
+    def sampler(self) -> "WindField":
+        return self
+
+
+# ============================================================
+# Effet de masse (profils livrés pour ~1 kg)
+# ============================================================
+
+def descent_with_mass(base_profile: DescentProfile, mass_kg: float) -> DescentProfile:
+    """
+    Profil de descente effectif avec :
+    - effet de masse progressif (réaliste)
+    - compatible Predictor
+    """
+    m = mass_kg
+    if m <= 0:
+        return base_profile
+
+    m_ref = 1.0
+    mass_factor = math.sqrt(m / m_ref)
+
+    points: List[DescentPoint] = []
+
+    for p in base_profile.points:
+        alt = p.alt_m
+
+        # 🔥 effet masse progressif (clé)
+        if alt > 20000:
+            alpha = 0.15      # presque pas d'effet en très haute altitude
+        elif alt < 3000:
+            alpha = 1.0      # plein effet proche du sol
+        else:
+            alpha = 1.0 - (20000 - alt) / (20000 - 3000)
+
+        factor = 1.0 + alpha * (mass_factor - 1.0)
+        factor = max(0.85, min(factor, 1.5))
+
+        v = p.descent_ms * factor
+        v = max(v, 0.5)  # sécurité
+
+        points.append(
+            DescentPoint(
+                alt_m=alt,
+                descent_ms=v,
+            )
+        )
+
+    return DescentProfile(points)
+
+
+def ascent_with_mass(base_profile: AscentProfile, mass_kg: float) -> AscentProfile:
+    """
+    Profil d'ascension avec effet de masse progressif (réaliste).
+    """
+    m = mass_kg
+    if m <= 0:
+        return base_profile
+
+    m_ref = 1.0
+    mass_factor = math.sqrt(m_ref / m)
+
+    points: List[AscentPoint] = []
+
+    for p in base_profile.points:
+        alt = p.alt_m
+
+        # 🔥 effet masse progressif
+        if alt > 20000:
+            alpha = 0.2    # quasi nul en haute altitude
+        elif alt < 5000:
+            alpha = 1.0
+        else:
+            alpha = 1.0 - (alt - 5000) / (20000 - 5000)
 
-        if alt_m >= self.points[-1].alt_m:
-            p = self.points[-1]
-            return p.wind_u_ms, p.wind_v_ms
+        factor = 1.0 + alpha * (mass_factor - 1.0)
 
-        for p1, p2 in zip(self.points[:-1], self.points[1:]):
-            if p1.alt_m <= alt_m <= p2.alt_m:
-                ratio = (alt_m - p1.alt_m) / (p2.alt_m - p1.alt_m)
-                u = p1.wind_u_ms + ratio * (p2.wind_u_ms - p1.wind_u_ms)
-                v = p1.wind_v_ms + ratio * (p2.wind_v_ms - p1.wind_v_ms)
-                return u, v
+        v = p.ascent_ms * factor
+        v = max(v, 0.3)
 
-        p = self.points[-1]
-        return p.wind_u_ms, p.wind_v_ms
+        points.append(
+            AscentPoint(
+                alt_m=alt,
+                ascent_ms=v,
+            )
+        )
+
+    return AscentProfile(points)
+
+
+# ============================================================
+# Lecture CSV (séparateur « ; », virgule décimale acceptée)
+# ============================================================
+
+def _read_csv_columns(path: str, wanted: List[List[str]]) -> List[List[float]]:
+    """
+    Lit les colonnes demandées d'un CSV.
+
+    wanted : pour chaque colonne, la liste des morceaux de nom acceptés
+    (noms tolérants, insensibles à la casse). Retourne une ligne par point.
+    """
+    rows: List[List[float]] = []
+
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f, delimiter=";")
+        columns = {name.lower(): name for name in (reader.fieldnames or [])}
+
+        def find_col(keys):
+            for k in keys:
+                for c in columns:
+                    if k in c:
+                        return columns[c]
+            raise ValueError(f"Colonne manquante dans {path}: {keys}")
+
+        cols = [find_col(keys) for keys in wanted]
+
+        for row in reader:
+            rows.append([float(row[c].replace(",", ".")) for c in cols])
+
+    return rows
+
+
+def read_ascent_csv(path: str) -> List[AscentPoint]:
+    """
+    Lit un CSV de profil ascendant.
+    Colonnes attendues (noms tolérants) :
+    - altitude : alt, altitude
+    - vitesse montée : ascent, montée, vit, vitesse
+    """
+    rows = _read_csv_columns(path, [["alt"], ["ascent", "mont", "vit", "vitesse"]])
+    if not rows:
+        raise ValueError("Aucun point lu dans le CSV d'ascension")
+    return [AscentPoint(alt_m=alt, ascent_ms=asc) for alt, asc in rows]
+
+
+def read_descent_csv(path: str) -> List[DescentPoint]:
+    """
+    Lit un CSV de profil de descente (alt ; vitesse de descente).
+    """
+    rows = _read_csv_columns(path, [["alt"], ["descent", "vit", "vitesse"]])
+    if not rows:
+        raise ValueError("Aucun point lu dans le CSV de descente")
+    return [DescentPoint(alt_m=alt, descent_ms=desc) for alt, desc in rows]
+
+
+def read_wind_csv(path: str) -> List[WindPoint]:
+    """
+    Lit un CSV de profil de vent (alt ; u ; v).
+    """
+    rows = _read_csv_columns(path, [["alt"], ["u"], ["v"]])
+    if not rows:
+        raise ValueError("Aucun point lu dans le CSV de vent")
+    return [WindPoint(alt_m=alt, wind_u_ms=u, wind_v_ms=v) for alt, u, v in rows]
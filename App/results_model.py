@@ -0,0 +1,117 @@
+"""
+results_model.py
+
+Modèle Qt du tableau « Résultats », branché directement sur les colonnes
+NumPy de la trajectoire.
+
+Ici je gère :
+- les colonnes affichées (libellé, colonne de Trajectory, format)
+- le formatage des cellules à la demande dans data() : seules les lignes
+  visibles sont formatées, quelle que soit la taille de la trajectoire
+- la couleur par phase (montée cyan / descente jaune) via ForegroundRole
+
+Aucune copie : le modèle garde des vues sur les tableaux de la Trajectory.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, QObject, Qt
+from PyQt5.QtGui import QBrush
+
+from App.simulation import PHASE_ASCENT, PHASE_NAMES, Trajectory
+
+# (libellé, colonne de Trajectory, format) ; colonne None = phase
+RESULT_COLUMNS = (
+    ("Temps écoulé (s)", "t_s", ".1f"),
+    ("Phase", None, None),
+    ("Alt (m)", "alt_m", ".0f"),
+    ("Lat (°)", "lat_deg", ".5f"),
+    ("Lon (°)", "lon_deg", ".5f"),
+    ("Vitesse (m/s)", "descent_ms", ".2f"),
+    ("u (m/s)", "wind_u_ms", ".2f"),
+    ("v (m/s)", "wind_v_ms", ".2f"),
+)
+
+# Vitesse verticale lisible : valeur absolue (la montée est stockée < 0)
+_ABS_COLUMNS = {"descent_ms"}
+
+_HEADER_TOOLTIPS = {0: "Temps depuis le début de la descente."}
+
+_ALIGN = int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+
+
+class TrajectoryTableModel(QAbstractTableModel):
+    """
+    Une ligne par état enregistré, colonnes de RESULT_COLUMNS.
+    """
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._traj = Trajectory()
+        self._columns = []
+        self._phase = self._traj.phase_code
+
+        self._ascent_brush = QBrush(Qt.GlobalColor.cyan)
+        self._descent_brush = QBrush(Qt.GlobalColor.yellow)
+
+    def set_trajectory(self, traj: Trajectory):
+        """
+        Remplace la trajectoire affichée (reset du modèle, pas de copie).
+        """
+        self.beginResetModel()
+        self._traj = traj
+        self._columns = [
+            None if name is None else traj.column(name)
+            for _, name, _ in RESULT_COLUMNS
+        ]
+        self._phase = traj.phase_code
+        self.endResetModel()
+
+    @property
+    def trajectory(self) -> Trajectory:
+        return self._traj
+
+    # =====================================================
+    # API QAbstractTableModel
+    # =====================================================
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._traj)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(RESULT_COLUMNS)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            _, name, fmt = RESULT_COLUMNS[col]
+            if name is None:
+                return PHASE_NAMES[self._phase[row]]
+            value = float(self._columns[col][row])
+            if name in _ABS_COLUMNS:
+                value = abs(value)
+            return format(value, fmt)
+
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return _ALIGN
+
+        # Mise en couleur par phase (lisibilité ++)
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if self._phase[row] == PHASE_ASCENT:
+                return self._ascent_brush
+            return self._descent_brush
+
+        return None
+
+    def headerData(self, section: int, orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return RESULT_COLUMNS[section][0]
+            if role == Qt.ItemDataRole.ToolTipRole:
+                return _HEADER_TOOLTIPS.get(section)
+            return None
+        return super().headerData(section, orientation, role)
@@ -0,0 +1,117 @@
+"""
+simplify.py
+
+Simplification de polylignes (Douglas–Peucker) pour l'affichage.
+
+Ici je gère :
+- douglas_peucker : masque des points gardés pour une polyligne N-D
+- trajectory_points_m : trajectoire → points en mètres (Est, Nord,
+  altitude, temps × TIME_SCALE_MS)
+- display_mask : points d'une Trajectory à tracer, phase par phase
+
+Seules les vues (carte, graphes 2D et 3D) utilisent la version simplifiée.
+Le tableau des résultats, l'export et le survol des graphes gardent tous
+les points.
+
+La tolérance est une distance au sol/en altitude, en mètres, et non en
+pixels : la carte et les barres d'outils Matplotlib zooment bien au-delà
+de l'échelle initiale, et l'écart reste ainsi borné à tous les zooms.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from App.simulation import EARTH_RADIUS_M, Trajectory
+
+# Écart max entre la trajectoire tracée et la trajectoire complète (m)
+DISPLAY_TOLERANCE_M = 2.0
+
+# Poids du temps dans la distance (m par s) : 1 s d'écart compte comme
+# 5 m, pour que les courbes en fonction du temps restent fidèles
+TIME_SCALE_MS = 5.0
+
+
+def douglas_peucker(points: np.ndarray, tol: float) -> np.ndarray:
+    """
+    Douglas–Peucker sur une polyligne (n, d) : masque booléen des points
+    gardés. Le premier et le dernier point sont toujours gardés ; tout
+    point retiré est à moins de tol du segment qui le remplace.
+
+    Pile de segments plutôt que récursion ; la distance de tous les points
+    d'un segment est calculée d'un coup (NumPy).
+    """
+    points = np.asarray(points, dtype=float)
+    n = points.shape[0]
+    keep = np.zeros(n, dtype=bool)
+    if n == 0:
+        return keep
+
+    keep[0] = keep[-1] = True
+    tol2 = tol * tol
+    stack = [(0, n - 1)]
+
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+
+        a = points[first]
+        seg = points[last] - a
+        rel = points[first + 1:last] - a
+
+        # Distance² au segment [a, b] (projection bornée à ses extrémités)
+        seg2 = float(seg @ seg)
+        if seg2 > 0.0:
+            u = np.clip((rel @ seg) / seg2, 0.0, 1.0)
+            rel = rel - u[:, None] * seg
+        d2 = np.einsum("ij,ij->i", rel, rel)
+
+        k = int(d2.argmax())
+        if d2[k] > tol2:
+            mid = first + 1 + k
+            keep[mid] = True
+            stack.append((first, mid))
+            stack.append((mid, last))
+
+    return keep
+
+
+def trajectory_points_m(traj: Trajectory, time_scale_ms: float = TIME_SCALE_MS) -> np.ndarray:
+    """
+    (n, 4) : Est, Nord (m, repère local centré sur le premier point),
+    altitude (m) et temps × time_scale_ms.
+    """
+    lat0 = float(traj.lat_deg[0])
+    lon0 = float(traj.lon_deg[0])
+    cos_lat0 = math.cos(math.radians(lat0))
+
+    x = EARTH_RADIUS_M * np.radians(traj.lon_deg - lon0) * cos_lat0
+    y = EARTH_RADIUS_M * np.radians(traj.lat_deg - lat0)
+    return np.column_stack((x, y, traj.alt_m, traj.t_s * time_scale_ms))
+
+
+def display_mask(traj: Trajectory, tol_m: float = DISPLAY_TOLERANCE_M) -> np.ndarray:
+    """
+    Masque des points de traj à tracer. Chaque phase (montée, descente)
+    est simplifiée à part : ses extrémités (lancement, burst, impact)
+    restent dans le tracé.
+    """
+    n = len(traj)
+    if n == 0 or tol_m <= 0.0:
+        return np.ones(n, dtype=bool)
+
+    points = trajectory_points_m(traj)
+    phase = traj.phase_code
+
+    # Bornes des séquences de même phase
+    bounds = np.flatnonzero(np.diff(phase)) + 1
+    starts = np.concatenate(([0], bounds))
+    ends = np.concatenate((bounds, [n]))
+
+    keep = np.empty(n, dtype=bool)
+    for s, e in zip(starts.tolist(), ends.tolist()):
+        keep[s:e] = douglas_peucker(points[s:e], tol_m)
+    return keep
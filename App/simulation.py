@@ -17,9 +17,11 @@ from __future__ import annotations
 
 import math
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
-from App.profiles import DescentProfile, AscentProfile, WindProfile
+import numpy as np
+
+from App.profiles import DescentProfile, AscentProfile, WindField, WindProfile
 
 # Rayon moyen de la Terre (m)
 EARTH_RADIUS_M = 6_371_000.0
@@ -46,6 +48,241 @@ class State:
     phase: str = "DESCENT"  # ASCENT ou DESCENT
 
 
+@dataclass
+class FlightSummary:
+    """
+    Résumé d'un vol, calculé pendant l'intégration quel que soit
+    le mode d'enregistrement (voir `record` de simulate_flight).
+
+    Les champs burst_* valent None pour une descente seule.
+    """
+    impact_lat_deg: float
+    impact_lon_deg: float
+    flight_time_s: float       # durée totale jusqu'au sol (s)
+    max_drift_m: float         # éloignement horizontal max du départ (m)
+    burst_t_s: Optional[float] = None
+    burst_alt_m: Optional[float] = None
+    burst_lat_deg: Optional[float] = None
+    burst_lon_deg: Optional[float] = None
+
+
+# ============================================================
+# TRAJECTOIRE (stockage en colonnes)
+# ============================================================
+
+# Codes de phase stockés dans la colonne `phase_code`
+PHASE_ASCENT = 0
+PHASE_DESCENT = 1
+PHASE_NAMES = ("ASCENT", "DESCENT")
+
+
+class Trajectory:
+    """
+    Trajectoire stockée en colonnes NumPy préallouées.
+
+    Une colonne par champ de State (t_s, alt_m, lat_deg, lon_deg,
+    descent_ms, wind_u_ms, wind_v_ms) + un code de phase (int8).
+    La capacité double quand elle est atteinte : l'ajout reste en O(1)
+    amorti, sans un objet Python par pas de temps.
+
+    Compatibilité : len(), indexation et itération donnent des State,
+    comme l'ancienne List[State]. Les vues (tracés, export) lisent
+    directement les colonnes (traj.alt_m, traj.lat_deg…), sans conversion.
+
+    `summary` porte le résumé du vol (FlightSummary) quand la trajectoire
+    sort d'un simulateur.
+    """
+
+    COLUMNS = (
+        "t_s",
+        "alt_m",
+        "lat_deg",
+        "lon_deg",
+        "descent_ms",
+        "wind_u_ms",
+        "wind_v_ms",
+    )
+
+    def __init__(self, capacity: int = 1024):
+        capacity = max(int(capacity), 1)
+        self._data = np.empty((len(self.COLUMNS), capacity))
+        self._phase = np.empty(capacity, dtype=np.int8)
+        self._n = 0
+        self.summary: Optional[FlightSummary] = None
+
+    # ------------------------
+    # Construction
+    # ------------------------
+    def append(
+        self,
+        t_s: float,
+        alt_m: float,
+        lat_deg: float,
+        lon_deg: float,
+        descent_ms: float,
+        wind_u_ms: float,
+        wind_v_ms: float,
+        phase_code: int,
+    ) -> None:
+        n = self._n
+        if n == self._phase.shape[0]:
+            self._grow()
+
+        self._data[:, n] = (t_s, alt_m, lat_deg, lon_deg, descent_ms, wind_u_ms, wind_v_ms)
+        self._phase[n] = phase_code
+        self._n = n + 1
+
+    def _grow(self) -> None:
+        capacity = 2 * self._phase.shape[0]
+
+        data = np.empty((len(self.COLUMNS), capacity))
+        data[:, :self._n] = self._data[:, :self._n]
+        phase = np.empty(capacity, dtype=np.int8)
+        phase[:self._n] = self._phase[:self._n]
+
+        self._data = data
+        self._phase = phase
+
+    @classmethod
+    def from_columns(
+        cls,
+        columns: Dict[str, np.ndarray],
+        phase_code: np.ndarray,
+    ) -> "Trajectory":
+        """
+        Construit une trajectoire à partir de colonnes déjà calculées.
+        """
+        n = len(phase_code)
+        traj = cls(capacity=n)
+        for k, name in enumerate(cls.COLUMNS):
+            traj._data[k, :n] = columns[name]
+        traj._phase[:n] = phase_code
+        traj._n = n
+        return traj
+
+    # ------------------------
+    # Colonnes (vues, sans copie)
+    # ------------------------
+    def column(self, name: str) -> np.ndarray:
+        return self._data[self.COLUMNS.index(name), :self._n]
+
+    @property
+    def t_s(self) -> np.ndarray:
+        return self._data[0, :self._n]
+
+    @property
+    def alt_m(self) -> np.ndarray:
+        return self._data[1, :self._n]
+
+    @property
+    def lat_deg(self) -> np.ndarray:
+        return self._data[2, :self._n]
+
+    @property
+    def lon_deg(self) -> np.ndarray:
+        return self._data[3, :self._n]
+
+    @property
+    def descent_ms(self) -> np.ndarray:
+        return self._data[4, :self._n]
+
+    @property
+    def wind_u_ms(self) -> np.ndarray:
+        return self._data[5, :self._n]
+
+    @property
+    def wind_v_ms(self) -> np.ndarray:
+        return self._data[6, :self._n]
+
+    @property
+    def phase_code(self) -> np.ndarray:
+        return self._phase[:self._n]
+
+    @property
+    def ascent_mask(self) -> np.ndarray:
+        return self.phase_code == PHASE_ASCENT
+
+    @property
+    def descent_mask(self) -> np.ndarray:
+        return self.phase_code == PHASE_DESCENT
+
+    # ------------------------
+    # Vue « liste de State »
+    # ------------------------
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, idx: Union[int, slice]) -> Union[State, "Trajectory"]:
+        if isinstance(idx, slice):
+            sel = np.arange(self._n)[idx]
+            return Trajectory.from_columns(
+                {name: self._data[k, sel] for k, name in enumerate(self.COLUMNS)},
+                self._phase[sel],
+            )
+
+        if idx < 0:
+            idx += self._n
+        if not 0 <= idx < self._n:
+            raise IndexError("indice de trajectoire hors limites")
+
+        row = self._data[:, idx].tolist()
+        return State(*row, phase=PHASE_NAMES[self._phase[idx]])
+
+    def __iter__(self) -> Iterator[State]:
+        names = PHASE_NAMES
+        rows = self._data[:, :self._n].T.tolist()
+        for row, code in zip(rows, self._phase[:self._n].tolist()):
+            yield State(*row, phase=names[code])
+
+    def to_states(self) -> List[State]:
+        return list(self)
+
+
+# ============================================================
+# MODES D'ENREGISTREMENT
+# ============================================================
+
+RECORD_MODES = ("full", "every_n", "impact")
+
+
+def _record_stride(record: str, record_every: int) -> int:
+    """
+    Pas d'enregistrement des états :
+    - "full"    → 1 (chaque pas)
+    - "every_n" → record_every (un pas sur n, + le dernier)
+    - "impact"  → 0 (dernier état seulement)
+    """
+    if record == "full":
+        return 1
+    if record == "every_n":
+        if record_every < 1:
+            raise ValueError("record_every doit être >= 1")
+        return record_every
+    if record == "impact":
+        return 0
+    raise ValueError(f"Mode d'enregistrement inconnu : {record}")
+
+
+def _wind_sampler(
+    wind_profile: Union[WindProfile, WindField],
+    integrator: str,
+) -> Optional[WindField]:
+    """
+    Échantillonneur du run si le vent est un WindField (None sinon).
+
+    Seul le schéma Euler sait suivre un vent qui dépend de la position :
+    les autres intégrateurs supposent un vent linéaire par couche d'altitude.
+    """
+    if not isinstance(wind_profile, WindField):
+        return None
+    if integrator != "euler":
+        raise ValueError(
+            f"L'intégrateur {integrator} demande un profil de vent vertical ; "
+            "un champ de vent 4D s'utilise avec \"euler\"."
+        )
+    return wind_profile.sampler()
+
+
 # ============================================================
 # DESCENTE SEULE
 # ============================================================
@@ -56,9 +293,14 @@ def simulate_descent(
     lon0_deg: float,
     dt_s: float,
     descent_profile: DescentProfile,
-    wind_profile: WindProfile,
+    wind_profile: Union[WindProfile, WindField],
     max_steps: int = 40000,
-) -> List[State]:
+    record: str = "full",
+    record_every: int = 10,
+    integrator: str = "euler",
+    tol_m: float = 1.0,
+    compiled: bool = False,
+) -> Trajectory:
     """
     Simule uniquement une descente depuis une altitude initiale.
 
@@ -67,9 +309,39 @@ def simulate_descent(
     - on connaît déjà l’altitude de largage
 
     Intégration simple, robuste, avec vent dépendant de l’altitude.
+
+    record     : "full" | "every_n" | "impact" (voir simulate_flight).
+    integrator : "euler" | "rk4" | "rk45" | "analytic" (voir simulate_flight).
+    compiled   : noyau Numba pour "euler" (voir simulate_flight).
+
+    wind_profile peut être un WindField (vent 4D, voir simulate_flight).
     """
+    wind_field = _wind_sampler(wind_profile, integrator)
+
+    if integrator != "euler":
+        # Import local : App.integrators dépend de ce module
+        from App.integrators import integrate_descent
+        return integrate_descent(
+            alt0_m, lat0_deg, lon0_deg, dt_s,
+            descent_profile, wind_profile,
+            integrator=integrator, tol_m=tol_m, max_steps=max_steps,
+            record=record, record_every=record_every,
+        )
 
-    states: List[State] = []
+    if compiled and wind_field is None:
+        # Import local : Numba est long à importer, et App.kernels
+        # dépend de ce module
+        from App import kernels
+        if kernels.NUMBA_AVAILABLE:
+            return kernels.simulate_descent_compiled(
+                alt0_m, lat0_deg, lon0_deg, dt_s,
+                descent_profile, wind_profile,
+                max_steps=max_steps, record=record, record_every=record_every,
+            )
+
+    stride = _record_stride(record, record_every)
+
+    states = Trajectory(capacity=1024 if stride else 1)
 
     # Temps et position initiale
     t = 0.0
@@ -77,7 +349,16 @@ def simulate_descent(
     lat = math.radians(lat0_deg)
     lon = math.radians(lon0_deg)
 
-    for _ in range(max_steps):
+    # Suivi de la dérive max (repère local plat)
+    lat0 = lat
+    lon0 = lon
+    cos_lat0 = math.cos(lat0)
+    max_d2 = 0.0
+
+    row: Optional[Tuple] = None
+    recorded = False
+
+    for step in range(max_steps):
 
         # Fin de simulation au sol
         if alt <= 0.0:
@@ -98,7 +379,12 @@ def simulate_descent(
         # Vent (milieu de couche)
         # ------------------------
         alt_mid = alt - 0.5 * v_desc * dt
-        wind_u, wind_v = wind_profile.value(alt_mid)
+        if wind_field is None:
+            wind_u, wind_v = wind_profile.value(alt_mid)
+        else:
+            wind_u, wind_v = wind_field.value_at(
+                math.degrees(lat), math.degrees(lon), alt_mid, t + 0.5 * dt
+            )
 
         # ------------------------
         # Intégration position
@@ -107,22 +393,39 @@ def simulate_descent(
         lat += (wind_v * dt) / EARTH_RADIUS_M
         lon += (wind_u * dt) / (EARTH_RADIUS_M * math.cos(lat))
 
+        dx = (lon - lon0) * cos_lat0
+        dy = lat - lat0
+        d2 = dx * dx + dy * dy
+        if d2 > max_d2:
+            max_d2 = d2
+
         # Sauvegarde de l’état
-        states.append(
-            State(
-                t_s=t,
-                alt_m=max(alt, 0.0),
-                lat_deg=math.degrees(lat),
-                lon_deg=math.degrees(lon),
-                descent_ms=v_desc,
-                wind_u_ms=wind_u,
-                wind_v_ms=wind_v,
-                phase="DESCENT",
-            )
+        row = (
+            t,
+            max(alt, 0.0),
+            math.degrees(lat),
+            math.degrees(lon),
+            v_desc,
+            wind_u,
+            wind_v,
+            PHASE_DESCENT,
         )
+        recorded = stride != 0 and step % stride == 0
+        if recorded:
+            states.append(*row)
 
         t += dt
 
+    # Le dernier état (impact) est toujours conservé
+    if row is not None and not recorded:
+        states.append(*row)
+
+    states.summary = FlightSummary(
+        impact_lat_deg=math.degrees(lat),
+        impact_lon_deg=math.degrees(lon),
+        flight_time_s=t,
+        max_drift_m=EARTH_RADIUS_M * math.sqrt(max_d2),
+    )
     return states
 
 
@@ -138,11 +441,16 @@ def simulate_flight(
     dt_s: float,
     ascent_profile: AscentProfile,
     descent_profile: DescentProfile,
-    wind_profile: WindProfile,
+    wind_profile: Union[WindProfile, WindField],
     ff_start_alt: float | None,
     free_fall_factor: float,
     max_steps: int = 40000,
-) -> List[State]:
+    record: str = "full",
+    record_every: int = 10,
+    integrator: str = "euler",
+    tol_m: float = 1.0,
+    compiled: bool = False,
+) -> Trajectory:
     """
     Simule un vol complet de ballon :
 
@@ -152,9 +460,61 @@ def simulate_flight(
 
     Le modèle est volontairement simple mais stable,
     et cohérent avec les données météo (GFS).
+
+    record :
+    - "full"    : un état par pas de temps (défaut)
+    - "every_n" : un état tous les record_every pas (+ le dernier)
+    - "impact"  : dernier état seulement (Monte Carlo) — mémoire constante
+
+    Dans tous les cas, traj.summary donne impact, burst, durée de vol
+    et dérive max.
+
+    integrator :
+    - "euler" : schéma historique à pas fixe dt_s, vent au milieu du pas
+    - "rk4"   : Runge-Kutta 4 à pas fixe dt_s
+    - "rk45"  : Runge-Kutta adaptatif, pas initial dt_s, erreur < tol_m (m)
+    - "analytic" : forme fermée couche par couche, dt_s ne règle que
+      l'échantillonnage (avec record="impact" : quelques microsecondes
+      par couche)
+    Ces intégrateurs avancent couche par couche (voir App.integrators).
+
+    compiled : avec "euler", boucle compilée par Numba (App.kernels),
+    identique au bit près à la boucle Python. Sans Numba installé, la
+    boucle Python est utilisée.
+
+    wind_profile peut aussi être un WindField (ex. GfsWindField) : le vent
+    est alors pris à la position (lat, lon) et au temps de chaque pas
+    (milieu du pas), et plus seulement à l'altitude. Réservé à "euler"
+    (noyau Numba non utilisé dans ce cas).
     """
+    wind_field = _wind_sampler(wind_profile, integrator)
+
+    if integrator != "euler":
+        # Import local : App.integrators dépend de ce module
+        from App.integrators import integrate_flight
+        return integrate_flight(
+            alt_start_m, alt_burst_m, lat0_deg, lon0_deg, dt_s,
+            ascent_profile, descent_profile, wind_profile,
+            ff_start_alt, free_fall_factor,
+            integrator=integrator, tol_m=tol_m, max_steps=max_steps,
+            record=record, record_every=record_every,
+        )
+
+    if compiled and wind_field is None:
+        # Import local : Numba est long à importer, et App.kernels
+        # dépend de ce module
+        from App import kernels
+        if kernels.NUMBA_AVAILABLE:
+            return kernels.simulate_flight_compiled(
+                alt_start_m, alt_burst_m, lat0_deg, lon0_deg, dt_s,
+                ascent_profile, descent_profile, wind_profile,
+                ff_start_alt, free_fall_factor,
+                max_steps=max_steps, record=record, record_every=record_every,
+            )
+
+    stride = _record_stride(record, record_every)
 
-    states: List[State] = []
+    states = Trajectory(capacity=1024 if stride else 1)
 
     # Conditions initiales
     t = 0.0
@@ -165,7 +525,17 @@ def simulate_flight(
     phase = "ASCENT"
     rupture = False
 
-    for _ in range(max_steps):
+    # Suivi de la dérive max (repère local plat) et du burst
+    lat0 = lat
+    lon0 = lon
+    cos_lat0 = math.cos(lat0)
+    max_d2 = 0.0
+    burst: Optional[Tuple[float, float, float, float]] = None
+
+    row: Optional[Tuple] = None
+    recorded = False
+
+    for step in range(max_steps):
 
         # ======================
         # Détection rupture ballon
@@ -173,6 +543,8 @@ def simulate_flight(
         if ff_start_alt is not None and not rupture:
             if alt >= ff_start_alt:
                 rupture = True
+                if phase == "ASCENT":
+                    burst = (t, alt, lat, lon)
                 phase = "DESCENT"
 
         # ======================
@@ -217,26 +589,42 @@ def simulate_flight(
         # ======================
         # Vent (milieu de couche)
         # ======================
-        wind_u, wind_v = wind_profile.value(alt_mid)
+        if wind_field is None:
+            wind_u, wind_v = wind_profile.value(alt_mid)
+        else:
+            wind_u, wind_v = wind_field.value_at(
+                math.degrees(lat), math.degrees(lon), alt_mid, t + 0.5 * dt
+            )
 
         lat += (wind_v * dt) / EARTH_RADIUS_M
         lon += (wind_u * dt) / (EARTH_RADIUS_M * math.cos(lat))
 
+        dx = (lon - lon0) * cos_lat0
+        dy = lat - lat0
+        d2 = dx * dx + dy * dy
+        if d2 > max_d2:
+            max_d2 = d2
+
         # ======================
         # Sauvegarde état
         # ======================
-        states.append(
-            State(
-                t_s=t,
-                alt_m=alt,
-                lat_deg=math.degrees(lat),
-                lon_deg=math.degrees(lon),
-                descent_ms=(-v_vert if phase == "ASCENT" else v_vert),
-                wind_u_ms=wind_u,
-                wind_v_ms=wind_v,
-                phase=phase,
+        if phase == "ASCENT":
+            row = (
+                t, alt, math.degrees(lat), math.degrees(lon),
+                -v_vert, wind_u, wind_v, PHASE_ASCENT,
             )
-        )
+        else:
+            row = (
+                t, alt, math.degrees(lat), math.degrees(lon),
+                v_vert, wind_u, wind_v, PHASE_DESCENT,
+            )
+            if burst is None:
+                # Pas de burst : fin de montée atteinte sur ce pas
+                burst = (t + dt, alt_next, lat, lon)
+
+        recorded = stride != 0 and step % stride == 0
+        if recorded:
+            states.append(*row)
 
         t += dt
         alt = alt_next
@@ -244,4 +632,21 @@ def simulate_flight(
         if phase == "DESCENT" and alt <= 0.0:
             break
 
+    # Le dernier état (impact) est toujours conservé
+    if row is not None and not recorded:
+        states.append(*row)
+
+    summary = FlightSummary(
+        impact_lat_deg=math.degrees(lat),
+        impact_lon_deg=math.degrees(lon),
+        flight_time_s=t,
+        max_drift_m=EARTH_RADIUS_M * math.sqrt(max_d2),
+    )
+    if burst is not None:
+        summary.burst_t_s = burst[0]
+        summary.burst_alt_m = float(burst[1])
+        summary.burst_lat_deg = math.degrees(burst[2])
+        summary.burst_lon_deg = math.degrees(burst[3])
+
+    states.summary = summary
     return states
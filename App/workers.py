@@ -0,0 +1,163 @@
+"""
+workers.py
+
+Exécution des calculs longs hors du thread de l'interface Qt.
+
+Ici je gère :
+- un worker générique pour une simulation (simulate_flight / simulate_descent)
+- un worker Monte Carlo qui remonte les impacts lot par lot
+- le démarrage d'un worker dans son propre QThread
+
+Les workers ne touchent jamais aux widgets : tout passe par des signaux,
+livrés dans le thread de la fenêtre (connexions Qt « queued »).
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, List
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+from App.montecarlo import (
+    ImpactSample,
+    compute_ellipse_from_samples,
+    iter_monte_carlo,
+)
+
+
+# ============================================================
+# Base commune
+# ============================================================
+
+class _Worker(QObject):
+    """
+    Base des workers : annulation coopérative + signaux communs.
+    """
+
+    failed = pyqtSignal(str)
+    done = pyqtSignal()   # émis en dernier, dans tous les cas
+
+    def __init__(self):
+        super().__init__()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """
+        Demande l'arrêt. Appelable depuis le thread de l'interface.
+        """
+        self._cancel.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def run(self):
+        try:
+            self._run()
+        except Exception as e:
+            if not self.is_cancelled:
+                self.failed.emit(str(e))
+        finally:
+            self.done.emit()
+
+    def _run(self):
+        raise NotImplementedError
+
+
+# ============================================================
+# Simulation unique
+# ============================================================
+
+class SimulationWorker(_Worker):
+    """
+    Lance une fonction de simulation avec ses arguments.
+
+    Une simulation unique n'est pas interruptible : en cas d'annulation,
+    son résultat est simplement ignoré.
+    """
+
+    finished = pyqtSignal(object)   # trajectoire
+
+    def __init__(self, func: Callable[..., Any], kwargs: Dict[str, Any]):
+        super().__init__()
+        self._func = func
+        self._kwargs = kwargs
+
+    def _run(self):
+        states = self._func(**self._kwargs)
+        if not self.is_cancelled:
+            self.finished.emit(states)
+
+
+# ============================================================
+# Monte Carlo
+# ============================================================
+
+class MonteCarloWorker(_Worker):
+    """
+    Lance iter_monte_carlo et remonte chaque lot terminé.
+
+    L'annulation est prise en compte entre deux lots, et aussi en cours de
+    lot quand les lots tournent dans ce thread (cas d'un lot unique) ; la
+    progression avance alors au fil des runs posés. Les impacts déjà
+    calculés restent livrés (finished reçoit alors un résultat partiel).
+    """
+
+    progress = pyqtSignal(int, int)        # runs terminés, runs demandés
+    batch_ready = pyqtSignal(object)       # List[ImpactSample] du lot
+    finished = pyqtSignal(object, object)  # impacts, ellipse (ou None)
+
+    def __init__(self, k_sigma: float, kwargs: Dict[str, Any]):
+        super().__init__()
+        self._k_sigma = k_sigma
+        self._kwargs = kwargs
+
+    def _run(self):
+        n_runs = self._kwargs["n_runs"]
+        impacts: List[ImpactSample] = []
+        done_runs = 0
+
+        def in_chunk(landed: int) -> bool:
+            self.progress.emit(done_runs + landed, n_runs)
+            return not self.is_cancelled
+
+        chunks = iter_monte_carlo(progress=in_chunk, **self._kwargs)
+        try:
+            for n, chunk in chunks:
+                if self.is_cancelled:
+                    break
+
+                impacts.extend(chunk)
+                done_runs += n
+
+                self.batch_ready.emit(chunk)
+                self.progress.emit(done_runs, n_runs)
+        finally:
+            # Ferme le générateur → annule les lots encore en attente
+            chunks.close()
+
+        ellipse = compute_ellipse_from_samples(impacts, k_sigma=self._k_sigma)
+        self.finished.emit(impacts, ellipse)
+
+
+# ============================================================
+# Démarrage
+# ============================================================
+
+def start_worker(worker: _Worker, parent: QObject) -> QThread:
+    """
+    Déplace le worker dans un nouveau QThread et le démarre.
+
+    Le thread s'arrête tout seul quand le worker a fini. L'appelant garde
+    une référence au worker et au thread jusqu'à QThread.finished,
+    puis libère le thread (deleteLater).
+    """
+    thread = QThread(parent)
+    worker.moveToThread(thread)
+
+    thread.started.connect(worker.run)
+    worker.done.connect(thread.quit)
+
+    thread.start()
+    return thread
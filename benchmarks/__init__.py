@@ -0,0 +1,7 @@
+"""
+Benchmarks de Sonde_Predict (sans interface graphique).
+
+Lancement depuis la racine du dépôt :
+    python -m benchmarks                     # suite complète → JSON
+    python -m benchmarks.bench_integrators   # un module seul
+"""
@@ -0,0 +1,145 @@
+"""
+Suite de benchmarks complète, sans Qt.
+
+    python -m benchmarks [-o resultats.json] [--quick] [--compare ancien.json]
+
+Sections : profils, simulation, monte_carlo, integrators, startup.
+Le JSON contient les mesures + la configuration (version de l'app,
+Python, NumPy, machine) pour suivre les régressions d'une version à l'autre.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import importlib.util
+import json
+import os
+import platform
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from App.version import __version__
+from benchmarks import (
+    bench_integrators,
+    bench_montecarlo,
+    bench_profiles,
+    bench_simulation,
+    bench_startup,
+)
+
+
+# Champs de mesure (tout le reste identifie le cas mesuré)
+_TIMING_FIELDS = {
+    "best_s", "mean_s", "number", "repeat", "time_s",
+    "per_query_s", "per_step_s", "per_run_s",
+    "modules", "deferred_loaded", "heaviest",
+}
+
+
+def _run_integrators(quick: bool = False) -> List[Dict]:
+    # Toujours complet : la référence Euler à dt = 0.1 s domine le temps
+    return bench_integrators.run()
+
+
+SECTIONS = {
+    "profiles": bench_profiles.run,
+    "simulation": bench_simulation.run,
+    "monte_carlo": bench_montecarlo.run,
+    "integrators": _run_integrators,
+    "startup": bench_startup.run,
+}
+
+
+def environment() -> Dict:
+    return {
+        "app_version": __version__,
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "numba": importlib.util.find_spec("numba") is not None,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def _case_key(section: str, entry: Dict) -> Tuple:
+    return (section,) + tuple(sorted(
+        (k, v) for k, v in entry.items() if k not in _TIMING_FIELDS
+    ))
+
+
+def _timing(entry: Dict) -> float:
+    return entry.get("best_s", entry.get("time_s"))
+
+
+def compare(previous: Dict, current: Dict) -> None:
+    """
+    Affiche le rapport nouveau / ancien pour chaque cas commun.
+    """
+    old = {
+        _case_key(section, e): _timing(e)
+        for section, entries in previous.get("results", {}).items()
+        for e in entries
+    }
+
+    print(f"\nComparaison avec {previous.get('environment', {}).get('app_version', '?')} "
+          "(ratio < 1 : plus rapide)")
+    for section, entries in current["results"].items():
+        for e in entries:
+            before = old.get(_case_key(section, e))
+            if not before:
+                continue
+            ratio = _timing(e) / before
+            flag = "  <-- régression" if ratio > 1.2 else ""
+            label = ", ".join(f"{k}={v}" for k, v in e.items()
+                              if k not in _TIMING_FIELDS and k != "name")
+            print(f"  {section:<12}{e['name']:<24}{label:<60}x{ratio:6.2f}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks Sonde_Predict (sans interface)")
+    parser.add_argument("-o", "--output", default=None,
+                        help="fichier JSON (défaut : benchmarks/results/bench_<version>_<date>.json)")
+    parser.add_argument("--quick", action="store_true",
+                        help="moins de répétitions, sans les cas les plus longs")
+    parser.add_argument("--only", nargs="+", choices=list(SECTIONS), default=None,
+                        help="sections à lancer")
+    parser.add_argument("--compare", default=None,
+                        help="JSON d'un run précédent à comparer")
+    args = parser.parse_args()
+
+    results: Dict[str, List[Dict]] = {}
+    for section, run in SECTIONS.items():
+        if args.only and section not in args.only:
+            continue
+        t0 = time.perf_counter()
+        print(f"[{section}] ...", flush=True)
+        results[section] = run(quick=args.quick)
+        print(f"[{section}] {len(results[section])} mesures en "
+              f"{time.perf_counter() - t0:.1f} s", flush=True)
+
+    report = {"environment": environment(), "results": results}
+
+    output = args.output
+    if output is None:
+        stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        output = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              "results", f"bench_{__version__}_{stamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Résultats : {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
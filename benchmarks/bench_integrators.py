@@ -0,0 +1,149 @@
+"""
+bench_integrators.py
+
+Nombre de pas vs erreur d'impact des intégrateurs de simulate_flight.
+
+Référence : le schéma historique (Euler) à dt = 0.1 s.
+Chaque configuration est comparée à cette référence (distance entre
+points d'impact, en mètres), avec son nombre de pas et son temps de calcul.
+Pour "analytic", les « pas » sont les états échantillonnés tous les dt_s :
+l'impact, lui, ne dépend pas de dt_s.
+
+    python -m benchmarks.bench_integrators [--ff 15000] [--json out.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import time
+from typing import Dict, List
+
+from App.profiles import (
+    AscentProfile,
+    DescentProfile,
+    WindProfile,
+    read_ascent_csv,
+    read_descent_csv,
+    read_wind_csv,
+)
+from App.simulation import EARTH_RADIUS_M, FlightSummary, simulate_flight
+
+CSV_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "CSV")
+
+REFERENCE_DT_S = 0.1
+
+# (intégrateur, dt_s, tol_m)
+CONFIGS = [
+    ("euler", 1.0, None),
+    ("euler", 5.0, None),
+    ("euler", 10.0, None),
+    ("euler", 30.0, None),
+    ("rk4", 5.0, None),
+    ("rk4", 30.0, None),
+    ("rk4", 120.0, None),
+    ("rk45", 5.0, 10.0),
+    ("rk45", 5.0, 1.0),
+    ("rk45", 5.0, 0.01),
+    ("analytic", 5.0, None),
+    ("analytic", 600.0, None),
+]
+
+
+def impact_distance_m(a: FlightSummary, b: FlightSummary) -> float:
+    """
+    Distance entre deux impacts (repère local plat, suffisant ici).
+    """
+    lat = math.radians(a.impact_lat_deg)
+    dlat = math.radians(b.impact_lat_deg - a.impact_lat_deg)
+    dlon = math.radians(b.impact_lon_deg - a.impact_lon_deg)
+    return EARTH_RADIUS_M * math.hypot(dlat, dlon * math.cos(lat))
+
+
+def run(ff_start_alt: float | None = None, alt_burst_m: float = 30_000.0) -> List[Dict]:
+    ascent = AscentProfile(read_ascent_csv(os.path.join(CSV_DIR, "ascent_profile.csv")))
+    descent = DescentProfile(read_descent_csv(os.path.join(CSV_DIR, "descent_profile_default.csv")))
+    wind = WindProfile(read_wind_csv(os.path.join(CSV_DIR, "wind_profile.csv")))
+
+    def flight(integrator: str, dt_s: float, tol_m: float | None):
+        t0 = time.perf_counter()
+        traj = simulate_flight(
+            alt_start_m=0.0,
+            alt_burst_m=alt_burst_m,
+            lat0_deg=48.0,
+            lon0_deg=2.0,
+            dt_s=dt_s,
+            ascent_profile=ascent,
+            descent_profile=descent,
+            wind_profile=wind,
+            ff_start_alt=ff_start_alt,
+            free_fall_factor=3.0,
+            max_steps=10_000_000,
+            integrator=integrator,
+            tol_m=tol_m or 1.0,
+        )
+        return traj, time.perf_counter() - t0
+
+    ref, ref_time = flight("euler", REFERENCE_DT_S, None)
+
+    results = [{
+        "name": "simulate_flight",
+        "integrator": "euler",
+        "dt_s": REFERENCE_DT_S,
+        "tol_m": None,
+        "steps": len(ref),
+        "impact_error_m": 0.0,
+        "flight_time_error_s": 0.0,
+        "time_s": ref_time,
+        "reference": True,
+    }]
+
+    for integrator, dt_s, tol_m in CONFIGS:
+        traj, elapsed = flight(integrator, dt_s, tol_m)
+        # Euler : un état par pas ; RK : état initial + un état par pas
+        steps = len(traj) if integrator == "euler" else len(traj) - 1
+        results.append({
+            "name": "simulate_flight",
+            "integrator": integrator,
+            "dt_s": dt_s,
+            "tol_m": tol_m,
+            "steps": steps,
+            "impact_error_m": impact_distance_m(ref.summary, traj.summary),
+            "flight_time_error_s": traj.summary.flight_time_s - ref.summary.flight_time_s,
+            "time_s": elapsed,
+            "reference": False,
+        })
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ff", type=float, default=None,
+                        help="altitude de chute libre (m), désactivée par défaut")
+    parser.add_argument("--burst", type=float, default=30_000.0,
+                        help="altitude de burst (m)")
+    parser.add_argument("--json", default=None, help="fichier JSON de sortie")
+    args = parser.parse_args()
+
+    results = run(ff_start_alt=args.ff, alt_burst_m=args.burst)
+
+    print(f"{'intégrateur':<12}{'dt (s)':>8}{'tol (m)':>9}{'pas':>9}"
+          f"{'erreur (m)':>12}{'Δt vol (s)':>12}{'temps (ms)':>12}")
+    for r in results:
+        tol = "-" if r["tol_m"] is None else f"{r['tol_m']:g}"
+        name = r["integrator"] + (" *" if r["reference"] else "")
+        print(f"{name:<12}{r['dt_s']:>8g}{tol:>9}{r['steps']:>9}"
+              f"{r['impact_error_m']:>12.2f}{r['flight_time_error_s']:>12.2f}"
+              f"{1000 * r['time_s']:>12.1f}")
+    print("* référence")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
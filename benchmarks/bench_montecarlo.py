@@ -0,0 +1,64 @@
+"""
+bench_montecarlo.py
+
+Temps de run_monte_carlo pour N = 50, 1 000 et 10 000 runs.
+
+    python -m benchmarks.bench_montecarlo
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List
+
+from App.montecarlo import run_monte_carlo
+from benchmarks.common import bundled_profiles, measure
+
+N_RUNS = (50, 1_000, 10_000)
+DT_S = 5.0
+
+
+def run(quick: bool = False, methods=("batch",)) -> List[Dict]:
+    n_values = N_RUNS[:2] if quick else N_RUNS
+    ascent, descent, wind = bundled_profiles()
+    results = []
+
+    for method in methods:
+        for n_runs in n_values:
+
+            def mc():
+                return run_monte_carlo(
+                    n_runs=n_runs,
+                    alt0_m=30_000.0,
+                    lat0_deg=48.0,
+                    lon0_deg=2.0,
+                    dt_s=DT_S,
+                    base_ascent=ascent,
+                    base_descent=descent,
+                    base_wind=wind,
+                    seed=1,
+                    method=method,
+                    n_workers=1,
+                )
+
+            # Les gros N durent plusieurs secondes : une seule mesure
+            timing = measure(mc, repeat=1 if n_runs >= 10_000 else 3, number=1)
+            results.append({
+                "name": "run_monte_carlo",
+                "method": method,
+                "n_runs": n_runs,
+                "dt_s": DT_S,
+                "per_run_s": timing["best_s"] / n_runs,
+                **timing,
+            })
+
+    return results
+
+
+def main():
+    for r in run(methods=("batch", "analytic", "compiled")):
+        print(f"{r['method']:<10}N={r['n_runs']:<7}{r['best_s']:>9.3f} s"
+              f"{1e6 * r['per_run_s']:>10.1f} µs/run")
+
+
+if __name__ == "__main__":
+    main()
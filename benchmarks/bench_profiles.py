@@ -0,0 +1,79 @@
+"""
+bench_profiles.py
+
+Temps d'interpolation des profils : value() (un point, chemin de la boucle
+de simulation) et values() (tableau, chemin Monte Carlo).
+
+    python -m benchmarks.bench_profiles
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List
+
+import numpy as np
+
+from benchmarks.common import SYNTHETIC_TOP_M, bundled_profiles, measure, wind_profiles
+
+# Altitudes interrogées (descente lente : altitudes voisines d'un appel à l'autre)
+N_QUERIES = 10_000
+
+
+def _query_alts() -> np.ndarray:
+    return np.linspace(SYNTHETIC_TOP_M, 0.0, N_QUERIES)
+
+
+def run(quick: bool = False) -> List[Dict]:
+    repeat = 3 if quick else 5
+    alts = _query_alts()
+    alts_list = alts.tolist()
+
+    results = []
+
+    def add(name: str, profile: str, levels: int, timing: Dict, per: int):
+        results.append({
+            "name": name,
+            "profile": profile,
+            "levels": levels,
+            "queries": per,
+            "per_query_s": timing["best_s"] / per,
+            **timing,
+        })
+
+    _, descent, _ = bundled_profiles()
+    levels = len(descent.alts_m)
+
+    def descent_loop():
+        value = descent.value
+        for a in alts_list:
+            value(a)
+
+    add("DescentProfile.value", "csv", levels,
+        measure(descent_loop, repeat=repeat), N_QUERIES)
+    add("DescentProfile.values", "csv", levels,
+        measure(lambda: descent.values(alts), repeat=repeat), N_QUERIES)
+
+    for label, wind in wind_profiles().items():
+        levels = len(wind.alts_m)
+
+        def wind_loop(wind=wind):
+            value = wind.value
+            for a in alts_list:
+                value(a)
+
+        add("WindProfile.value", label, levels,
+            measure(wind_loop, repeat=repeat), N_QUERIES)
+        add("WindProfile.values", label, levels,
+            measure(lambda wind=wind: wind.values(alts), repeat=repeat), N_QUERIES)
+
+    return results
+
+
+def main():
+    for r in run():
+        print(f"{r['name']:<24}{r['profile']:<16}{r['levels']:>6} niv."
+              f"{1e9 * r['per_query_s']:>12.1f} ns/requête")
+
+
+if __name__ == "__main__":
+    main()
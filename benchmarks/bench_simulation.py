@@ -0,0 +1,72 @@
+"""
+bench_simulation.py
+
+Temps de simulate_descent et simulate_flight selon le pas de temps,
+sur les profils CSV livrés et sur les vents synthétiques.
+
+    python -m benchmarks.bench_simulation
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List
+
+from App.simulation import simulate_descent, simulate_flight
+from benchmarks.common import bundled_profiles, measure, wind_profiles
+
+DT_VALUES_S = (0.5, 1.0, 5.0, 10.0, 30.0)
+
+LAT0_DEG = 48.0
+LON0_DEG = 2.0
+ALT_BURST_M = 30_000.0
+
+
+def run(quick: bool = False) -> List[Dict]:
+    repeat = 3 if quick else 5
+    dt_values = DT_VALUES_S[2:] if quick else DT_VALUES_S
+
+    ascent, descent, _ = bundled_profiles()
+    results = []
+
+    for label, wind in wind_profiles().items():
+        for dt in dt_values:
+
+            def descent_run():
+                return simulate_descent(
+                    ALT_BURST_M, LAT0_DEG, LON0_DEG, dt, descent, wind,
+                    max_steps=1_000_000,
+                )
+
+            def flight_run():
+                return simulate_flight(
+                    0.0, ALT_BURST_M, LAT0_DEG, LON0_DEG, dt,
+                    ascent, descent, wind,
+                    ff_start_alt=None, free_fall_factor=1.0,
+                    max_steps=1_000_000,
+                )
+
+            for name, func in (("simulate_descent", descent_run),
+                               ("simulate_flight", flight_run)):
+                steps = len(func())
+                timing = measure(func, repeat=repeat, min_time_s=0.1)
+                results.append({
+                    "name": name,
+                    "wind": label,
+                    "wind_levels": len(wind.alts_m),
+                    "dt_s": dt,
+                    "steps": steps,
+                    "per_step_s": timing["best_s"] / max(steps, 1),
+                    **timing,
+                })
+
+    return results
+
+
+def main():
+    for r in run():
+        print(f"{r['name']:<18}{r['wind']:<16}dt={r['dt_s']:<6g}{r['steps']:>8} pas"
+              f"{1000 * r['best_s']:>10.2f} ms{1e6 * r['per_step_s']:>9.2f} µs/pas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+bench_startup.py
+
+Temps de démarrage : import des modules d'entrée (fenêtre principale,
+CLI) mesuré dans un interpréteur neuf avec `python -X importtime`.
+
+    python -m benchmarks.bench_startup            # résumé + modules les plus lourds
+    python -m benchmarks.bench_startup --report   # rapport -X importtime complet
+
+Budget : l'import de la fenêtre principale doit rester sous STARTUP_BUDGET_S.
+Les modules lourds (Matplotlib, folium, requests, xarray/cfgrib) ne doivent
+pas apparaître dans le rapport : ils sont chargés au premier usage.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.common import ROOT_DIR
+
+# Budget d'import de la fenêtre principale (s)
+STARTUP_BUDGET_S = 1.0
+
+# Modules mesurés (point d'entrée de l'interface, CLI)
+ENTRY_MODULES = ("App.main_window", "App.cli")
+
+# Paquets qui ne doivent pas être importés au démarrage
+DEFERRED_PACKAGES = ("matplotlib", "mpl_toolkits", "folium", "requests", "xarray", "cfgrib")
+
+# Modules les plus lourds gardés dans les résultats
+TOP_N = 10
+
+
+def _importtime(module: str) -> Tuple[Optional[str], str]:
+    """
+    (rapport -X importtime, erreur) pour `import module` dans un
+    interpréteur neuf.
+    """
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    lines = proc.stderr.splitlines()
+    report = "\n".join(l for l in lines if l.startswith("import time:"))
+    if proc.returncode != 0:
+        error = next((l for l in reversed(lines) if l.strip()), f"code {proc.returncode}")
+        return None, error
+    return report, ""
+
+
+def parse_importtime(report: str) -> List[Tuple[str, int, float, float]]:
+    """
+    Lignes « import time: self | cumulé | module » →
+    [(module, profondeur, self_s, cumulé_s)], dans l'ordre du rapport.
+    """
+    entries = []
+    for line in report.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0].split(":")[1])
+            cum_us = int(parts[1])
+        except ValueError:
+            continue  # ligne d'en-tête
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), depth, self_us * 1e-6, cum_us * 1e-6))
+    return entries
+
+
+def _summary(module: str, entries) -> Dict:
+    # Les imports de premier niveau se partagent tout le temps d'import
+    total_s = sum(cum for _, depth, _, cum in entries if depth == 0)
+    loaded = {name for name, _, _, _ in entries}
+    heaviest = sorted(
+        ((name, cum) for name, _, _, cum in entries if name != module),
+        key=lambda e: e[1],
+        reverse=True,
+    )[:TOP_N]
+
+    return {
+        "name": "import",
+        "module": module,
+        "time_s": total_s,
+        "modules": len(entries),
+        "deferred_loaded": sorted(
+            p for p in DEFERRED_PACKAGES
+            if any(n == p or n.startswith(p + ".") for n in loaded)
+        ),
+        "heaviest": [{"module": n, "cumulative_s": c} for n, c in heaviest],
+    }
+
+
+def run(quick: bool = False) -> List[Dict]:
+    repeat = 2 if quick else 5
+    results = []
+
+    for module in ENTRY_MODULES:
+        # Premier lancement : compile les .pyc, non compté
+        report, error = _importtime(module)
+        if report is None:
+            print(f"  {module} : import impossible ({error})", flush=True)
+            continue
+
+        best = None
+        for _ in range(repeat):
+            report, _ = _importtime(module)
+            summary = _summary(module, parse_importtime(report))
+            if best is None or summary["time_s"] < best["time_s"]:
+                best = summary
+
+        best["repeat"] = repeat
+        if module == "App.main_window":
+            best["budget_s"] = STARTUP_BUDGET_S
+        results.append(best)
+
+    return results
+
+
+def main():
+    if "--report" in sys.argv[1:]:
+        for module in ENTRY_MODULES:
+            report, error = _importtime(module)
+            print(f"# {module}")
+            print(report if report is not None else f"import impossible : {error}")
+        return
+
+    for r in run():
+        budget = r.get("budget_s")
+        status = "" if budget is None else (
+            "  OK" if r["time_s"] <= budget else f"  > budget {budget:.1f} s"
+        )
+        print(f"{r['module']:<20}{1e3 * r['time_s']:>9.1f} ms  {r['modules']:>5} modules{status}")
+        if r["deferred_loaded"]:
+            print(f"    chargés au démarrage : {', '.join(r['deferred_loaded'])}")
+        for h in r["heaviest"]:
+            print(f"    {h['module']:<40}{1e3 * h['cumulative_s']:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+common.py
+
+Outils partagés des benchmarks : chargement des profils, profils de vent
+synthétiques et mesure des temps.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import timeit
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from App.profiles import (
+    AscentProfile,
+    DescentProfile,
+    WindPoint,
+    WindProfile,
+    read_ascent_csv,
+    read_descent_csv,
+    read_wind_csv,
+)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CSV_DIR = os.path.join(ROOT_DIR, "CSV")
+
+# Altitude max des profils synthétiques (m)
+SYNTHETIC_TOP_M = 35_000.0
+
+
+# ============================================================
+# Profils
+# ============================================================
+
+def bundled_profiles():
+    """
+    (montée, descente, vent) à partir des CSV livrés dans CSV/.
+    """
+    ascent = AscentProfile(read_ascent_csv(os.path.join(CSV_DIR, "ascent_profile.csv")))
+    descent = DescentProfile(read_descent_csv(os.path.join(CSV_DIR, "descent_profile_default.csv")))
+    wind = WindProfile(read_wind_csv(os.path.join(CSV_DIR, "wind_profile.csv")))
+    return ascent, descent, wind
+
+
+def synthetic_wind_profile(n_levels: int, seed: int = 0) -> WindProfile:
+    """
+    Profil de vent à n_levels niveaux réguliers entre 0 et 35 km :
+    jet-stream vers 11 km + bruit reproductible.
+    """
+    rng = np.random.default_rng(seed)
+    alts = np.linspace(0.0, SYNTHETIC_TOP_M, n_levels)
+
+    jet = 25.0 * np.exp(-((alts - 11_000.0) / 4_000.0) ** 2)
+    u = 5.0 + jet + rng.normal(0.0, 2.0, n_levels)
+    v = 3.0 * np.sin(alts / 5_000.0) + rng.normal(0.0, 2.0, n_levels)
+
+    return WindProfile([
+        WindPoint(alt_m=a, wind_u_ms=wu, wind_v_ms=wv)
+        for a, wu, wv in zip(alts.tolist(), u.tolist(), v.tolist())
+    ])
+
+
+def wind_profiles() -> Dict[str, WindProfile]:
+    """
+    Profils de vent mesurés : CSV livré + synthétiques 100 et 1000 niveaux.
+    """
+    _, _, wind = bundled_profiles()
+    return {
+        "csv": wind,
+        "synthetic_100": synthetic_wind_profile(100),
+        "synthetic_1000": synthetic_wind_profile(1000),
+    }
+
+
+# ============================================================
+# Mesure
+# ============================================================
+
+def measure(
+    func: Callable[[], object],
+    repeat: int = 5,
+    number: Optional[int] = None,
+    min_time_s: float = 0.2,
+) -> Dict[str, float]:
+    """
+    Chronomètre func().
+
+    number : appels par mesure (None → ajusté pour durer ~min_time_s)
+    repeat : nombre de mesures ; on garde la meilleure (moins de bruit)
+
+    Retourne les temps par appel (s).
+    """
+    timer = timeit.Timer(func)
+
+    if number is None:
+        number = 1
+        while True:
+            elapsed = timer.timeit(number)
+            if elapsed >= min_time_s or number >= 1_000_000:
+                break
+            number = max(number * 2, int(math.ceil(number * min_time_s / max(elapsed, 1e-9))))
+
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "best_s": min(times),
+        "mean_s": sum(times) / len(times),
+        "number": number,
+        "repeat": repeat,
+    }
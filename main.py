@@ -1,3 +1,4 @@
+import multiprocessing
 import sys
 from PyQt5.QtWidgets import QApplication
 
@@ -6,6 +7,9 @@ from App.themes import  enable_dark_blue
 
 
 if __name__ == "__main__":
+    # Requis pour les processus Monte Carlo dans l'exécutable PyInstaller
+    multiprocessing.freeze_support()
+
     app = QApplication(sys.argv)
 
     # 🔥 blue mode global
@@ -0,0 +1,123 @@
+"""
+Serveur HTTP local (http.server, port 0) pour les tests de téléchargement.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import pytest
+
+
+class StubServer:
+    """
+    Réponses programmées par chemin (sans la requête) : chaque requête
+    consomme la réponse suivante, la dernière est rejouée. Chemin inconnu
+    → 404. Les requêtes reçues sont gardées dans requests.
+    """
+
+    def __init__(self, port: int):
+        self.base_url = f"http://127.0.0.1:{port}"
+        self.requests = []   # (méthode, chemin, en-têtes)
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def route(self, path: str, *responses) -> None:
+        with self._lock:
+            self._routes[path] = list(responses)
+
+    def hits(self, path: str, method: str = "GET") -> list:
+        with self._lock:
+            return [h for m, p, h in self.requests if p == path and m == method]
+
+    def _dispatch(self, handler) -> None:
+        path = urlsplit(handler.path).path
+        with self._lock:
+            self.requests.append((handler.command, path, dict(handler.headers)))
+            queue = self._routes.get(path)
+            if not queue:
+                respond = self.status(404)
+            elif len(queue) > 1:
+                respond = queue.pop(0)
+            else:
+                respond = queue[0]
+        respond(handler)
+
+    # ------------------------
+    # Réponses
+    # ------------------------
+    @staticmethod
+    def _send(handler, code: int, body: bytes = b"", headers=(), length=None) -> None:
+        handler.send_response(code)
+        for name, value in headers:
+            handler.send_header(name, value)
+        handler.send_header("Content-Length", str(len(body) if length is None else length))
+        if length is not None:
+            handler.send_header("Connection", "close")
+            handler.close_connection = True
+        handler.end_headers()
+        if handler.command != "HEAD":
+            handler.wfile.write(body)
+
+    @classmethod
+    def status(cls, code: int):
+        """
+        Réponse vide avec ce code.
+        """
+        return lambda h: cls._send(h, code)
+
+    @classmethod
+    def body(cls, data: bytes, honor_range: bool = True):
+        """
+        data en 200, ou en 206 / 416 selon l'en-tête Range.
+        """
+        def respond(h):
+            rng = h.headers.get("Range")
+            if not (rng and honor_range):
+                cls._send(h, 200, data)
+                return
+
+            start = int(rng.split("=")[1].split("-")[0])
+            if start >= len(data):
+                cls._send(h, 416, headers=[("Content-Range", f"bytes */{len(data)}")])
+                return
+            content_range = f"bytes {start}-{len(data) - 1}/{len(data)}"
+            cls._send(h, 206, data[start:], headers=[("Content-Range", content_range)])
+        return respond
+
+    @classmethod
+    def truncated(cls, data: bytes, n_bytes: int):
+        """
+        Annonce data en entier mais coupe la connexion après n_bytes.
+        """
+        return lambda h: cls._send(h, 200, data[:n_bytes], length=len(data))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.stub._dispatch(self)
+
+    do_HEAD = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.stub = StubServer(server.server_address[1])
+
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    try:
+        yield server.stub
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,221 @@
+"""
+Téléchargements GFS et recherche du dernier run contre un serveur HTTP
+local (voir conftest.http_stub).
+"""
+
+import os
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+import pytest
+
+from App import gfs_download
+from App.gfs_download import (
+    clear_cycle_memo,
+    download_gfs,
+    download_many,
+    latest_cycle,
+    prod_file_url,
+)
+
+
+DATA = bytes(range(256)) * 64   # 16 ko
+
+
+@pytest.fixture(autouse=True)
+def no_jitter(monkeypatch):
+    # Attentes enregistrées au lieu d'être subies, sans gigue
+    sleeps = []
+    monkeypatch.setattr(gfs_download.time, "sleep", sleeps.append)
+    monkeypatch.setattr(gfs_download.random, "uniform", lambda a, b: 1.0)
+    return sleeps
+
+
+def _download(stub, tmp_path, path="/f000", **kwargs):
+    out = str(tmp_path / "gfs.grib2")
+    kwargs.setdefault("show_progress", False)
+    ok = download_gfs(stub.url(path), out, **kwargs)
+    return ok, out
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_download_writes_file_and_removes_part(http_stub, tmp_path):
+    http_stub.route("/f000", http_stub.body(DATA))
+    ok, out = _download(http_stub, tmp_path)
+    assert ok
+    assert _read(out) == DATA
+    assert not os.path.exists(out + ".part")
+
+
+def test_final_file_appears_only_by_atomic_replace(http_stub, tmp_path, monkeypatch):
+    http_stub.route("/f000", http_stub.body(DATA))
+    real_replace = os.replace
+    calls = []
+
+    def spy(src, dst):
+        # Au renommage, le .part est complet et le fichier final absent
+        calls.append((src, dst, os.path.getsize(src), os.path.exists(dst)))
+        real_replace(src, dst)
+
+    monkeypatch.setattr(gfs_download.os, "replace", spy)
+    ok, out = _download(http_stub, tmp_path)
+    assert ok
+    assert calls == [(out + ".part", out, len(DATA), False)]
+
+
+def test_resume_sends_range_from_part_size(http_stub, tmp_path):
+    http_stub.route("/f000", http_stub.body(DATA))
+    out = str(tmp_path / "gfs.grib2")
+    with open(out + ".part", "wb") as f:
+        f.write(DATA[:5000])
+
+    ok, _ = _download(http_stub, tmp_path)
+    assert ok
+    assert _read(out) == DATA
+    assert [h.get("Range") for h in http_stub.hits("/f000")] == ["bytes=5000-"]
+
+
+def test_resume_restarts_when_server_ignores_range(http_stub, tmp_path):
+    http_stub.route("/f000", http_stub.body(DATA, honor_range=False))
+    out = str(tmp_path / "gfs.grib2")
+    with open(out + ".part", "wb") as f:
+        f.write(b"x" * 5000)
+
+    ok, _ = _download(http_stub, tmp_path)
+    assert ok
+    assert _read(out) == DATA
+
+
+def test_416_discards_part_and_restarts(http_stub, tmp_path):
+    http_stub.route("/f000", http_stub.body(DATA))
+    out = str(tmp_path / "gfs.grib2")
+    with open(out + ".part", "wb") as f:
+        f.write(b"x" * (len(DATA) + 10))
+
+    ok, _ = _download(http_stub, tmp_path)
+    assert ok
+    assert _read(out) == DATA
+    assert [h.get("Range") for h in http_stub.hits("/f000")] == [f"bytes={len(DATA) + 10}-", None]
+
+
+def test_truncated_body_is_retried(http_stub, tmp_path):
+    http_stub.route("/f000", http_stub.truncated(DATA, 5000), http_stub.body(DATA))
+    ok, out = _download(http_stub, tmp_path, backoff_s=0.0)
+    assert ok
+    assert _read(out) == DATA
+    assert len(http_stub.hits("/f000")) == 2
+
+
+def test_503_is_retried_with_exponential_backoff(http_stub, tmp_path, no_jitter):
+    http_stub.route("/f000", http_stub.status(503), http_stub.status(503), http_stub.body(DATA))
+    ok, out = _download(http_stub, tmp_path, backoff_s=0.5)
+    assert ok
+    assert _read(out) == DATA
+    assert no_jitter == [0.5, 1.0]
+
+
+def test_503_gives_up_after_retries(http_stub, tmp_path, no_jitter):
+    http_stub.route("/f000", http_stub.status(503))
+    ok, out = _download(http_stub, tmp_path, retries=2, backoff_s=0.5)
+    assert not ok
+    assert not os.path.exists(out)
+    assert len(http_stub.hits("/f000")) == 3
+    assert no_jitter == [0.5, 1.0]
+
+
+def test_404_fails_without_retry(http_stub, tmp_path, no_jitter):
+    ok, out = _download(http_stub, tmp_path, path="/missing")
+    assert not ok
+    assert not os.path.exists(out)
+    assert len(http_stub.hits("/missing")) == 1
+    assert no_jitter == []
+
+
+def test_download_many_keeps_job_order(http_stub, tmp_path):
+    http_stub.route("/f000", http_stub.body(DATA))
+    http_stub.route("/f006", http_stub.body(DATA[::-1]))
+    jobs = [
+        (http_stub.url("/f000"), str(tmp_path / "a")),
+        (http_stub.url("/f003"), str(tmp_path / "b")),
+        (http_stub.url("/f006"), str(tmp_path / "c")),
+    ]
+
+    assert download_many(jobs, max_workers=3) == [True, False, True]
+    assert _read(tmp_path / "a") == DATA
+    assert _read(tmp_path / "c") == DATA[::-1]
+    assert not os.path.exists(tmp_path / "b")
+
+
+# ============================================================
+# Dernier run disponible (HEAD)
+# ============================================================
+
+NOW = datetime(2026, 10, 16, 13, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def fresh_memo():
+    clear_cycle_memo()
+    yield
+    clear_cycle_memo()
+
+
+def _publish(stub, date, cycle, fhours):
+    for fh in fhours:
+        path = urlsplit(prod_file_url(date, cycle, fh, stub.url("/prod"))).path
+        stub.route(path, stub.status(200))
+
+
+def _latest(stub, **kwargs):
+    kwargs.setdefault("lookback", 4)
+    return latest_cycle(now=NOW, prod_url=stub.url("/prod"), **kwargs)
+
+
+def _heads(stub):
+    return [p for m, p, _ in stub.requests if m == "HEAD"]
+
+
+def test_latest_cycle_skips_partially_published_run(http_stub, fresh_memo):
+    _publish(http_stub, "20261016", 12, [0])          # f006 pas encore là
+    _publish(http_stub, "20261016", 6, [0, 6])
+    _publish(http_stub, "20261016", 0, [0, 6])
+
+    assert _latest(http_stub, fhours=[0, 6]) == ("20261016", 6)
+    assert _latest(http_stub, fhours=[0]) == ("20261016", 12)
+
+
+def test_latest_cycle_none_when_nothing_published(http_stub, fresh_memo):
+    assert _latest(http_stub, fhours=[0]) is None
+    assert len(_heads(http_stub)) == 4
+
+
+def test_cycle_memo_avoids_repeated_heads(http_stub, fresh_memo):
+    _publish(http_stub, "20261016", 6, [0, 6])
+
+    assert _latest(http_stub, fhours=[0, 6]) == ("20261016", 6)
+    n_heads = len(_heads(http_stub))
+    assert n_heads == 8   # 4 runs × 2 échéances
+
+    # Rouvrir le dialogue : tout vient de la mémoire
+    assert _latest(http_stub, fhours=[0, 6]) == ("20261016", 6)
+    assert len(_heads(http_stub)) == n_heads
+
+    # Le run de 12 h est publié entre-temps : vu seulement après l'oubli
+    _publish(http_stub, "20261016", 12, [0, 6])
+    assert _latest(http_stub, fhours=[0, 6]) == ("20261016", 6)
+    clear_cycle_memo()
+    assert _latest(http_stub, fhours=[0, 6]) == ("20261016", 12)
+    assert len(_heads(http_stub)) > n_heads
+
+
+def test_cycle_memo_expires_after_ttl(http_stub, fresh_memo):
+    _publish(http_stub, "20261016", 6, [0])
+
+    _latest(http_stub, fhours=[0], ttl_s=0.0)
+    n_heads = len(_heads(http_stub))
+    _latest(http_stub, fhours=[0], ttl_s=0.0)
+    assert len(_heads(http_stub)) == 2 * n_heads
@@ -0,0 +1,150 @@
+"""
+Champs GFS : interpolation horizontale au bord de la grille (champ
+synthétique : u vaut la longitude de la colonne, v la latitude) et
+annexes du GRIB.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from App import gfs_utils
+from App.gfs_utils import GfsWindField
+
+
+def _field(lons):
+    levels = np.array([850.0, 500.0])
+    lats = np.array([46.0, 48.0, 50.0])
+    lons = np.asarray(lons, dtype=float)
+    shape = (len(levels), len(lats), len(lons))
+    u = np.broadcast_to(lons, shape).copy()
+    v = np.broadcast_to(lats[:, None], shape).copy()
+    return GfsWindField(levels, lats, lons, u, v)
+
+
+REGIONAL = np.arange(-3.0, 7.5, 0.5)
+GLOBAL = np.arange(0.0, 360.0, 0.5)
+
+
+@pytest.mark.parametrize("method", ["nearest", "bilinear", "idw"])
+def test_columns_clamp_to_nearest_regional_edge(method):
+    field = _field(REGIONAL)
+    u, _ = field.columns([48.0, 48.0, 48.0], [-3.2, 7.2, 2.0], method=method)
+    assert u[:, 0] == pytest.approx([-3.0, 7.0, 2.0])
+
+
+def test_wind_points_west_of_regional_grid():
+    field = _field(REGIONAL)
+    points = field.wind_points(48.0, -3.2)
+    assert points[0].wind_u_ms == pytest.approx(-3.0)
+    assert not field.contains(48.0, -3.2)
+    assert field.contains(48.0, -2.0)
+
+
+def test_columns_interpolate_across_global_seam():
+    field = _field(GLOBAL)
+    # 359.75° et -0.25° : à mi-chemin entre les colonnes 359.5° et 0°
+    u, _ = field.columns([48.0, 48.0], [359.75, -0.25])
+    assert u[:, 0] == pytest.approx([179.75, 179.75])
+    assert field.contains(48.0, 359.9)
+
+
+@pytest.mark.parametrize("lon", [-3.2, 7.2])
+def test_sampler_clamps_to_nearest_regional_edge(lon):
+    field = _field(REGIONAL)
+    u, v = field.sampler().value_at(48.0, lon, 3000.0)
+    assert u == pytest.approx(-3.0 if lon < 0 else 7.0)
+    assert v == pytest.approx(48.0)
+
+
+@pytest.mark.parametrize("lon", [359.75, -0.25])
+def test_sampler_interpolates_across_global_seam(lon):
+    field = _field(GLOBAL)
+    u, _ = field.sampler().value_at(48.0, lon, 3000.0)
+    assert u == pytest.approx(179.75)
+
+
+
+@pytest.mark.parametrize("grid, lon", [
+    (REGIONAL, -3.2), (REGIONAL, 7.2), (REGIONAL, 356.9), (REGIONAL, 1.3),
+    (GLOBAL, 359.9), (GLOBAL, -0.1), (GLOBAL, 720.3),
+])
+def test_sampler_matches_batch_columns(grid, lon):
+    field = _field(grid)
+    u, v = field.columns([47.3], [lon])
+    su, sv = field.sampler().value_at(47.3, lon, 3000.0)
+    assert su == pytest.approx(u[0, 0])
+    assert sv == pytest.approx(v[0, 0])
+
+# ============================================================
+# Annexes du GRIB (index cfgrib, cube décodé)
+# ============================================================
+
+def _read_only(monkeypatch):
+    def refuse(*args, **kwargs):
+        raise PermissionError(13, "Read-only file system")
+    monkeypatch.setattr(gfs_utils.os, "makedirs", refuse)
+
+
+def _grib(tmp_path):
+    path = tmp_path / "vent.grib"
+    path.write_bytes(b"GRIB")
+    return str(path)
+
+
+def test_grib_index_path_next_to_grib(tmp_path):
+    path = gfs_utils.grib_index_path(_grib(tmp_path))
+    assert os.path.dirname(path) == str(tmp_path / gfs_utils.INDEX_DIR_NAME)
+    assert path.endswith("{short_hash}.idx")
+
+
+def test_grib_index_path_disabled_in_read_only_dir(tmp_path, monkeypatch):
+    grib = _grib(tmp_path)
+    _read_only(monkeypatch)
+    assert gfs_utils.grib_index_path(grib) == ""
+
+
+def test_load_field_decodes_without_cube_in_read_only_dir(tmp_path, monkeypatch):
+    grib = _grib(tmp_path)
+    decoded = _field(REGIONAL)
+    monkeypatch.setattr(GfsWindField, "from_grib", classmethod(lambda cls, path: decoded))
+    _read_only(monkeypatch)
+
+    assert gfs_utils._load_field(grib) is decoded
+    assert os.listdir(tmp_path) == ["vent.grib"]
+
+
+# ============================================================
+# Coins NaN
+# ============================================================
+
+def _field_with_nan(*points):
+    field = _field(REGIONAL)
+    for lat, lon in points:
+        i = int(np.flatnonzero(field.lats_deg == lat)[0])
+        j = int(np.flatnonzero(field.lons_deg == lon)[0])
+        field.u[:, i, j] = np.nan
+        field.v[:, i, j] = np.nan
+    return field
+
+
+@pytest.mark.parametrize("method", ["nearest", "bilinear", "idw"])
+def test_exact_grid_line_ignores_nan_neighbour(method):
+    # (48, 2.0) pile sur un point de grille ; les trois autres coins NaN
+    field = _field_with_nan((50.0, 2.0), (48.0, 2.5), (50.0, 2.5))
+    u, v = field.columns([48.0], [2.0], method=method)
+    assert u[0] == pytest.approx([2.0, 2.0])
+    assert v[0] == pytest.approx([48.0, 48.0])
+
+
+def test_bilinear_renormalises_over_valid_corners():
+    field = _field_with_nan((48.0, 2.5))
+    u, _ = field.columns([48.0], [2.25])
+    assert u[0] == pytest.approx([2.0, 2.0])
+
+
+def test_all_weighted_corners_nan_gives_nan():
+    field = _field_with_nan((48.0, 2.0))
+    u, _ = field.columns([48.0], [2.0])
+    assert np.isnan(u).all()
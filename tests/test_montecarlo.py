@@ -0,0 +1,76 @@
+"""
+Reproductibilité et annulation du Monte Carlo.
+"""
+
+import pytest
+
+from App.montecarlo import iter_monte_carlo, run_monte_carlo
+from App.profiles import (
+    AscentPoint,
+    AscentProfile,
+    DescentPoint,
+    DescentProfile,
+    WindPoint,
+    WindProfile,
+)
+
+
+def _kwargs(**overrides):
+    kwargs = dict(
+        n_runs=40,
+        alt0_m=8_000.0,
+        lat0_deg=48.0,
+        lon0_deg=2.0,
+        dt_s=5.0,
+        base_ascent=AscentProfile([AscentPoint(0.0, 5.0), AscentPoint(10_000.0, 5.0)]),
+        base_descent=DescentProfile([DescentPoint(0.0, 5.0), DescentPoint(10_000.0, 15.0)]),
+        base_wind=WindProfile([WindPoint(0.0, 3.0, 1.0), WindPoint(10_000.0, 20.0, -5.0)]),
+        seed=1234,
+    )
+    kwargs.update(overrides)
+    return kwargs
+
+
+def _latlon(impacts):
+    return [(s.lat_deg, s.lon_deg) for s in impacts]
+
+
+def test_same_seed_same_impacts_for_any_worker_count():
+    one, _ = run_monte_carlo(**_kwargs(n_workers=1))
+    four, _ = run_monte_carlo(**_kwargs(n_workers=4))
+    assert len(one) == 40
+    assert _latlon(one) == _latlon(four)
+
+
+def test_same_seed_same_impacts_across_pool_chunks():
+    one, _ = run_monte_carlo(**_kwargs(n_workers=1, chunk_size=10))
+    four, _ = run_monte_carlo(**_kwargs(n_workers=4, chunk_size=10))
+    assert _latlon(one) == _latlon(four)
+
+
+@pytest.mark.parametrize("method", ["batch", "loop"])
+def test_progress_reports_inside_a_single_chunk(method):
+    seen = []
+
+    def progress(landed):
+        seen.append(landed)
+        return True
+
+    chunks = list(iter_monte_carlo(progress=progress, **_kwargs(method=method)))
+    assert [n for n, _ in chunks] == [40]
+    assert seen and seen == sorted(seen) and seen[-1] <= 40
+
+    plain, _ = run_monte_carlo(**_kwargs(method=method))
+    assert _latlon(chunks[0][1]) == _latlon(plain)
+
+
+@pytest.mark.parametrize("method", ["batch", "loop"])
+def test_progress_returning_false_cancels_the_chunk(method):
+    calls = []
+
+    def progress(landed):
+        calls.append(landed)
+        return False
+
+    assert list(iter_monte_carlo(progress=progress, **_kwargs(method=method))) == []
+    assert len(calls) == 1